@@ -15,26 +15,37 @@
 """Top-level package for Python API and CLI for Nessie."""
 
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-import confuse
+if TYPE_CHECKING:
+    import confuse
 
-from pynessie.client import NessieClient
-from pynessie.conf import build_config
+    from pynessie.client import NessieClient
 
 __author__ = """Project Nessie"""
 __email__ = "nessie-release-builder@dremio.com"
 __version__ = "0.67.1"
 
 
-def get_config(config_dir: Optional[str] = None, args: Optional[dict] = None) -> confuse.Configuration:
+def __getattr__(name: str) -> Any:
+    # the client is imported on first use, so that importing e.g. the CLI or the version stays cheap
+    if name == "NessieClient":
+        from pynessie.client import NessieClient  # pylint: disable=C0415
+
+        return NessieClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_config(config_dir: Optional[str] = None, args: Optional[dict] = None) -> "confuse.Configuration":
     """Retrieve a confuse Configuration object."""
+    from pynessie.conf import build_config  # pylint: disable=C0415
+
     if config_dir:
         os.environ["NESSIE_CLIENTDIR"] = config_dir
     return build_config(args)
 
 
-def init(config_dir: Optional[str] = None, config_dict: Optional[dict] = None) -> NessieClient:
+def init(config_dir: Optional[str] = None, config_dict: Optional[dict] = None) -> "NessieClient":
     """Create a new Nessie client object.
 
     :param config_dir: optional directory to look for config in
@@ -49,5 +60,7 @@ def init(config_dir: Optional[str] = None, config_dict: Optional[dict] = None) -
     return _connect(config)
 
 
-def _connect(config: confuse.Configuration) -> NessieClient:
+def _connect(config: "confuse.Configuration") -> "NessieClient":
+    from pynessie.client import NessieClient  # pylint: disable=C0415
+
     return NessieClient(config)
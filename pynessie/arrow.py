@@ -0,0 +1,141 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Columnar export of log, entries and diff pages, requires the optional 'pyarrow' dependency (pip install pynessie[arrow]).
+
+The adapters take the JSON pages of the server, e.g. as returned by the raw=True reads of NessieClient, and turn every
+page into one Arrow record batch without building model objects:
+
+    to_arrow(client.get_log("main", fetch_all=True, raw=True)).to_pandas()
+"""
+
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Tuple,
+    Union,
+)
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from pynessie.error import NessieInvalidUsageException
+
+_Column = Tuple[str, pa.DataType, Callable[[Mapping[str, Any]], Any]]
+
+_KEY = pa.list_(pa.string())
+# Nessie writes commit times as ISO-8601 instants with up to nanosecond precision
+_TIMESTAMP = pa.timestamp("ns", "UTC")
+
+
+def _meta(name: str) -> Callable[[Mapping[str, Any]], Any]:
+    return lambda entry: (entry.get("commitMeta") or {}).get(name)
+
+
+def _content(side: str, name: str) -> Callable[[Mapping[str, Any]], Any]:
+    return lambda diff: (diff.get(side) or {}).get(name)
+
+
+_LOG_COLUMNS: List[_Column] = [
+    ("hash", pa.string(), _meta("hash")),
+    ("author", pa.string(), _meta("author")),
+    ("committer", pa.string(), _meta("committer")),
+    ("commit_time", _TIMESTAMP, _meta("commitTime")),
+    ("message", pa.string(), _meta("message")),
+    ("parent", pa.string(), lambda entry: entry.get("parentCommitHash")),
+]
+_ENTRIES_COLUMNS: List[_Column] = [
+    ("key", _KEY, lambda entry: (entry.get("name") or {}).get("elements")),
+    ("content_type", pa.string(), lambda entry: entry.get("type")),
+    ("content_id", pa.string(), lambda entry: entry.get("contentId")),
+]
+_DIFF_COLUMNS: List[_Column] = [
+    ("key", _KEY, lambda diff: (diff.get("key") or {}).get("elements")),
+    ("from_content_type", pa.string(), _content("from", "type")),
+    ("from_content_id", pa.string(), _content("from", "id")),
+    ("to_content_type", pa.string(), _content("to", "type")),
+    ("to_content_id", pa.string(), _content("to", "id")),
+]
+
+
+def _schema(columns: List[_Column]) -> pa.Schema:
+    return pa.schema([(name, type_) for name, type_, _ in columns])
+
+
+LOG_SCHEMA = _schema(_LOG_COLUMNS)
+ENTRIES_SCHEMA = _schema(_ENTRIES_COLUMNS)
+DIFF_SCHEMA = _schema(_DIFF_COLUMNS)
+
+# the field holding the rows of each kind of page
+_PAGES: Dict[str, Tuple[pa.Schema, List[_Column]]] = {
+    "logEntries": (LOG_SCHEMA, _LOG_COLUMNS),
+    "entries": (ENTRIES_SCHEMA, _ENTRIES_COLUMNS),
+    "diffs": (DIFF_SCHEMA, _DIFF_COLUMNS),
+}
+
+
+def _array(values: List[Any], type_: pa.DataType) -> pa.Array:
+    if type_ == _TIMESTAMP:
+        return pa.array(values, pa.string()).cast(type_)
+    return pa.array(values, type_)
+
+
+def record_batch(page: Mapping[str, Any]) -> pa.RecordBatch:
+    """Convert one log, entries or diff page of the server to a record batch with LOG_SCHEMA, ENTRIES_SCHEMA or DIFF_SCHEMA."""
+    for field, (schema, columns) in _PAGES.items():
+        if field in page:
+            rows = page[field] or []
+            return pa.RecordBatch.from_arrays([_array([get(row) for row in rows], type_) for _, type_, get in columns], schema=schema)
+    raise NessieInvalidUsageException(f"Expected a log, entries or diff page, got one with the fields {sorted(page)}")
+
+
+def iter_record_batches(pages: Iterable[Mapping[str, Any]]) -> Iterator[pa.RecordBatch]:
+    """Convert the pages of a log, entries or diff listing to record batches, one per page, as the pages arrive."""
+    for page in pages:
+        yield record_batch(page)
+
+
+def to_arrow(pages: Iterable[Mapping[str, Any]]) -> pa.Table:
+    """Convert the pages of a log, entries or diff listing to one table."""
+    batches = list(iter_record_batches(pages))
+    if not batches:
+        raise NessieInvalidUsageException("No pages to convert, a listing has at least one page")
+    return pa.Table.from_batches(batches)
+
+
+def write_parquet(pages: Iterable[Mapping[str, Any]], where: Union[str, BinaryIO]) -> int:
+    """Write the pages of a log, entries or diff listing to a Parquet file, one row group per page.
+
+    :param pages: the JSON pages of the server
+    :param where: path or writable binary stream of the Parquet file
+    :return: the number of written rows
+    """
+    rows = 0
+    writer = None
+    try:
+        for batch in iter_record_batches(pages):
+            if writer is None:
+                writer = pq.ParquetWriter(where, batch.schema)
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
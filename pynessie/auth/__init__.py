@@ -14,7 +14,17 @@
 #
 """Authentication classes for nessie client."""
 
-from pynessie.auth.aws import setup_aws_auth
+from typing import Any
+
 from pynessie.auth.config import setup_auth
 
-__all__ = ["setup_aws_auth", "setup_auth"]
+__all__ = ["setup_aws_auth", "setup_auth"]  # pylint: disable=E0603
+
+
+def __getattr__(name: str) -> Any:
+    # botocore and requests_aws4auth are slow to import and only needed when the config selects AWS auth
+    if name == "setup_aws_auth":
+        from pynessie.auth.aws import setup_aws_auth  # pylint: disable=C0415
+
+        return setup_aws_auth
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -14,15 +14,37 @@
 #
 """Use AWS4Auth and botocore to fetch credentials and sign requests."""
 
-from typing import Optional
+import threading
+from typing import Any, Optional
 
 from botocore.credentials import get_credentials
+from botocore.exceptions import NoCredentialsError
 from botocore.session import Session
 from requests_aws4auth import AWS4Auth
 
 
+class _SharedAWS4Auth(AWS4Auth):
+    """AWS4Auth that may sign the requests of several threads.
+
+    AWS4Auth refreshes its credentials and signing key in place while signing a request, so signing is serialized.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+
+    def __call__(self, req: Any) -> Any:
+        with self._lock:
+            return super().__call__(req)
+
+
 def setup_aws_auth(region: str, profile: Optional[str] = None) -> AWS4Auth:
-    """For a given region sign a request to the execute-api with standard credentials."""
+    """For a given region sign a request to the execute-api with standard credentials.
+
+    Temporary credentials, e.g. of an assumed role, are refreshed before they expire, so the auth can be used by a
+    long-running client.
+    """
     credentials = get_credentials(Session(profile=profile))
-    auth = AWS4Auth(credentials.access_key, credentials.secret_key, region, "execute-api", session_token=credentials.token)
-    return auth
+    if credentials is None:
+        raise NoCredentialsError()
+    return _SharedAWS4Auth(region=region, service="execute-api", refreshable_credentials=credentials)
@@ -19,7 +19,6 @@ from typing import Optional
 from confuse import Configuration
 from requests.auth import AuthBase, HTTPBasicAuth
 
-from pynessie.auth.aws import setup_aws_auth
 from pynessie.auth.bearer import TokenAuth as BearerTokenAuth
 
 
@@ -41,6 +40,9 @@ def setup_auth(config: Configuration) -> Optional[AuthBase]:
         token = config["auth"]["token"].get()
         return BearerTokenAuth(token)
     if auth_type == "aws":
+        # botocore is slow to import, so it is only loaded when AWS auth is selected
+        from pynessie.auth.aws import setup_aws_auth  # pylint: disable=C0415
+
         region = config["auth"]["region"].get()
         profile = config["auth"]["profile"].get()
         return setup_aws_auth(region=region, profile=profile)
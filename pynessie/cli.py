@@ -12,29 +12,63 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-"""Console script for nessie_client."""
+"""Console script for nessie_client.
 
+Subcommands and the client are imported only when a command runs, so that e.g. 'nessie --version' starts quickly.
+"""
+
+import importlib
+import io
 import sys
-from typing import Any
+from typing import Any, Dict, List, Optional, cast
 
 import click
-import confuse
 
 from pynessie import __version__
-from pynessie.cli_common_context import ContextObject
-from pynessie.client import NessieClient
-from pynessie.commands import (
-    branch_,
-    cherry_pick,
-    config,
-    content,
-    diff,
-    log,
-    merge,
-    remote,
-    tag,
-)
-from pynessie.conf import build_config
+
+# the module attribute that implements each subcommand, imported when the subcommand is looked up
+_COMMANDS = {
+    "branch": "pynessie.commands.branch:branch_",
+    "cache": "pynessie.commands.cache:cache",
+    "cherry-pick": "pynessie.commands.cherry_pick:cherry_pick",
+    "config": "pynessie.commands.config:config",
+    "content": "pynessie.commands.content:content",
+    "daemon": "pynessie.commands.daemon:daemon",
+    "diff": "pynessie.commands.diff:diff",
+    "log": "pynessie.commands.log:log",
+    "merge": "pynessie.commands.merge:merge",
+    "remote": "pynessie.commands.remote:remote",
+    "shell": "pynessie.commands.shell:shell",
+    "tag": "pynessie.commands.tag:tag",
+}
+# commands that manage the config file or the daemon itself, and the interactive shell, always run in-process
+_LOCAL_COMMANDS = {"config", "daemon", "remote", "shell"}
+# commands that use no client of the 'nessie' group, the shell builds its own from the options of the group
+_NO_CLIENT_COMMANDS = {"daemon", "shell"}
+# options of the 'nessie' group that take a value
+_OPTIONS_WITH_VALUE = {"--endpoint", "--auth-token"}
+# subcommands that may read stdin or start an editor, their options decide whether and how they are forwarded
+_INPUT_COMMANDS = {("content", "commit")}
+
+
+class LazyGroup(click.Group):
+    """Click group that imports its subcommands from 'module:attribute' references when they are first looked up."""
+
+    def __init__(self, *args: Any, lazy_commands: Optional[Dict[str, str]] = None, **kwargs: Any) -> None:
+        """Create a group with the given lazily imported subcommands in addition to the eagerly added ones."""
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        """Return the names of all subcommands without importing them."""
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        """Return the subcommand with the given name, importing it on first use."""
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            module_name, attribute = self.lazy_commands[cmd_name].split(":")
+            self.add_command(getattr(importlib.import_module(module_name), attribute), cmd_name)
+        return super().get_command(ctx, cmd_name)
 
 
 def _print_version(ctx: Any, param: Any, value: Any) -> None:
@@ -44,42 +78,100 @@ def _print_version(ctx: Any, param: Any, value: Any) -> None:
     ctx.exit()
 
 
-@click.group("nessie")
+@click.group("nessie", cls=LazyGroup, lazy_commands=_COMMANDS)
 @click.option("--json", is_flag=True, help="write output in json format.")
+@click.option(
+    "--raw-json",
+    is_flag=True,
+    help="write the JSON responses of the server unchanged, one per line, for the log, diff, content list and content view commands.",
+)
 @click.option("-v", "--verbose", is_flag=True, help="Verbose output.")
 @click.option("--endpoint", help="Optional endpoint, if different from config file.")
 @click.option("--auth-token", help="Optional bearer auth token, if different from config file.")
 @click.option("--version", is_flag=True, callback=_print_version, expose_value=False, is_eager=True)
 @click.pass_context
-def cli(ctx: click.core.Context, json: bool, verbose: bool, endpoint: str, auth_token: str) -> None:
+def cli(ctx: click.core.Context, json: bool, raw_json: bool, verbose: bool, endpoint: str, auth_token: str) -> None:
     """Nessie cli tool.
 
     Interact with Nessie branches and tables via the command line
     """
+    if ctx.invoked_subcommand in _NO_CLIENT_COMMANDS:
+        return
+    # pylint: disable=C0415
+    import confuse
+
+    from pynessie.cli_common_context import ContextObject, config_args
+    from pynessie.client import NessieClient
+    from pynessie.conf import build_config
+
     try:
-        cfg_map = {}
-        if endpoint:
-            cfg_map["endpoint"] = endpoint
-        if auth_token:
-            cfg_map["auth.type"] = "bearer"
-            cfg_map["auth.token"] = auth_token
-        nessie = NessieClient(build_config(cfg_map))
-        ctx.obj = ContextObject(nessie, verbose, json)
+        cfg_map = config_args(endpoint, auth_token)
+        if ctx.obj is not None:
+            # forwarded to the daemon, whose ClientPool keeps the client and its connections for the next command
+            nessie = ctx.obj.client(cfg_map)
+        else:
+            nessie = NessieClient(build_config(cfg_map))
+            ctx.call_on_close(nessie.close)
+        ctx.obj = ContextObject(nessie, verbose, json, raw_json)
     except confuse.exceptions.ConfigTypeError as e:
         raise click.ClickException(str(e)) from e
 
 
-cli.add_command(remote)
-cli.add_command(config)
-cli.add_command(log)
-cli.add_command(branch_)
-cli.add_command(tag)
-cli.add_command(merge)
-cli.add_command(cherry_pick)
-cli.add_command(content)
-cli.add_command(diff)
+def _command_index(args: List[str], start: int = 0) -> Optional[int]:
+    """Return the position of the first command name in 'args' from 'start' on, skipping options and their values."""
+    remaining = iter(range(start, len(args)))
+    for i in remaining:
+        if args[i] in _OPTIONS_WITH_VALUE:
+            next(remaining, None)
+        elif not args[i].startswith("-"):
+            return i
+    return None
 
 
-if __name__ == "__main__":
+def _forwarded_input(args: List[str], command: int) -> Optional[bytes]:
+    """Return the stdin to forward with the command line 'args', None if the command has to run in-process.
+
+    :param args: the arguments of the 'nessie' script
+    :param command: the position of the subcommand of the 'nessie' group in 'args'
+    """
+    sub_command = _command_index(args, command + 1)
+    if sub_command is None or (args[command], args[sub_command]) not in _INPUT_COMMANDS:
+        # stdin is only read for the commands that consume it, e.g. not for a command in a 'while read' loop
+        return b""
+    # the command's own parser handles combined short flags like '-is', only this command line pays for importing it
+    ctx = click.Context(cli)
+    group = cast(click.Group, cli.get_command(ctx, args[command]))
+    leaf = cast(click.Command, group.get_command(ctx, args[sub_command]))
+    leaf_args = args[sub_command:]
+    params = leaf.make_context(leaf_args[0], leaf_args[1:], resilient_parsing=True).params
+    if not params["message"] or not (params["delete"] or params["stdin"]):
+        # the commit message or the content is written in an editor, which needs the terminal of the script
+        return None
+    return sys.stdin.buffer.read() if params["stdin"] else b""
+
+
+def main() -> None:
+    """Run the 'nessie' script, in the running daemon if there is one (see 'nessie daemon') and in-process otherwise.
+
+    Commands are only forwarded when stdin is not a terminal and they do not start an editor, so interactive prompts
+    and editors keep working.
+    """
+    args = sys.argv[1:]
+    command = _command_index(args)
+    if command is not None and args[command] not in _LOCAL_COMMANDS and not sys.stdin.isatty():
+        stdin = _forwarded_input(args, command)
+        if stdin is not None:
+            from pynessie.daemon import forward  # pylint: disable=C0415
+
+            exit_code = forward(args, stdin)
+            if exit_code is not None:
+                sys.exit(exit_code)
+            if stdin:
+                # no daemon is running, the command reads the input that was already consumed
+                sys.stdin = io.TextIOWrapper(io.BytesIO(stdin), encoding=sys.stdin.encoding)
     # pylint: disable=no-value-for-parameter
-    sys.exit(cli())  # pragma: no cover
+    cli()
+
+
+if __name__ == "__main__":
+    main()  # pragma: no cover
@@ -15,13 +15,13 @@
 
 """Cli Common context functions that can be used by CLI commands/groups."""
 
-from typing import Any, Dict, List, Mapping, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
 
 import attr
 import click
 from click import Option, UsageError
 
-from pynessie.client import NessieClient
+from pynessie.client import NessieClient, RawJson
 
 
 @attr.s(auto_attribs=True)
@@ -31,6 +31,52 @@ class ContextObject:
     nessie: NessieClient
     verbose: bool
     json: bool
+    raw_json: bool = False
+
+
+def config_args(endpoint: Optional[str], auth_token: Optional[str]) -> Dict[str, Any]:
+    """Return the config settings that the --endpoint and --auth-token options of the nessie command override."""
+    args: Dict[str, Any] = {}
+    if endpoint:
+        args["endpoint"] = endpoint
+    if auth_token:
+        args["auth.type"] = "bearer"
+        args["auth.token"] = auth_token
+    return args
+
+
+def echo_raw_json(documents: Iterable[RawJson]) -> None:
+    """Write the JSON documents to stdout byte for byte as the server sent them, each followed by a newline.
+
+    Streamed documents are copied to stdout as they arrive from the server.
+    """
+    out = click.get_binary_stream("stdout")
+    for document in documents:
+        document.write_to(out)
+        out.write(b"\n")
+    out.flush()
+
+
+def echo_parquet(pages: Iterable[RawJson]) -> None:
+    """Write the rows of the log, entries or diff pages to stdout as a Parquet file, one row group per page."""
+    try:
+        from pynessie.arrow import write_parquet  # pylint: disable=C0415
+    except ImportError as e:
+        raise click.ClickException("Parquet output requires pyarrow, install it via 'pip install pynessie[arrow]'") from e
+    out = click.get_binary_stream("stdout")
+    write_parquet(pages, out)
+    out.flush()
+
+
+def raw_json_pages(fetch_page: Callable[[Optional[str]], RawJson]) -> Iterable[RawJson]:
+    """Yield the pages returned by 'fetch_page' for the continuation tokens of the server, starting with None."""
+    token: Optional[str] = None
+    while True:
+        page = fetch_page(token)
+        yield page
+        token = page.get("token") if page.get("hasMore") else None
+        if not token:
+            return
 
 
 class MutuallyExclusiveOption(Option):
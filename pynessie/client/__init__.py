@@ -15,6 +15,37 @@
 
 """Top-level package for Nessie Python Client."""
 
+from typing import TYPE_CHECKING, Any
+
+from pynessie.client._cache import CacheStats
+from pynessie.client._commit import BulkCommitStats, CommitResult
+from pynessie.client._commit_batcher import CommitBatcher
+from pynessie.client._json import RawJson
+from pynessie.client._session import RequestStats
 from pynessie.client.nessie_client import NessieClient
 
-__all__ = ["NessieClient"]
+if TYPE_CHECKING:
+    from pynessie.client.async_nessie_client import AsyncNessieClient
+
+__all__ = [
+    "AsyncNessieClient",
+    "BulkCommitStats",
+    "CacheStats",
+    "CommitBatcher",
+    "CommitResult",
+    "NessieClient",
+    "RawJson",
+    "RequestStats",
+]
+
+
+def __getattr__(name: str) -> Any:
+    # the asyncio client needs the optional httpx dependency, it is imported on first use
+    if name == "AsyncNessieClient":
+        # pylint: disable=C0415
+        from pynessie.client.async_nessie_client import (
+            AsyncNessieClient as async_client,
+        )
+
+        return async_client
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
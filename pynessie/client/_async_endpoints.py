@@ -0,0 +1,236 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Direct API operations on Nessie with httpx, the non-blocking counterpart of _endpoints."""
+
+from typing import Any, Optional, Union, cast
+
+import httpx
+
+from pynessie.client._async_session import AsyncNessieSession
+from pynessie.client._endpoints import _get_headers, _sanitize_url
+from pynessie.client._json import STDLIB_CODEC, JsonCodec
+from pynessie.error import _create_exception
+from pynessie.model import ContentKey
+
+
+def _codec(client: httpx.AsyncClient) -> JsonCodec:
+    return client.codec if isinstance(client, AsyncNessieSession) else STDLIB_CODEC
+
+
+async def _get(client: httpx.AsyncClient, url: str, params: Optional[dict] = None) -> Union[dict, list]:
+    r = await client.get(url, headers=_get_headers(), params=params)
+    return _check_error(r, _codec(client))
+
+
+async def _post(
+    client: httpx.AsyncClient, url: str, json: Union[str, dict, None] = None, params: Optional[dict] = None
+) -> Union[dict, list]:
+    if json is None:
+        r = await client.post(url, headers=_get_headers(), params=params)
+    else:
+        body = json.encode("utf-8") if isinstance(json, str) else _codec(client).dumps(json)
+        r = await client.post(url, headers=_get_headers(True), content=body, params=params)
+    return _check_error(r, _codec(client))
+
+
+def _check_error(r: httpx.Response, codec: JsonCodec) -> Union[dict, list]:
+    if 200 <= r.status_code < 300:
+        return codec.loads(r.content) if r.content else {}
+
+    try:
+        parsed_response = codec.loads(r.content)
+    except:  # NOQA # pylint: disable=W0702
+        # rare/unexpected case when the server responds with a non-JSON payload for an error
+        parsed_response = {}
+
+    raise _create_exception(parsed_response, r.status_code, r.reason_phrase, str(r.url))
+
+
+async def all_references(client: httpx.AsyncClient, base_url: str, fetch_all: bool = False) -> dict:
+    """Fetch all known references.
+
+    :param client: httpx client to send the request with
+    :param base_url: base Nessie url
+    :param fetch_all: indicates whether additional metadata should be fetched
+    :return: json list of Nessie references
+    """
+    url = _sanitize_url(base_url + "/trees")
+    params = {}
+    if fetch_all:
+        params["fetch"] = "ALL"
+    return cast(dict, await _get(client, url, params=params))
+
+
+async def get_reference(client: httpx.AsyncClient, base_url: str, ref: str) -> dict:
+    """Fetch a reference.
+
+    :param client: httpx client to send the request with
+    :param base_url: base Nessie url
+    :param ref: name of ref to fetch
+    :return: json Nessie branch or tag
+    """
+    url = _sanitize_url(base_url + "/trees/tree/{}", ref)
+    return cast(dict, await _get(client, url))
+
+
+async def get_default_branch(client: httpx.AsyncClient, base_url: str) -> dict:
+    """Fetch the default branch.
+
+    :param client: httpx client to send the request with
+    :param base_url: base Nessie url
+    :return: json Nessie branch
+    """
+    url = _sanitize_url(base_url + "/trees/tree")
+    return cast(dict, await _get(client, url))
+
+
+async def list_tables(
+    client: httpx.AsyncClient,
+    base_url: str,
+    ref: str,
+    hash_on_ref: Optional[str] = None,
+    max_result_hint: Optional[int] = None,
+    page_token: Optional[str] = None,
+    query_filter: Optional[str] = None,
+) -> dict:
+    """Fetch a list of all tables from a known reference.
+
+    :param client: httpx client to send the request with
+    :param base_url: base Nessie url
+    :param ref: reference
+    :param hash_on_ref: hash on reference
+    :param max_result_hint: hint for the server, maximum number of results to return
+    :param page_token: the token retrieved from a previous page returned for the same ref
+    :param query_filter: A CEL expression that allows advanced filtering capabilities
+    :return: json list of Nessie table names
+    """
+    url = _sanitize_url(base_url + "/trees/tree/{}/entries", ref)
+    params = {}
+    if max_result_hint:
+        params["maxRecords"] = str(max_result_hint)
+    if hash_on_ref:
+        params["hashOnRef"] = hash_on_ref
+    if page_token:
+        params["pageToken"] = page_token
+    if query_filter:
+        params["filter"] = query_filter
+    return cast(dict, await _get(client, url, params=params))
+
+
+async def list_logs(
+    client: httpx.AsyncClient,
+    base_url: str,
+    ref: str,
+    hash_on_ref: Optional[str] = None,
+    max_records: Optional[int] = None,
+    fetch_all: bool = False,
+    **filtering_args: Any,
+) -> dict:
+    """Fetch a list of all logs from a known starting reference.
+
+    :param client: httpx client to send the request with
+    :param base_url: base Nessie url
+    :param ref: starting reference
+    :param hash_on_ref: hash on reference
+    :param max_records: maximum number of entries to return
+    :param fetch_all: indicates whether additional metadata should be fetched
+    :param filtering_args: All of the args used to filter the log
+    :return: json dict of Nessie logs
+    """
+    url = _sanitize_url(base_url + "/trees/tree/{}/log", ref)
+    params = dict(filtering_args)
+    if hash_on_ref:
+        params["hashOnRef"] = hash_on_ref
+    if max_records:
+        params["maxRecords"] = max_records
+    if fetch_all:
+        params["fetch"] = "ALL"
+    return cast(dict, await _get(client, url, params=params))
+
+
+async def get_content(
+    client: httpx.AsyncClient, base_url: str, ref: str, content_key: ContentKey, hash_on_ref: Optional[str] = None
+) -> dict:
+    """Fetch a table from a known branch.
+
+    :param client: httpx client to send the request with
+    :param base_url: base Nessie url
+    :param ref: ref
+    :param content_key: key that is associated with content like table
+    :param hash_on_ref: hash on reference
+    :return: json dict of Nessie table
+    """
+    url = _sanitize_url(base_url + "/contents/{}", content_key.to_path_string())
+    params = {"ref": ref}
+    if hash_on_ref:
+        params["hashOnRef"] = hash_on_ref
+    return cast(dict, await _get(client, url, params=params))
+
+
+async def merge(client: httpx.AsyncClient, base_url: str, branch: str, merge_json: dict, expected_hash: Optional[str]) -> dict:
+    """Merge a branch into another branch.
+
+    :param client: httpx client to send the request with
+    :param base_url: base Nessie url
+    :param branch: name of branch to merge onto
+    :param merge_json: merge content
+    :param expected_hash: expected hash of HEAD of branch
+    :return: json dict of a merge response
+    """
+    url = _sanitize_url(base_url + "/trees/branch/{}/merge", branch)
+    params = {}
+    if expected_hash:
+        params["expectedHash"] = expected_hash
+    return cast(dict, await _post(client, url, json=merge_json, params=params))
+
+
+async def commit(client: httpx.AsyncClient, base_url: str, branch: str, operations: Union[str, dict], expected_hash: str) -> dict:
+    """Commit a set of operations to a branch.
+
+    :param client: httpx client to send the request with
+    :param base_url: base Nessie url
+    :param branch: name of branch to merge onto
+    :param operations: json object of operations
+    :param expected_hash: expected hash of HEAD of branch
+    :return: json dict of the new HEAD of the branch
+    """
+    url = _sanitize_url(base_url + "/trees/branch/{}/commit", branch)
+    params = {"expectedHash": expected_hash}
+    return cast(dict, await _post(client, url, json=operations, params=params))
+
+
+async def get_diff(
+    client: httpx.AsyncClient,
+    base_url: str,
+    from_ref: str,
+    to_ref: str,
+    from_hash_on_ref: Optional[str] = None,
+    to_hash_on_ref: Optional[str] = None,
+) -> dict:
+    """Fetch the diff for two given references.
+
+    :param client: httpx client to send the request with
+    :param base_url: base Nessie url
+    :param from_ref: the starting ref for the diff
+    :param to_ref:  the ending ref for the diff
+    :param from_hash_on_ref: optional hash on from reference
+    :param to_hash_on_ref: optional hash on to reference
+    :return: json dict of a Diff
+    """
+    from_hash_on_ref_asterisk = f"*{from_hash_on_ref}" if from_hash_on_ref else ""
+    to_hash_on_ref_asterisk = f"*{to_hash_on_ref}" if to_hash_on_ref else ""
+    url = _sanitize_url(base_url + "/diffs/{}{}...{}{}", from_ref, from_hash_on_ref_asterisk, to_ref, to_hash_on_ref_asterisk)
+    return cast(dict, await _get(client, url))
@@ -0,0 +1,77 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Pooled httpx client shared by all requests of an asyncio Nessie client, the non-blocking counterpart of _session."""
+
+import asyncio
+from typing import Any, Optional
+
+import httpx
+
+from pynessie.client._json import STDLIB_CODEC, JsonCodec
+from pynessie.client._session import (
+    REJECTED_STATUSES,
+    RETRY_STATUSES,
+    RequestStats,
+    Retries,
+    RetryPolicy,
+    has_expected_hash,
+)
+
+
+class AsyncNessieSession(httpx.AsyncClient):
+    """httpx AsyncClient that retries failed requests according to the retry policy, like NessieSession.
+
+    GETs are retried on transport errors, timeouts and the statuses of an unavailable server, changing requests only if
+    they carry an expected hash and certainly did not reach the server. The retries wait without blocking the event loop.
+    """
+
+    def __init__(self, retry_policy: Optional[RetryPolicy] = None, codec: JsonCodec = STDLIB_CODEC, **kwargs: Any) -> None:
+        """Create a session, 'kwargs' are passed to httpx.AsyncClient.
+
+        :param retry_policy: how to retry failed requests, no retries if not given
+        :param codec: JSON codec for the request and response bodies sent with this session
+        """
+        super().__init__(**kwargs)
+        self.codec = codec
+        self._retries = Retries(retry_policy if retry_policy is not None else RetryPolicy())
+
+    def stats(self) -> RequestStats:
+        """Return a snapshot of the request counters of this session."""
+        return self._retries.stats()
+
+    async def request(self, method: str, url: Any, **kwargs: Any) -> httpx.Response:  # type: ignore[override]
+        """Send a request, retrying it according to the retry policy."""
+        idempotent = method.upper() in ("GET", "HEAD")
+        conditional = not idempotent and has_expected_hash(kwargs)
+        retry = 0
+        while True:
+            self._retries.count(requests=1)
+            try:
+                response = await super().request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                # a connection that could not be established never reached the server
+                failed_before_sending = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if not (idempotent or (conditional and failed_before_sending)) or not self._retries.can_retry(retry):
+                    raise
+                delay = self._retries.policy.delay(retry)
+            else:
+                retryable = idempotent or (conditional and response.status_code in REJECTED_STATUSES)
+                if response.status_code not in RETRY_STATUSES or not retryable or not self._retries.can_retry(retry):
+                    return response
+                delay = self._retries.policy.delay(retry, response.headers)
+                await response.aclose()
+            self._retries.count(retries=1)
+            retry += 1
+            await asyncio.sleep(delay)
@@ -0,0 +1,135 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Client side caches of server responses."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import attr
+import confuse
+
+from pynessie.model import Content, ContentKey, Reference
+
+
+@attr.dataclass
+class CacheStats:
+    """Counters of a client side cache."""
+
+    hits: int = 0
+    misses: int = 0
+    size: int = 0
+    maxsize: int = 0
+
+
+class ContentCache:
+    """Thread-safe LRU cache of contents keyed by commit hash and content key.
+
+    Cached Content objects are shared between all callers and must not be modified.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """Create a cache that holds at most 'maxsize' contents."""
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, str], Content]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, hash_: str, key: ContentKey) -> Optional[Content]:
+        """Return the cached content of 'key' at commit 'hash_', None if it is not cached."""
+        cache_key = (hash_, key.to_path_string())
+        with self._lock:
+            content = self._entries.get(cache_key)
+            if content is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self._hits += 1
+            return content
+
+    def put(self, hash_: str, key: ContentKey, content: Content) -> None:
+        """Cache the content of 'key' at commit 'hash_', evicting the least recently used content if the cache is full."""
+        cache_key = (hash_, key.to_path_string())
+        with self._lock:
+            self._entries[cache_key] = content
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached contents and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the counters of this cache."""
+        with self._lock:
+            return CacheStats(self._hits, self._misses, len(self._entries), self._maxsize)
+
+
+class ReferenceCache:
+    """Thread-safe cache of references by name, entries expire after a fixed time to live.
+
+    The default branch, i.e. the reference looked up without a name, is cached under the name None.
+    """
+
+    def __init__(self, ttl_sec: float) -> None:
+        """Create a cache that keeps references for 'ttl_sec' seconds."""
+        self._ttl_sec = ttl_sec
+        self._entries: Dict[Optional[str], Tuple[float, Reference]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: Optional[str]) -> Optional[Reference]:
+        """Return a copy of the cached reference for 'name', None if it is not cached or expired."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[name]
+                return None
+            return attr.evolve(entry[1])
+
+    def put(self, name: Optional[str], reference: Reference) -> None:
+        """Cache a copy of 'reference' for 'name'."""
+        with self._lock:
+            self._entries[name] = (time.monotonic() + self._ttl_sec, attr.evolve(reference))
+
+    def invalidate(self, *names: str) -> None:
+        """Drop the given references and the default branch, which may be one of them."""
+        with self._lock:
+            for name in (None, *names):
+                self._entries.pop(name, None)
+
+    def clear(self) -> None:
+        """Drop all cached references."""
+        with self._lock:
+            self._entries.clear()
+
+
+def build_content_cache(config: confuse.Configuration) -> Optional[ContentCache]:
+    """Create a ContentCache from the 'cache.content' settings of the given config, None if it is disabled."""
+    maxsize = config["cache"]["content"]["maxsize"].get(int)
+    return ContentCache(maxsize) if maxsize > 0 else None
+
+
+def build_reference_cache(config: confuse.Configuration) -> Optional[ReferenceCache]:
+    """Create a ReferenceCache from the 'cache.reference' settings of the given config, None if it is disabled."""
+    ttl_sec = config["cache"]["reference"]["ttl"].get(int)
+    return ReferenceCache(ttl_sec) if ttl_sec > 0 else None
@@ -0,0 +1,97 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Helpers for committing to branches that many writers change concurrently."""
+
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import attr
+
+from pynessie.client._json import STDLIB_CODEC, JsonCodec
+from pynessie.encoders import dump
+from pynessie.model import (
+    Branch,
+    CommitMeta,
+    CommitMetaSchema,
+    Content,
+    ContentWithKey,
+    Operation,
+    OperationsSchema,
+    Put,
+)
+
+
+@attr.dataclass
+class CommitResult:
+    """Outcome of a commit that may have needed several attempts."""
+
+    branch: Branch
+    latencies: List[float]
+
+    @property
+    def attempts(self) -> int:
+        """Number of commit requests sent to the server."""
+        return len(self.latencies)
+
+
+def expected_contents(ops: Sequence[Operation]) -> Dict[str, Content]:
+    """Return the expected contents of the Put operations that carry one, keyed by content key path."""
+    return {op.key.to_path_string(): op.expectedContent for op in ops if isinstance(op, Put) and op.expectedContent is not None}
+
+
+def expected_contents_unchanged(expected: Dict[str, Content], current: List[ContentWithKey]) -> bool:
+    """Check whether the contents found at a new HEAD are still the ones the operations expect."""
+    found = {c.key.to_path_string(): c.content for c in current}
+    return all(found.get(path) == content for path, content in expected.items())
+
+
+@attr.dataclass
+class BulkCommitStats:
+    """Progress of a bulk commit, reported after every commit."""
+
+    branch: Branch
+    commits: int = 0
+    operations: int = 0
+    bytes_sent: int = 0
+    elapsed_sec: float = 0.0
+
+    @property
+    def operations_per_sec(self) -> float:
+        """Committed operations per second so far."""
+        return self.operations / self.elapsed_sec if self.elapsed_sec > 0 else 0.0
+
+
+def encode_commit_chunks(
+    meta: CommitMeta, ops: Iterable[Operation], max_operations: int, max_bytes: int, codec: JsonCodec = STDLIB_CODEC
+) -> Iterator[Tuple[int, bytes]]:
+    """Encode operations into the JSON bodies of consecutive commits, each operation is serialized exactly once.
+
+    A body holds at most 'max_operations' operations and, unless a single operation is larger, at most 'max_bytes' bytes.
+
+    :return: the number of operations and the UTF-8 encoded body of every commit
+    """
+    prefix = b'{"commitMeta": ' + codec.dumps(dump(CommitMetaSchema, meta)) + b', "operations": ['
+    suffix = b"]}"
+    chunk: List[bytes] = []
+    size = len(prefix) + len(suffix)
+    for op in ops:
+        encoded = codec.dumps(dump(OperationsSchema, op))
+        if chunk and (len(chunk) >= max_operations or size + len(encoded) + 2 > max_bytes):
+            yield len(chunk), prefix + b", ".join(chunk) + suffix
+            chunk = []
+            size = len(prefix) + len(suffix)
+        chunk.append(encoded)
+        size += len(encoded) + 2
+    if chunk:
+        yield len(chunk), prefix + b", ".join(chunk) + suffix
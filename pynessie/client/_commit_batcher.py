@@ -0,0 +1,156 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Group commits: operations of many producers are coalesced into few commits to one branch."""
+
+import threading
+import time
+from concurrent.futures import Future
+from types import TracebackType
+from typing import List, Optional, Set, Type
+
+import attr
+
+from pynessie.client.nessie_client import NessieClient
+from pynessie.error import NessieInvalidUsageException
+from pynessie.model import Branch, Operation
+
+
+@attr.dataclass
+class _Submission:
+    ops: List[Operation]
+    future: "Future[Branch]"
+
+    def keys(self) -> Set[str]:
+        """Return the paths of the content keys changed by this submission."""
+        return {op.key.to_path_string() for op in self.ops}
+
+
+def split_into_commits(submissions: List[_Submission]) -> List[List[_Submission]]:
+    """Group submissions into as few commits as possible, so that no content key is changed twice in one commit.
+
+    The operations of a submission always end up in the same commit, and submissions that touch the same key are
+    committed in the order they were submitted.
+    """
+    commits: List[List[_Submission]] = []
+    commit_keys: List[Set[str]] = []
+    for submission in submissions:
+        keys = submission.keys()
+        index = 1 + max((i for i, used in enumerate(commit_keys) if used & keys), default=-1)
+        if index == len(commits):
+            commits.append([])
+            commit_keys.append(set())
+        commits[index].append(submission)
+        commit_keys[index] |= keys
+    return commits
+
+
+class CommitBatcher:  # pylint: disable=R0902
+    """Collects operations from many threads and commits them to one branch in batches.
+
+    Pending operations are committed once 'max_operations' have been submitted or 'flush_interval_sec' after the first of
+    them was submitted. Every batch is committed via NessieClient.commit_with_retry, so concurrent writers in other
+    processes only cause rebases. The batcher must be closed, which commits all pending operations.
+    """
+
+    def __init__(
+        self,
+        client: NessieClient,
+        branch: str,
+        message: str = "Batched commit",
+        author: Optional[str] = None,
+        flush_interval_sec: float = 0.05,
+        max_operations: int = 100,
+    ) -> None:
+        """Create a batcher that commits to 'branch' using 'client' and start its background thread.
+
+        :param client: client used to commit
+        :param branch: name of the branch to commit to
+        :param message: commit message of every batch
+        :param author: commit author of every batch
+        :param flush_interval_sec: maximum time an operation waits for more operations before it is committed
+        :param max_operations: number of pending operations that triggers a commit immediately
+        """
+        self._client = client
+        self._branch = branch
+        self._message = message
+        self._author = author
+        self._flush_interval_sec = flush_interval_sec
+        self._max_operations = max_operations
+        self._pending: List[_Submission] = []
+        self._pending_ops = 0
+        self._first_pending_at = 0.0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=f"nessie-commit-batcher-{branch}", daemon=True)
+        self._thread.start()
+
+    def submit(self, *ops: Operation) -> "Future[Branch]":
+        """Queue operations for the next batch, the returned future resolves to the branch after their commit."""
+        if not ops:
+            raise NessieInvalidUsageException("At least one operation must be submitted")
+        future: "Future[Branch]" = Future()
+        with self._condition:
+            if self._closed:
+                raise NessieInvalidUsageException("The commit batcher is closed")
+            if not self._pending:
+                self._first_pending_at = time.monotonic()
+            self._pending.append(_Submission(list(ops), future))
+            self._pending_ops += len(ops)
+            self._condition.notify()
+        return future
+
+    def close(self) -> None:
+        """Commit all pending operations and stop the background thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def __enter__(self) -> "CommitBatcher":
+        """Return this batcher, which is closed when leaving the context."""
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException], exc_tb: Optional[TracebackType]) -> None:
+        """Close this batcher."""
+        self.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed and not self._is_due():
+                    timeout = self._first_pending_at + self._flush_interval_sec - time.monotonic() if self._pending else None
+                    self._condition.wait(timeout)
+                batch, self._pending, self._pending_ops = self._pending, [], 0
+                closed = self._closed
+            for submissions in split_into_commits(batch):
+                self._commit(submissions)
+            if closed:
+                return
+
+    def _is_due(self) -> bool:
+        if not self._pending:
+            return False
+        return self._pending_ops >= self._max_operations or time.monotonic() >= self._first_pending_at + self._flush_interval_sec
+
+    def _commit(self, submissions: List[_Submission]) -> None:
+        ops = [op for submission in submissions for op in submission.ops]
+        try:
+            branch = self._client.commit_with_retry(self._branch, ops, self._message, self._author).branch
+        except Exception as e:  # pylint: disable=W0703
+            for submission in submissions:
+                submission.future.set_exception(e)
+            return
+        for submission in submissions:
+            submission.future.set_result(branch)
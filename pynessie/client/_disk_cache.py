@@ -0,0 +1,211 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Persistent cache for hash-pinned server responses, shared by all processes that use the same config directory."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import closing, contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import attr
+import confuse
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)",
+    "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+)
+# reads only read the database, their hits, misses and last use times are written at most this often
+_READS_WRITE_INTERVAL_SEC = 5.0
+
+
+@attr.dataclass
+class DiskCacheStats:
+    """Counters of the on-disk cache."""
+
+    path: str
+    hits: int
+    misses: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+
+class _Reads:
+    """Hits, misses and last use times of the reads of a cache, kept in memory until they are written in a batch."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._last_used: Dict[str, float] = {}
+        self._written_at = time.monotonic()
+
+    def record(self, key: str, hit: bool) -> bool:
+        """Record a read of 'key', return whether the recorded reads are due to be written."""
+        with self._lock:
+            if hit:
+                self._hits += 1
+                self._last_used[key] = time.time()
+            else:
+                self._misses += 1
+            return time.monotonic() - self._written_at >= _READS_WRITE_INTERVAL_SEC
+
+    def __bool__(self) -> bool:
+        """Return whether reads are recorded that are not written yet."""
+        with self._lock:
+            return bool(self._hits or self._misses)
+
+    def write(self, conn: sqlite3.Connection) -> None:
+        """Write the recorded reads in the write transaction of 'conn' and forget them."""
+        with self._lock:
+            hits, misses, last_used = self._hits, self._misses, self._last_used
+            self._hits, self._misses, self._last_used = 0, 0, {}
+            self._written_at = time.monotonic()
+        # another process may have used an entry later, or evicted it meanwhile
+        conn.executemany("UPDATE entries SET last_used = max(last_used, ?) WHERE key = ?", [(t, k) for k, t in last_used.items()])
+        for name, delta in (("hits", hits), ("misses", misses)):
+            if delta:
+                _increment(conn, name, delta)
+
+
+class DiskCache:
+    """LRU cache of JSON documents in an SQLite database with a cap on the total size of the cached documents.
+
+    Every write runs in its own transaction, so several processes and threads can use the same database. Reads take no
+    write lock, they record their hits and last use times in memory, which are written with the next put, at most every
+    few seconds by a later read, by flush() and when the cache is garbage collected or the process exits.
+    """
+
+    def __init__(self, path: str, max_bytes: int, timeout_sec: float = 30.0) -> None:
+        """Create a cache stored at 'path' that holds at most 'max_bytes' of JSON documents."""
+        self.path = path
+        self._max_bytes = max_bytes
+        self._timeout_sec = timeout_sec
+        self._reads = _Reads()
+        with closing(_connect(path, timeout_sec)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+        weakref.finalize(self, _write_reads, path, timeout_sec, self._reads)
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """Build a cache key from JSON serializable parts."""
+        return json.dumps(parts, sort_keys=True, separators=(",", ":"))
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached JSON document for 'key', None if it is not cached."""
+        with closing(_connect(self.path, self._timeout_sec)) as conn:
+            row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if self._reads.record(key, row is not None):
+            try:
+                # without waiting, if another process is writing the reads are written by a later operation
+                _write_reads(self.path, 0, self._reads)
+            except sqlite3.OperationalError:
+                pass
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, key: str, value: Any) -> None:
+        """Cache a JSON document for 'key', evicting the least recently used documents to stay within the size cap."""
+        serialized = json.dumps(value)
+        size = len(serialized.encode("utf-8"))
+        if size > self._max_bytes:
+            return
+        with _write_transaction(self.path, self._timeout_sec) as conn:
+            self._reads.write(conn)
+            row = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", (key, serialized, size, time.time()))
+            total = _increment(conn, "bytes", size - (row[0] if row else 0))
+            if total > self._max_bytes:
+                self._evict(conn, total - self._max_bytes)
+
+    def clear(self) -> None:
+        """Remove all cached documents and reset the counters."""
+        with _write_transaction(self.path, self._timeout_sec) as conn:
+            self._reads.write(conn)
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM counters")
+
+    def stats(self) -> DiskCacheStats:
+        """Return a snapshot of the counters of this cache, including the reads of this cache not yet written."""
+        with _write_transaction(self.path, self._timeout_sec) as conn:
+            self._reads.write(conn)
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+            entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return DiskCacheStats(
+            self.path, counters.get("hits", 0), counters.get("misses", 0), entries, counters.get("bytes", 0), self._max_bytes
+        )
+
+    def flush(self) -> None:
+        """Write the hits, misses and last use times of the reads of this cache to the database."""
+        _write_reads(self.path, self._timeout_sec, self._reads)
+
+    def _evict(self, conn: sqlite3.Connection, excess_bytes: int) -> None:
+        evicted_keys = []
+        evicted_bytes = 0
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_used"):
+            evicted_keys.append((key,))
+            evicted_bytes += size
+            if evicted_bytes >= excess_bytes:
+                break
+        conn.executemany("DELETE FROM entries WHERE key = ?", evicted_keys)
+        _increment(conn, "bytes", -evicted_bytes)
+
+
+def _increment(conn: sqlite3.Connection, name: str, delta: int) -> int:
+    conn.execute(
+        "INSERT INTO counters VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+        (name, delta),
+    )
+    return conn.execute("SELECT value FROM counters WHERE name = ?", (name,)).fetchone()[0]
+
+
+def _connect(path: str, timeout_sec: float) -> sqlite3.Connection:
+    # autocommit, so that a single SELECT is a read transaction of its own, which in WAL mode waits for no writer
+    return sqlite3.connect(path, timeout=timeout_sec, isolation_level=None)
+
+
+@contextmanager
+def _write_transaction(path: str, timeout_sec: float) -> Iterator[sqlite3.Connection]:
+    # a fresh connection per operation in one write transaction serializes concurrent writers across processes
+    with closing(_connect(path, timeout_sec)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+def _write_reads(path: str, timeout_sec: float, reads: _Reads) -> None:
+    if not reads:
+        return
+    with _write_transaction(path, timeout_sec) as conn:
+        reads.write(conn)
+
+
+def build_disk_cache(config: confuse.Configuration) -> Optional[DiskCache]:
+    """Create a DiskCache from the 'cache.disk' settings of the given config, None if it is disabled."""
+    max_bytes = config["cache"]["disk"]["maxbytes"].get(int)
+    if max_bytes <= 0:
+        return None
+    path = config["cache"]["disk"]["path"].get()
+    return DiskCache(path if path else os.path.join(config.config_dir(), "cache.sqlite"), max_bytes)
@@ -15,7 +15,6 @@
 
 """Direct API operations on Nessie with requests."""
 
-import json as jsonlib
 import os
 from typing import Any, Optional, Union, cast
 from urllib.parse import quote
@@ -23,10 +22,14 @@ from urllib.parse import quote
 import requests
 from requests.auth import AuthBase
 
+from pynessie.client._json import STDLIB_CODEC, JsonCodec, RawJson
+from pynessie.client._session import NessieSession
 from pynessie.error import _create_exception
 from pynessie.model import ContentKey
 
 DEFAULT_TIMEOUT_SEC = int(os.getenv("PYNESSIE_HTTP_TIMEOUT_SEC", "60"))
+# size of the chunks in which streamed response bodies are read
+_STREAM_CHUNK_BYTES = 64 * 1024
 
 
 def _sanitize_timeout(timeout_sec: Optional[int]) -> Optional[int]:
@@ -48,59 +51,107 @@ def _sanitize_url(url: str, *args: str) -> str:
     return url.format(*[quote(arg, safe="") for arg in args])
 
 
+def _codec(session: Optional[requests.Session]) -> JsonCodec:
+    return session.codec if isinstance(session, NessieSession) else STDLIB_CODEC
+
+
+def _body(json: Union[str, bytes, dict, None], session: Optional[requests.Session]) -> Optional[bytes]:
+    # bodies that are already encoded are sent as is, encoding them again would double the CPU and memory spent
+    if json is None or isinstance(json, bytes):
+        return json
+    if isinstance(json, str):
+        return json.encode("utf-8")
+    return _codec(session).dumps(json)
+
+
+def _requester(session: Optional[requests.Session]) -> Any:
+    # without a session every request goes through the module level functions and opens a new connection
+    return session if session is not None else requests
+
+
 def _get(
-    url: str, auth: Optional[AuthBase], ssl_verify: bool = True, params: Optional[dict] = None, timeout_sec: Optional[int] = None
-) -> Union[str, dict, list]:
+    url: str,
+    auth: Optional[AuthBase],
+    ssl_verify: bool = True,
+    params: Optional[dict] = None,
+    timeout_sec: Optional[int] = None,
+    session: Optional[requests.Session] = None,
+    raw: bool = False,
+    stream: bool = False,
+) -> Union[str, dict, list, RawJson]:
     timeout_sec = _sanitize_timeout(timeout_sec)
-    r = requests.get(url, headers=_get_headers(), verify=ssl_verify, params=params, auth=auth, timeout=timeout_sec)
-    return _check_error(r)
+    r = _requester(session).get(
+        url, headers=_get_headers(), verify=ssl_verify, params=params, auth=auth, timeout=timeout_sec, stream=raw and stream
+    )
+    return _check_error(r, session, raw, stream)
 
 
 def _post(
     url: str,
     auth: Optional[AuthBase],
-    json: Union[str, dict, None] = None,
+    json: Union[str, bytes, dict, None] = None,
     ssl_verify: bool = True,
     params: Optional[dict] = None,
     timeout_sec: Optional[int] = None,
-) -> Union[str, dict, list]:
+    session: Optional[requests.Session] = None,
+) -> Union[str, dict, list, RawJson]:
     timeout_sec = _sanitize_timeout(timeout_sec)
-    if isinstance(json, str):
-        json = jsonlib.loads(json)
-    r = requests.post(
-        url, headers=_get_headers(json is not None), verify=ssl_verify, json=json, params=params, auth=auth, timeout=timeout_sec
+    r = _requester(session).post(
+        url,
+        headers=_get_headers(json is not None),
+        verify=ssl_verify,
+        data=_body(json, session),
+        params=params,
+        auth=auth,
+        timeout=timeout_sec,
     )
-    return _check_error(r)
+    return _check_error(r, session)
 
 
 def _delete(
-    url: str, auth: Optional[AuthBase], ssl_verify: bool = True, params: Optional[dict] = None, timeout_sec: Optional[int] = None
-) -> Union[str, dict, list]:
+    url: str,
+    auth: Optional[AuthBase],
+    ssl_verify: bool = True,
+    params: Optional[dict] = None,
+    timeout_sec: Optional[int] = None,
+    session: Optional[requests.Session] = None,
+) -> Union[str, dict, list, RawJson]:
     timeout_sec = _sanitize_timeout(timeout_sec)
-    r = requests.delete(url, headers=_get_headers(), verify=ssl_verify, params=params, auth=auth, timeout=timeout_sec)
-    return _check_error(r)
+    r = _requester(session).delete(url, headers=_get_headers(), verify=ssl_verify, params=params, auth=auth, timeout=timeout_sec)
+    return _check_error(r, session)
 
 
 def _put(
     url: str,
     auth: Optional[AuthBase],
-    json: Union[str, dict, None] = None,
+    json: Union[str, bytes, dict, None] = None,
     ssl_verify: bool = True,
     params: Optional[dict] = None,
     timeout_sec: Optional[int] = None,
+    session: Optional[requests.Session] = None,
 ) -> Any:
     timeout_sec = _sanitize_timeout(timeout_sec)
-    if isinstance(json, str):
-        json = jsonlib.loads(json)
-    r = requests.put(
-        url, headers=_get_headers(json is not None), verify=ssl_verify, json=json, params=params, auth=auth, timeout=timeout_sec
+    r = _requester(session).put(
+        url,
+        headers=_get_headers(json is not None),
+        verify=ssl_verify,
+        data=_body(json, session),
+        params=params,
+        auth=auth,
+        timeout=timeout_sec,
     )
-    return _check_error(r)
+    return _check_error(r, session)
 
 
-def _check_error(r: requests.models.Response) -> Union[dict, list]:
+def _check_error(
+    r: requests.models.Response, session: Optional[requests.Session] = None, raw: bool = False, stream: bool = False
+) -> Union[dict, list, RawJson]:
     if 200 <= r.status_code < 300:
-        return r.json() if r.content else {}
+        if raw and stream:
+            return RawJson.streamed(r.iter_content(_STREAM_CHUNK_BYTES), r.close, _codec(session))
+        if raw:
+            return RawJson(r.content, _codec(session))
+        return _codec(session).loads(r.content) if r.content else {}
 
     if isinstance(r.reason, bytes):
         try:
@@ -111,7 +162,7 @@ def _check_error(r: requests.models.Response) -> Union[dict, list]:
         reason = r.reason
 
     try:
-        parsed_response = r.json()
+        parsed_response = _codec(session).loads(r.content)
     except:  # NOQA # pylint: disable=W0702
         # rare/unexpected case when the server responds with a non-JSON payload for an error
         parsed_response = {}
@@ -119,37 +170,66 @@ def _check_error(r: requests.models.Response) -> Union[dict, list]:
     raise _create_exception(parsed_response, r.status_code, reason, r.url)
 
 
-def all_references(base_url: str, auth: Optional[AuthBase], ssl_verify: bool = True, fetch_all: bool = False) -> dict:
+def all_references(
+    base_url: str,
+    auth: Optional[AuthBase],
+    ssl_verify: bool = True,
+    fetch_all: bool = False,
+    max_records: Optional[int] = None,
+    page_token: Optional[str] = None,
+    query_filter: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+    raw: bool = False,
+) -> Union[dict, RawJson]:
     """Fetch all known references.
 
     :param base_url: base Nessie url
     :param auth: Authentication settings
     :param ssl_verify: ignore ssl errors if False
     :param fetch_all: indicates whether additional metadata should be fetched
+    :param max_records: hint for the server, maximum number of references to return
+    :param page_token: the token retrieved from a previous page of references
+    :param query_filter: A CEL expression that allows advanced filtering capabilities
+    :param session: optional pooled session to send the request with
+    :param raw: return the undecoded response body as RawJson instead of decoding it
     :return: json list of Nessie references
     """
     url = _sanitize_url(base_url + "/trees")
     params = {}
     if fetch_all:
         params["fetch"] = "ALL"
-    return cast(dict, _get(url, auth, ssl_verify=ssl_verify, params=params))
+    if max_records:
+        params["maxRecords"] = str(max_records)
+    if page_token:
+        params["pageToken"] = page_token
+    if query_filter:
+        params["filter"] = query_filter
+    return cast(Union[dict, RawJson], _get(url, auth, ssl_verify=ssl_verify, params=params, session=session, raw=raw))
 
 
-def get_reference(base_url: str, auth: Optional[AuthBase], ref: str, ssl_verify: bool = True) -> dict:
+def get_reference(
+    base_url: str, auth: Optional[AuthBase], ref: str, ssl_verify: bool = True, session: Optional[requests.Session] = None
+) -> dict:
     """Fetch a reference.
 
     :param base_url: base Nessie url
     :param auth: Authentication settings
     :param ref: name of ref to fetch
     :param ssl_verify: ignore ssl errors if False
+    :param session: optional pooled session to send the request with
     :return: json Nessie branch or tag
     """
     url = _sanitize_url(base_url + "/trees/tree/{}", ref)
-    return cast(dict, _get(url, auth, ssl_verify=ssl_verify))
+    return cast(dict, _get(url, auth, ssl_verify=ssl_verify, session=session))
 
 
 def create_reference(
-    base_url: str, auth: Optional[AuthBase], ref_json: dict, source_ref: Optional[str] = None, ssl_verify: bool = True
+    base_url: str,
+    auth: Optional[AuthBase],
+    ref_json: dict,
+    source_ref: Optional[str] = None,
+    ssl_verify: bool = True,
+    session: Optional[requests.Session] = None,
 ) -> dict:
     """Create a reference.
 
@@ -158,28 +238,34 @@ def create_reference(
     :param ref_json: reference to create as json object
     :param source_ref: name of the reference via which the hash in 'ref_json' is reachable
     :param ssl_verify: ignore ssl errors if False
+    :param session: optional pooled session to send the request with
     :return: json Nessie branch or tag
     """
     url = _sanitize_url(base_url + "/trees/tree")
     params = {}
     if source_ref:
         params["sourceRefName"] = source_ref
-    return cast(dict, _post(url, auth, ref_json, ssl_verify=ssl_verify, params=params))
+    return cast(dict, _post(url, auth, ref_json, ssl_verify=ssl_verify, params=params, session=session))
 
 
-def get_default_branch(base_url: str, auth: Optional[AuthBase], ssl_verify: bool = True) -> dict:
+def get_default_branch(
+    base_url: str, auth: Optional[AuthBase], ssl_verify: bool = True, session: Optional[requests.Session] = None
+) -> dict:
     """Fetch a reference.
 
     :param base_url: base Nessie url
     :param auth: Authentication settings
     :param ssl_verify: ignore ssl errors if False
+    :param session: optional pooled session to send the request with
     :return: json Nessie branch
     """
     url = _sanitize_url(base_url + "/trees/tree")
-    return cast(dict, _get(url, auth, ssl_verify=ssl_verify))
+    return cast(dict, _get(url, auth, ssl_verify=ssl_verify, session=session))
 
 
-def delete_branch(base_url: str, auth: Optional[AuthBase], branch: str, hash_: str, ssl_verify: bool = True) -> None:
+def delete_branch(
+    base_url: str, auth: Optional[AuthBase], branch: str, hash_: str, ssl_verify: bool = True, session: Optional[requests.Session] = None
+) -> None:
     """Delete a branch.
 
     :param base_url: base Nessie url
@@ -187,13 +273,16 @@ def delete_branch(base_url: str, auth: Optional[AuthBase], branch: str, hash_: s
     :param branch: name of branch to delete
     :param hash_: branch hash
     :param ssl_verify: ignore ssl errors if False
+    :param session: optional pooled session to send the request with
     """
     url = _sanitize_url(base_url + "/trees/branch/{}", branch)
     params = {"expectedHash": hash_}
-    _delete(url, auth, ssl_verify=ssl_verify, params=params)
+    _delete(url, auth, ssl_verify=ssl_verify, params=params, session=session)
 
 
-def delete_tag(base_url: str, auth: Optional[AuthBase], tag: str, hash_: str, ssl_verify: bool = True) -> None:
+def delete_tag(
+    base_url: str, auth: Optional[AuthBase], tag: str, hash_: str, ssl_verify: bool = True, session: Optional[requests.Session] = None
+) -> None:
     """Delete a tag.
 
     :param base_url: base Nessie url
@@ -201,10 +290,11 @@ def delete_tag(base_url: str, auth: Optional[AuthBase], tag: str, hash_: str, ss
     :param tag: name of tag to delete
     :param hash_: tag hash
     :param ssl_verify: ignore ssl errors if False
+    :param session: optional pooled session to send the request with
     """
     url = _sanitize_url(base_url + "/trees/tag/{}", tag)
     params = {"expectedHash": hash_}
-    _delete(url, auth, ssl_verify=ssl_verify, params=params)
+    _delete(url, auth, ssl_verify=ssl_verify, params=params, session=session)
 
 
 def list_tables(
@@ -216,7 +306,10 @@ def list_tables(
     page_token: Optional[str] = None,
     query_filter: Optional[str] = None,
     ssl_verify: bool = True,
-) -> list:
+    session: Optional[requests.Session] = None,
+    raw: bool = False,
+    stream: bool = False,
+) -> Union[list, RawJson]:
     """Fetch a list of all tables from a known reference.
 
     :param base_url: base Nessie url
@@ -227,6 +320,9 @@ def list_tables(
     :param page_token: the token retrieved from a previous page returned for the same ref
     :param query_filter: A CEL expression that allows advanced filtering capabilities
     :param ssl_verify: ignore ssl errors if False
+    :param session: optional pooled session to send the request with
+    :param raw: return the undecoded response body as RawJson instead of decoding it
+    :param stream: with raw, read the response body only when the RawJson is first used, see RawJson.write_to()
     :return: json list of Nessie table names
     """
     url = _sanitize_url(base_url + "/trees/tree/{}/entries", ref)
@@ -239,7 +335,7 @@ def list_tables(
         params["pageToken"] = page_token
     if query_filter:
         params["filter"] = query_filter
-    return cast(list, _get(url, auth, ssl_verify=ssl_verify, params=params))
+    return cast(Union[list, RawJson], _get(url, auth, ssl_verify=ssl_verify, params=params, session=session, raw=raw, stream=stream))
 
 
 def list_logs(
@@ -250,8 +346,11 @@ def list_logs(
     ssl_verify: bool = True,
     max_records: Optional[int] = None,
     fetch_all: bool = False,
+    session: Optional[requests.Session] = None,
+    raw: bool = False,
+    stream: bool = False,
     **filtering_args: Any,
-) -> dict:
+) -> Union[dict, RawJson]:
     """Fetch a list of all logs from a known starting reference.
 
     :param base_url: base Nessie url
@@ -262,6 +361,9 @@ def list_logs(
     :param ssl_verify: ignore ssl errors if False
     :param fetch_all: indicates whether additional metadata should be fetched
     :param filtering_args: All of the args used to filter the log
+    :param session: optional pooled session to send the request with
+    :param raw: return the undecoded response body as RawJson instead of decoding it
+    :param stream: with raw, read the response body only when the RawJson is first used, see RawJson.write_to()
     :return: json dict of Nessie logs
     """
     url = _sanitize_url(base_url + "/trees/tree/{}/log", ref)
@@ -272,12 +374,22 @@ def list_logs(
         params["maxRecords"] = max_records
     if fetch_all:
         params["fetch"] = "ALL"
-    return cast(dict, _get(url, auth, ssl_verify=ssl_verify, params=filtering_args))
+    return cast(
+        Union[dict, RawJson], _get(url, auth, ssl_verify=ssl_verify, params=filtering_args, session=session, raw=raw, stream=stream)
+    )
 
 
 def get_content(
-    base_url: str, auth: Optional[AuthBase], ref: str, content_key: ContentKey, hash_on_ref: Optional[str] = None, ssl_verify: bool = True
-) -> dict:
+    base_url: str,
+    auth: Optional[AuthBase],
+    ref: str,
+    content_key: ContentKey,
+    hash_on_ref: Optional[str] = None,
+    ssl_verify: bool = True,
+    session: Optional[requests.Session] = None,
+    raw: bool = False,
+    stream: bool = False,
+) -> Union[dict, RawJson]:
     """Fetch a table from a known branch.
 
     :param base_url: base Nessie url
@@ -286,17 +398,53 @@ def get_content(
     :param hash_on_ref: hash on reference
     :param content_key: key that is associated with content like table
     :param ssl_verify: ignore ssl errors if False
+    :param session: optional pooled session to send the request with
+    :param raw: return the undecoded response body as RawJson instead of decoding it
+    :param stream: with raw, read the response body only when the RawJson is first used, see RawJson.write_to()
     :return: json dict of Nessie table
     """
     url = _sanitize_url(base_url + "/contents/{}", content_key.to_path_string())
     params = {"ref": ref}
     if hash_on_ref:
         params["hashOnRef"] = hash_on_ref
-    return cast(dict, _get(url, auth, ssl_verify=ssl_verify, params=params))
+    return cast(Union[dict, RawJson], _get(url, auth, ssl_verify=ssl_verify, params=params, session=session, raw=raw, stream=stream))
+
+
+def get_multiple_contents(
+    base_url: str,
+    auth: Optional[AuthBase],
+    ref: str,
+    keys_json: dict,
+    hash_on_ref: Optional[str] = None,
+    ssl_verify: bool = True,
+    session: Optional[requests.Session] = None,
+) -> dict:
+    """Fetch the contents of many keys from a known branch with a single request.
+
+    :param base_url: base Nessie url
+    :param auth: Authentication settings
+    :param ref: ref
+    :param keys_json: json object with the requested content keys
+    :param hash_on_ref: hash on reference
+    :param ssl_verify: ignore ssl errors if False
+    :param session: optional pooled session to send the request with
+    :return: json dict of the found contents with their keys
+    """
+    url = _sanitize_url(base_url + "/contents")
+    params = {"ref": ref}
+    if hash_on_ref:
+        params["hashOnRef"] = hash_on_ref
+    return cast(dict, _post(url, auth, keys_json, ssl_verify=ssl_verify, params=params, session=session))
 
 
 def assign_branch(
-    base_url: str, auth: Optional[AuthBase], branch: str, assign_to_json: dict, old_hash: Optional[str], ssl_verify: bool = True
+    base_url: str,
+    auth: Optional[AuthBase],
+    branch: str,
+    assign_to_json: Union[bytes, dict],
+    old_hash: Optional[str],
+    ssl_verify: bool = True,
+    session: Optional[requests.Session] = None,
 ) -> None:
     """Assign a reference to a branch.
 
@@ -306,14 +454,21 @@ def assign_branch(
     :param assign_to_json: hash to become the new HEAD of the branch and the name of the reference via which that hash is reachable
     :param old_hash: current hash of the branch
     :param ssl_verify: ignore ssl errors if False
+    :param session: optional pooled session to send the request with
     """
     url = _sanitize_url(base_url + "/trees/branch/{}", branch)
     params = {"expectedHash": old_hash}
-    _put(url, auth, assign_to_json, ssl_verify=ssl_verify, params=params)
+    _put(url, auth, assign_to_json, ssl_verify=ssl_verify, params=params, session=session)
 
 
 def assign_tag(
-    base_url: str, auth: Optional[AuthBase], tag: str, assign_to_json: dict, old_hash: Optional[str], ssl_verify: bool = True
+    base_url: str,
+    auth: Optional[AuthBase],
+    tag: str,
+    assign_to_json: Union[bytes, dict],
+    old_hash: Optional[str],
+    ssl_verify: bool = True,
+    session: Optional[requests.Session] = None,
 ) -> None:
     """Assign a reference to a tag.
 
@@ -323,14 +478,21 @@ def assign_tag(
     :param assign_to_json: hash to become the new HEAD of the tag and the name of the reference via which that hash is reachable
     :param old_hash: current hash of the tag
     :param ssl_verify: ignore ssl errors if False
+    :param session: optional pooled session to send the request with
     """
     url = _sanitize_url(base_url + "/trees/tag/{}", tag)
     params = {"expectedHash": old_hash}
-    _put(url, auth, assign_to_json, ssl_verify=ssl_verify, params=params)
+    _put(url, auth, assign_to_json, ssl_verify=ssl_verify, params=params, session=session)
 
 
 def cherry_pick(
-    base_url: str, auth: Optional[AuthBase], branch: str, transplant_json: dict, expected_hash: Optional[str], ssl_verify: bool = True
+    base_url: str,
+    auth: Optional[AuthBase],
+    branch: str,
+    transplant_json: dict,
+    expected_hash: Optional[str],
+    ssl_verify: bool = True,
+    session: Optional[requests.Session] = None,
 ) -> dict:
     """cherry-pick a list of hashes to a branch.
 
@@ -340,17 +502,24 @@ def cherry_pick(
     :param transplant_json: transplant content
     :param expected_hash: expected hash of HEAD of branch
     :param ssl_verify: ignore ssl errors if False
+    :param session: optional pooled session to send the request with
     """
     url = _sanitize_url(base_url + "/trees/branch/{}/transplant", branch)
     params = {}
     if expected_hash:
         params["expectedHash"] = expected_hash
-    response = _post(url, auth, json=transplant_json, ssl_verify=ssl_verify, params=params)
+    response = _post(url, auth, json=transplant_json, ssl_verify=ssl_verify, params=params, session=session)
     return cast(dict, response)
 
 
 def merge(
-    base_url: str, auth: Optional[AuthBase], branch: str, merge_json: dict, expected_hash: Optional[str], ssl_verify: bool = True
+    base_url: str,
+    auth: Optional[AuthBase],
+    branch: str,
+    merge_json: dict,
+    expected_hash: Optional[str],
+    ssl_verify: bool = True,
+    session: Optional[requests.Session] = None,
 ) -> dict:
     """Merge a branch into another branch.
 
@@ -360,13 +529,14 @@ def merge(
     :param merge_json: merge content
     :param expected_hash: expected hash of HEAD of branch
     :param ssl_verify: ignore ssl errors if False
+    :param session: optional pooled session to send the request with
     :return: json dict of a merge response
     """
     url = _sanitize_url(base_url + "/trees/branch/{}/merge", branch)
     params = {}
     if expected_hash:
         params["expectedHash"] = expected_hash
-    response = _post(url, auth, json=merge_json, ssl_verify=ssl_verify, params=params)
+    response = _post(url, auth, json=merge_json, ssl_verify=ssl_verify, params=params, session=session)
     return cast(dict, response)
 
 
@@ -374,22 +544,24 @@ def commit(
     base_url: str,
     auth: Optional[AuthBase],
     branch: str,
-    operations: str,
+    operations: Union[str, bytes, dict],
     expected_hash: str,
     ssl_verify: bool = True,
+    session: Optional[requests.Session] = None,
 ) -> dict:
     """Commit a set of operations to a branch.
 
     :param base_url: base Nessie url
     :param auth: Authentication settings
     :param branch: name of branch to merge onto
-    :param operations: json object of operations
+    :param operations: json object of operations, as string or UTF-8 encoded bytes
     :param expected_hash: expected hash of HEAD of branch
     :param ssl_verify: ignore ssl errors if False
+    :param session: optional pooled session to send the request with
     """
     url = _sanitize_url(base_url + "/trees/branch/{}/commit", branch)
     params = {"expectedHash": expected_hash}
-    return cast(dict, _post(url, auth, json=operations, ssl_verify=ssl_verify, params=params))
+    return cast(dict, _post(url, auth, json=operations, ssl_verify=ssl_verify, params=params, session=session))
 
 
 def get_diff(
@@ -400,7 +572,12 @@ def get_diff(
     from_hash_on_ref: Optional[str] = None,
     to_hash_on_ref: Optional[str] = None,
     ssl_verify: bool = True,
-) -> dict:
+    max_records: Optional[int] = None,
+    page_token: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+    raw: bool = False,
+    stream: bool = False,
+) -> Union[dict, RawJson]:
     """Fetch the diff for two given references.
 
     :param base_url: base Nessie url
@@ -410,9 +587,19 @@ def get_diff(
     :param from_hash_on_ref: optional hash on from reference
     :param to_hash_on_ref: optional hash on to reference
     :param ssl_verify: ignore ssl errors if False
+    :param max_records: hint for the server, maximum number of diff entries to return
+    :param page_token: the token retrieved from a previous page of the same diff
+    :param session: optional pooled session to send the request with
+    :param raw: return the undecoded response body as RawJson instead of decoding it
+    :param stream: with raw, read the response body only when the RawJson is first used, see RawJson.write_to()
     :return: json dict of a Diff
     """
     from_hash_on_ref_asterisk = f"*{from_hash_on_ref}" if from_hash_on_ref else ""
     to_hash_on_ref_asterisk = f"*{to_hash_on_ref}" if to_hash_on_ref else ""
     url = _sanitize_url(base_url + "/diffs/{}{}...{}{}", from_ref, from_hash_on_ref_asterisk, to_ref, to_hash_on_ref_asterisk)
-    return cast(dict, _get(url, auth, ssl_verify=ssl_verify))
+    params = {}
+    if max_records:
+        params["maxRecords"] = str(max_records)
+    if page_token:
+        params["pageToken"] = page_token
+    return cast(Union[dict, RawJson], _get(url, auth, ssl_verify=ssl_verify, params=params, session=session, raw=raw, stream=stream))
@@ -0,0 +1,141 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""JSON codecs for request and response bodies, the fastest installed one is picked unless configured otherwise."""
+
+import json
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, Mapping, Optional, Union
+
+import attr
+import confuse
+
+from pynessie.error import NessieInvalidUsageException
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class JsonCodec:
+    """Encodes objects to UTF-8 JSON bytes and decodes JSON documents."""
+
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[Union[str, bytes]], Any]
+
+
+def _stdlib_dumps(data: Any) -> bytes:
+    return json.dumps(data).encode("utf-8")
+
+
+STDLIB_CODEC = JsonCodec("stdlib", _stdlib_dumps, json.loads)
+
+
+class RawJson(Mapping[str, Any]):
+    """Read-only view of a JSON object exactly as the server sent it.
+
+    'content' holds the undecoded response body, it is decoded without any schema validation on the first lookup.
+    A streamed document reads its body only when it is first needed, write_to() copies it as it arrives.
+    """
+
+    def __init__(self, content: bytes, codec: JsonCodec = STDLIB_CODEC) -> None:
+        """Wrap the JSON document 'content', to be decoded with 'codec' when it is accessed."""
+        self._content: Optional[bytes] = content
+        self._chunks: Optional[Iterable[bytes]] = None
+        self._close: Optional[Callable[[], None]] = None
+        self._codec = codec
+        self._document: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def streamed(cls, chunks: Iterable[bytes], close: Callable[[], None], codec: JsonCodec = STDLIB_CODEC) -> "RawJson":
+        """Wrap a JSON document that is read from 'chunks' when it is first needed, 'close' is called once it was read."""
+        document = cls(b"", codec)
+        document._content = None
+        document._chunks = chunks
+        document._close = close
+        return document
+
+    @property
+    def content(self) -> bytes:
+        """Return the undecoded document, reading it first if it is streamed."""
+        if self._content is None:
+            self._content = self._read(None)
+        return self._content
+
+    def write_to(self, out: IO[bytes]) -> None:
+        """Write the undecoded document to 'out', a streamed document chunk by chunk as it is read."""
+        if self._content is None:
+            self._content = self._read(out)
+        else:
+            out.write(self._content)
+
+    def _read(self, out: Optional[IO[bytes]]) -> bytes:
+        # the chunks are kept, the continuation token of a page is only known once the whole page was read
+        chunks = []
+        try:
+            for chunk in self._chunks or ():
+                if out is not None:
+                    out.write(chunk)
+                chunks.append(chunk)
+        finally:
+            if self._close is not None:
+                self._close()
+            self._chunks = self._close = None
+        return b"".join(chunks)
+
+    def _decoded(self) -> Dict[str, Any]:
+        if self._document is None:
+            self._document = self._codec.loads(self.content) if self.content else {}
+        return self._document
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the decoded value of the top level field 'key'."""
+        return self._decoded()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the names of the top level fields."""
+        return iter(self._decoded())
+
+    def __len__(self) -> int:
+        """Return the number of top level fields."""
+        return len(self._decoded())
+
+    def __repr__(self) -> str:
+        """Show the undecoded document."""
+        return f"RawJson({self.content!r})"
+
+
+def _orjson_codec() -> Optional[JsonCodec]:
+    try:
+        import orjson  # pylint: disable=C0415
+    except ImportError:
+        return None
+    return JsonCodec("orjson", orjson.dumps, orjson.loads)  # pylint: disable=E1101
+
+
+_CODECS: Dict[str, Callable[[], Optional[JsonCodec]]] = {"stdlib": lambda: STDLIB_CODEC, "orjson": _orjson_codec}
+
+
+def get_codec(name: str) -> JsonCodec:
+    """Return the codec with the given name, 'auto' picks orjson if it is installed and the standard library otherwise."""
+    if name == "auto":
+        return _orjson_codec() or STDLIB_CODEC
+    if name not in _CODECS:
+        raise NessieInvalidUsageException(f"Unknown JSON codec {name!r}, use one of auto, {', '.join(_CODECS)}")
+    codec = _CODECS[name]()
+    if codec is None:
+        raise NessieInvalidUsageException(f"JSON codec {name!r} is not installed, install it via 'pip install pynessie[{name}]'")
+    return codec
+
+
+def build_codec(config: confuse.Configuration) -> JsonCodec:
+    """Return the codec selected by the 'http.json' setting of the given config."""
+    return get_codec(config["http"]["json"].get(str))
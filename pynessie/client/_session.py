@@ -0,0 +1,222 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Pooled HTTP session shared by all requests of a Nessie client."""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Mapping, Optional
+
+import attr
+import confuse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from pynessie.client._json import STDLIB_CODEC, JsonCodec, build_codec
+
+# statuses of a server that is overloaded or restarting behind a load balancer
+RETRY_STATUSES = {429, 502, 503, 504}
+# statuses that guarantee that the server did not apply a change
+REJECTED_STATUSES = {429, 503}
+
+
+@attr.dataclass
+class RequestStats:
+    """Counters of the HTTP requests sent by a client."""
+
+    requests: int = 0
+    retries: int = 0
+    failed_after_retries: int = 0
+
+
+@attr.s(auto_attribs=True, frozen=True)
+class RetryPolicy:
+    """Retry policy for failed requests, a single attempt means no retries.
+
+    The delay before retry n is drawn uniformly from [0, min(backoff_max_sec, backoff_sec * 2 ** n)] ("full jitter"),
+    unless the server asks for a specific delay via Retry-After.
+    """
+
+    attempts: int = 1
+    backoff_sec: float = 0.1
+    backoff_max_sec: float = 10.0
+
+    def delay(self, retry: int, headers: Optional[Mapping[str, str]] = None) -> float:
+        """Return the time to wait before the given retry, starting at 0, 'headers' are those of the failed response."""
+        retry_after = _retry_after(headers) if headers is not None else None
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.backoff_max_sec, self.backoff_sec * 2**retry))  # noqa: S311
+
+
+class Retries:
+    """Retry policy and request counters of a session, shared by the threads or tasks that use the session."""
+
+    def __init__(self, policy: RetryPolicy) -> None:
+        """Create counters for a session that retries according to 'policy'."""
+        self.policy = policy
+        self._stats = RequestStats()
+        self._lock = threading.Lock()
+
+    def stats(self) -> RequestStats:
+        """Return a snapshot of the request counters."""
+        with self._lock:
+            return attr.evolve(self._stats)
+
+    def count(self, **increments: int) -> None:
+        """Add the given increments to the request counters."""
+        with self._lock:
+            for name, increment in increments.items():
+                setattr(self._stats, name, getattr(self._stats, name) + increment)
+
+    def can_retry(self, retry: int) -> bool:
+        """Return whether the given retry, starting at 0, is allowed, counting the request as failed if not."""
+        if retry + 1 < self.policy.attempts:
+            return True
+        if self.policy.attempts > 1:
+            self.count(failed_after_retries=1)
+        return False
+
+
+def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _failed_before_sending(error: requests.RequestException) -> bool:
+    # the connection could not be established, so the server never saw the request
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    cause = error.args[0] if error.args else None
+    return isinstance(cause, NewConnectionError) or isinstance(getattr(cause, "reason", None), NewConnectionError)
+
+
+def has_expected_hash(kwargs: dict) -> bool:
+    """Return whether the request with the given keyword arguments is a change conditional on an expected hash."""
+    # a change that is conditional on the expected HEAD cannot be applied twice
+    body = kwargs.get("json")
+    return "expectedHash" in (kwargs.get("params") or {}) or (isinstance(body, dict) and "expectedHash" in body)
+
+
+class NessieSession(requests.Session):
+    """requests Session with a bounded connection pool that drops keep-alive connections after being idle.
+
+    The session may be shared by several threads: the connection pool hands each request its own connection, and the
+    idle connections are only dropped while no request is in flight.
+
+    Failed requests are retried according to the retry policy: GETs on connection errors, timeouts and the statuses of an
+    unavailable server, changing requests only if they carry an expected hash and certainly did not reach the server.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keepalive_sec: int = 60,
+        retry_policy: Optional[RetryPolicy] = None,
+        codec: JsonCodec = STDLIB_CODEC,
+    ) -> None:
+        """Create a session.
+
+        :param pool_connections: number of per-host connection pools to keep
+        :param pool_maxsize: maximum number of connections kept open per host
+        :param keepalive_sec: idle time after which pooled connections are discarded, 0 to keep them forever
+        :param retry_policy: how to retry failed requests, no retries if not given
+        :param codec: JSON codec for the request and response bodies sent with this session
+        """
+        super().__init__()
+        self.codec = codec
+        self._keepalive_sec = keepalive_sec
+        self._last_used = time.monotonic()
+        # the idle connections are only discarded while no request is in flight, guarded by the lock
+        self._in_flight = 0
+        self._idle_lock = threading.Lock()
+        self._retries = Retries(retry_policy if retry_policy is not None else RetryPolicy())
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+    def stats(self) -> RequestStats:
+        """Return a snapshot of the request counters of this session."""
+        return self._retries.stats()
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        """Send a request, retrying it according to the retry policy."""
+        idempotent = method.upper() in ("GET", "HEAD")
+        conditional = not idempotent and has_expected_hash(kwargs)
+        retry = 0
+        while True:
+            self._retries.count(requests=1)
+            try:
+                response = self._send(method, url, *args, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not (idempotent or (conditional and _failed_before_sending(e))) or not self._retries.can_retry(retry):
+                    raise
+                delay = self._retries.policy.delay(retry)
+            else:
+                retryable = idempotent or (conditional and response.status_code in REJECTED_STATUSES)
+                if response.status_code not in RETRY_STATUSES or not retryable or not self._retries.can_retry(retry):
+                    return response
+                delay = self._retries.policy.delay(retry, response.headers)
+                response.close()
+            self._retries.count(retries=1)
+            retry += 1
+            time.sleep(delay)
+
+    def _send(self, method: str, url: str, *args: Any, **kwargs: Any) -> requests.Response:
+        """Send a request, discarding pooled connections first if they have been idle for too long."""
+        with self._idle_lock:
+            if self._in_flight == 0 and self._keepalive_sec > 0 and time.monotonic() - self._last_used > self._keepalive_sec:
+                # servers and load balancers close idle connections on their side, reusing them would fail
+                for adapter in self.adapters.values():
+                    adapter.close()
+            self._in_flight += 1
+        try:
+            return super().request(method, url, *args, **kwargs)
+        finally:
+            with self._idle_lock:
+                self._in_flight -= 1
+                self._last_used = time.monotonic()
+
+
+def build_retry_policy(config: confuse.Configuration) -> RetryPolicy:
+    """Create a RetryPolicy from the 'http.retry' settings of the given config."""
+    retry = config["http"]["retry"]
+    return RetryPolicy(
+        attempts=max(1, retry["attempts"].get(int)),
+        backoff_sec=retry["backoff"].get(int) / 1000,
+        backoff_max_sec=retry["maxbackoff"].get(int) / 1000,
+    )
+
+
+def build_session(config: confuse.Configuration) -> NessieSession:
+    """Create a NessieSession from the 'http.pool', 'http.retry' and 'http.json' settings of the given config."""
+    pool = config["http"]["pool"]
+    return NessieSession(
+        pool_connections=pool["connections"].get(int),
+        pool_maxsize=pool["maxsize"].get(int),
+        keepalive_sec=pool["keepalive"].get(int),
+        retry_policy=build_retry_policy(config),
+        codec=build_codec(config),
+    )
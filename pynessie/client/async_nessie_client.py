@@ -0,0 +1,278 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Asyncio flavour of the Nessie client, requires the optional 'httpx' dependency (pip install pynessie[async])."""
+
+import asyncio
+from types import TracebackType
+from typing import Any, AsyncGenerator, Generator, Optional, Type, cast
+
+import confuse
+import httpx
+import requests
+from requests.auth import AuthBase
+
+from pynessie.auth import setup_auth
+from pynessie.client._async_endpoints import (
+    all_references,
+    commit,
+    get_content,
+    get_default_branch,
+    get_diff,
+    get_reference,
+    list_logs,
+    list_tables,
+    merge,
+)
+from pynessie.client._async_session import AsyncNessieSession
+from pynessie.client._endpoints import _sanitize_timeout
+from pynessie.client._json import build_codec
+from pynessie.client._session import RequestStats, build_retry_policy
+from pynessie.client.nessie_client import _split_hash_on_ref
+from pynessie.decoders import load, load_log_lazily
+from pynessie.encoders import dump
+from pynessie.error import NessieInvalidUsageException
+from pynessie.model import (
+    Branch,
+    CommitMeta,
+    Content,
+    ContentKey,
+    ContentSchema,
+    DiffResponse,
+    DiffResponseSchema,
+    Entries,
+    EntriesSchema,
+    LogEntry,
+    LogResponseSchema,
+    Merge,
+    MergeResponse,
+    MergeResponseSchema,
+    MergeSchema,
+    MultiContents,
+    MultiContentSchema,
+    Operation,
+    Reference,
+    ReferenceSchema,
+    ReferencesResponse,
+    ReferencesResponseSchema,
+    split_into_reference_and_hash,
+)
+
+
+class _RequestsAuth(httpx.Auth):
+    """Applies a requests AuthBase, as created by setup_auth, to httpx requests.
+
+    A requests auth may block, e.g. botocore refreshes expired AWS credentials over the network, so the asyncio flow
+    applies it in a worker thread, the auths created by setup_auth can be applied by several threads at once.
+    """
+
+    requires_request_body = True
+
+    def __init__(self, auth: AuthBase) -> None:
+        self._auth = auth
+
+    def auth_flow(self, request: httpx.Request) -> Generator[httpx.Request, httpx.Response, None]:
+        self._apply(request)
+        yield request
+
+    async def async_auth_flow(self, request: httpx.Request) -> AsyncGenerator[httpx.Request, httpx.Response]:
+        await request.aread()
+        await asyncio.to_thread(self._apply, request)
+        yield request
+
+    def _apply(self, request: httpx.Request) -> None:
+        prepared = requests.Request(request.method, str(request.url), headers=dict(request.headers), data=request.content).prepare()
+        signed = self._auth(prepared)
+        for name, value in signed.headers.items():
+            if name.lower() != "content-length" and request.headers.get(name) != value:
+                request.headers[name] = value
+
+
+class AsyncNessieClient:
+    """Asyncio Nessie Client.
+
+    Offers the read, commit and merge operations of NessieClient as coroutines. All requests share one pool of
+    keep-alive connections, sized by the 'http.pool' settings, so many requests can be in flight on one event loop.
+    Like NessieClient, it retries failed requests according to the 'http.retry' settings, counts them in
+    request_stats() and encodes JSON with the 'http.json' codec. It has none of the caches of NessieClient.
+    The client should be closed via aclose() or by using it as an async context manager.
+    """
+
+    def __init__(self, config: confuse.Configuration) -> None:
+        """Create an asyncio Nessie Client from known config."""
+        self._base_url = config["endpoint"].get()
+        auth = setup_auth(config)
+        pool = config["http"]["pool"]
+        self._client = AsyncNessieSession(
+            retry_policy=build_retry_policy(config),
+            codec=build_codec(config),
+            auth=_RequestsAuth(auth) if auth else None,
+            verify=config["verify"].get(bool),
+            timeout=_sanitize_timeout(None),
+            limits=httpx.Limits(
+                max_connections=pool["maxsize"].get(int),
+                max_keepalive_connections=pool["maxsize"].get(int),
+                keepalive_expiry=pool["keepalive"].get(int) or None,
+            ),
+        )
+
+        try:
+            self._base_branch = config["default_branch"].get()
+        except confuse.exceptions.NotFoundError:
+            self._base_branch = None
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections of this client."""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncNessieClient":
+        """Return this client, which is closed when leaving the context."""
+        return self
+
+    async def __aexit__(
+        self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException], exc_tb: Optional[TracebackType]
+    ) -> None:
+        """Close this client."""
+        await self.aclose()
+
+    def request_stats(self) -> RequestStats:
+        """Return the counters of the HTTP requests sent by this client, including retries configured via 'http.retry'."""
+        return self._client.stats()
+
+    async def list_references(self, fetch_all: bool = False) -> ReferencesResponse:
+        """Fetch all known references.
+
+        :return: list of Nessie References
+        """
+        return load(ReferencesResponseSchema, await all_references(self._client, self._base_url, fetch_all))
+
+    async def get_reference(self, name: Optional[str]) -> Reference:
+        """Fetch a ref.
+
+        :param name: name of ref to fetch
+        :return: Nessie reference
+        """
+        ref_obj = (
+            await get_reference(self._client, self._base_url, name) if name else await get_default_branch(self._client, self._base_url)
+        )
+        return load(ReferenceSchema, ref_obj)
+
+    async def get_default_branch(self) -> str:
+        """Fetch default branch either from config if specified or from the server."""
+        return self._base_branch if self._base_branch else (await self.get_reference(None)).name
+
+    async def list_keys(
+        self,
+        ref: str,
+        hash_on_ref: Optional[str] = None,
+        max_result_hint: Optional[int] = None,
+        page_token: Optional[str] = None,
+        query_filter: Optional[str] = None,
+    ) -> Entries:
+        """Fetch a list of all tables from a known branch.
+
+        :param ref: name of branch
+        :param hash_on_ref: hash on reference
+        :param max_result_hint: hint for the server, maximum number of results to return
+        :param page_token: the token retrieved from a previous page returned for the same ref
+        :param query_filter: A CEL expression that allows advanced filtering capabilities
+        :return: list of Nessie table names
+        """
+        ref_name, hash_on_ref = _split_hash_on_ref(ref, hash_on_ref)
+        entries = await list_tables(self._client, self._base_url, ref_name, hash_on_ref, max_result_hint, page_token, query_filter)
+        return load(EntriesSchema, entries)
+
+    async def get_content(self, ref: str, content_key: ContentKey, hash_on_ref: Optional[str] = None) -> Content:
+        """Fetch a content from a known ref.
+
+        :param ref: name of ref
+        :param content_key: content key to fetch
+        :param hash_on_ref: hash on reference
+        :return: A single content
+        """
+        ref_name, hash_on_ref = _split_hash_on_ref(ref, hash_on_ref)
+        return load(ContentSchema, await get_content(self._client, self._base_url, ref_name, content_key, hash_on_ref))
+
+    # pylint: disable=keyword-arg-before-vararg
+    async def commit(
+        self, branch: str, old_hash: str, reason: Optional[str] = None, author: Optional[str] = None, *ops: Operation
+    ) -> Branch:
+        """Modify a set of Nessie tables."""
+        meta = CommitMeta(message=reason if reason else "")
+        if author:
+            meta.author = author
+        operations = dump(MultiContentSchema, MultiContents(meta, list(ops)))
+        return cast(Branch, load(ReferenceSchema, await commit(self._client, self._base_url, branch, operations, old_hash)))
+
+    async def merge(
+        self, from_ref: str, onto_branch: str, from_hash: Optional[str] = None, old_hash: Optional[str] = None
+    ) -> MergeResponse:
+        """Merge a branch into another branch."""
+        onto_branch, old_hash_ref = split_into_reference_and_hash(onto_branch)
+        if not old_hash:
+            old_hash = old_hash_ref if old_hash_ref else (await self.get_reference(onto_branch)).hash_
+        elif old_hash_ref and old_hash_ref != old_hash:
+            raise NessieInvalidUsageException(
+                "Must not specify hash on from-ref using 'name@hash' and via explicit hash argument, use only one of those"
+            )
+        assert old_hash is not None
+
+        from_ref, from_hash_ref = split_into_reference_and_hash(from_ref)
+        if not from_hash:
+            from_hash = from_hash_ref if from_hash_ref else (await self.get_reference(from_ref)).hash_
+        elif from_hash_ref and from_hash_ref != from_hash:
+            raise NessieInvalidUsageException(
+                "Must not specify hash on from-ref using 'name@hash' and via explicit hash argument, use only one of those"
+            )
+
+        merge_json = MergeSchema().dump(Merge(from_ref, str(from_hash)))
+        return load(MergeResponseSchema, await merge(self._client, self._base_url, onto_branch, merge_json, old_hash))
+
+    async def get_log(
+        self,
+        start_ref: str,
+        hash_on_ref: Optional[str] = None,
+        max_records: Optional[int] = None,
+        fetch_all: bool = False,
+        lazy: bool = False,
+        **filtering_args: Any,
+    ) -> AsyncGenerator[LogEntry, None]:
+        """Fetch all logs starting at start_ref, following the server's pagination.
+
+        start_ref can be any ref. With lazy=True the entries decode their fields on first access, see NessieClient.get_log.
+        """
+        page_args = dict(filtering_args)
+        remaining = max_records
+        while True:
+            fetched = await list_logs(self._client, self._base_url, start_ref, hash_on_ref, remaining, fetch_all, **page_args)
+            logs = load_log_lazily(fetched) if lazy else load(LogResponseSchema, fetched)
+            for log in logs.log_entries:
+                yield log
+                if remaining is not None:
+                    remaining -= 1
+                    if remaining <= 0:
+                        # yield only the required number of results, if server returns more records than expected.
+                        return
+            if not logs.has_more:
+                return
+            page_args["pageToken"] = logs.token
+
+    async def get_diff(
+        self, from_ref: str, to_ref: str, from_hash_on_ref: Optional[str] = None, to_hash_on_ref: Optional[str] = None
+    ) -> DiffResponse:
+        """Retrieve the diff between from_ref and to_ref.
+
+        from_ref / to_ref can be any ref.
+        """
+        return load(DiffResponseSchema, await get_diff(self._client, self._base_url, from_ref, to_ref, from_hash_on_ref, to_hash_on_ref))
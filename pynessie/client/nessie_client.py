@@ -14,11 +14,49 @@
 #
 """Main module."""
 
-from typing import Any, Generator, Optional, cast
+# pylint: disable=C0302
 
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from types import TracebackType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
+
+import attr
 import confuse
 
 from pynessie.auth import setup_auth
+from pynessie.client._cache import (
+    CacheStats,
+    build_content_cache,
+    build_reference_cache,
+)
+from pynessie.client._commit import (
+    BulkCommitStats,
+    CommitResult,
+    encode_commit_chunks,
+    expected_contents,
+    expected_contents_unchanged,
+)
+from pynessie.client._disk_cache import DiskCacheStats, build_disk_cache
 from pynessie.client._endpoints import (
     all_references,
     assign_branch,
@@ -31,12 +69,24 @@ from pynessie.client._endpoints import (
     get_content,
     get_default_branch,
     get_diff,
+    get_multiple_contents,
     get_reference,
     list_logs,
     list_tables,
     merge,
 )
-from pynessie.error import NessieInvalidUsageException
+from pynessie.client._json import RawJson
+from pynessie.client._session import RequestStats, RetryPolicy, build_session
+from pynessie.decoders import load, load_log_lazily, loader
+from pynessie.encoders import dump
+from pynessie.error import (
+    NessieContentNotFoundException,
+    NessieException,
+    NessieInvalidUsageException,
+    NessieNotFoundException,
+    NessieReferenceConflictException,
+    NessieReferenceNotFoundException,
+)
 from pynessie.model import (
     DETACHED_REFERENCE_NAME,
     Branch,
@@ -44,11 +94,18 @@ from pynessie.model import (
     Content,
     ContentKey,
     ContentSchema,
+    ContentWithKey,
     Detached,
+    DiffEntry,
+    DiffEntrySchema,
     DiffResponse,
     DiffResponseSchema,
     Entries,
     EntriesSchema,
+    Entry,
+    GetMultipleContentsRequest,
+    GetMultipleContentsRequestSchema,
+    GetMultipleContentsResponseSchema,
     LogEntry,
     LogResponse,
     LogResponseSchema,
@@ -70,41 +127,238 @@ from pynessie.model import (
 )
 
 
-class NessieClient:
-    """Base Nessie Client."""
+def _split_hash_on_ref(ref: str, hash_on_ref: Optional[str]) -> Tuple[str, Optional[str]]:
+    """Split 'name@hash' into name and hash, making sure it does not contradict an explicit hash-on-ref."""
+    ref_name, ref_hash = split_into_reference_and_hash(ref)
+    if not hash_on_ref:
+        return ref_name, ref_hash
+    if ref_hash and ref_hash != hash_on_ref:
+        raise NessieInvalidUsageException(
+            "Must not specify hash-on-ref using 'name@hash' and explicit hash-on-ref argument, use only one of those"
+        )
+    return ref_name, hash_on_ref
+
+
+_Page = TypeVar("_Page")
+
+
+def _page_token(page: Union[Entries, ReferencesResponse]) -> Optional[str]:
+    return page.token if page.has_more else None
+
+
+def _raw_page_token(page: Mapping[str, Any]) -> Optional[str]:
+    return cast(Optional[str], page.get("token")) if page.get("hasMore") else None
+
+
+def _prefetched_pages(
+    fetch_page: Callable[[Optional[str]], _Page], next_token: Callable[[_Page], Optional[str]]
+) -> Generator[_Page, Any, None]:
+    """Yield all pages of a paginated listing, fetching the next page in the background while a page is consumed.
+
+    :param fetch_page: fetches the page for the given continuation token, None for the first page
+    :param next_token: extracts the continuation token from a page, None for the last page
+    """
+    page = fetch_page(None)
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        while True:
+            token = next_token(page)
+            next_page = executor.submit(fetch_page, token) if token else None
+            yield page
+            if next_page is None:
+                return
+            page = next_page.result()
+    finally:
+        # do not block an abandoned iteration on a prefetch that nobody will consume
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _is_unsupported_endpoint(e: NessieException) -> bool:
+    """Whether the error signals that the server does not know the requested endpoint, rather than a missing ref or key."""
+    if e.status_code == 405:
+        return True
+    return isinstance(e, NessieNotFoundException) and not isinstance(e, (NessieReferenceNotFoundException, NessieContentNotFoundException))
+
+
+class NessieClient:  # pylint: disable=R0902,R0904
+    """Base Nessie Client.
+
+    The client keeps a pooled HTTP session open for its whole lifetime, so it should be closed when it is no longer
+    needed, either explicitly via close() or by using it as a context manager.
+
+    One client may be shared by any number of threads. Each request borrows its own pooled connection, the caches,
+    the request counters and the signing of requests are guarded by locks, and no method keeps per-call state on the
+    client. At most 'http.pool.maxsize' connections per host are kept open, more concurrent requests open additional
+    connections that are closed after use, so the pool should be sized to the number of threads.
+    """
 
     def __init__(self, config: confuse.Configuration) -> None:
         """Create a Nessie Client from known config."""
         self._base_url = config["endpoint"].get()
         self._ssl_verify = config["verify"].get(bool)
         self._auth = setup_auth(config)
-        self._commit_id: str = cast(str, None)
+        self._session = build_session(config)
+        self._multi_contents_supported: Optional[bool] = None
+        self._content_cache = build_content_cache(config)
+        self._disk_cache = build_disk_cache(config)
+        self._reference_cache = build_reference_cache(config)
 
         try:
             self._base_branch = config["default_branch"].get()
         except confuse.exceptions.NotFoundError:
             self._base_branch = None
 
-    def list_references(self, fetch_all: bool = False) -> ReferencesResponse:
+    def close(self) -> None:
+        """Close the pooled HTTP connections of this client and write the reads of its on-disk cache."""
+        self._session.close()
+        if self._disk_cache is not None:
+            self._disk_cache.flush()
+
+    def __enter__(self) -> "NessieClient":
+        """Return this client, which is closed when leaving the context."""
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException], exc_tb: Optional[TracebackType]) -> None:
+        """Close this client."""
+        self.close()
+
+    def request_stats(self) -> RequestStats:
+        """Return the counters of the HTTP requests sent by this client, including retries configured via 'http.retry'."""
+        return self._session.stats()
+
+    def content_cache_stats(self) -> Optional[CacheStats]:
+        """Return the counters of the content cache, None if the cache is disabled via 'cache.content.maxsize'."""
+        return self._content_cache.stats() if self._content_cache is not None else None
+
+    def disk_cache_stats(self) -> Optional[DiskCacheStats]:
+        """Return the counters of the on-disk cache, None if the cache is disabled via 'cache.disk.maxbytes'."""
+        return self._disk_cache.stats() if self._disk_cache is not None else None
+
+    def clear_caches(self) -> None:
+        """Remove everything from the reference cache, the content cache and the on-disk cache."""
+        if self._reference_cache is not None:
+            self._reference_cache.clear()
+        if self._content_cache is not None:
+            self._content_cache.clear()
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
+
+    @contextmanager
+    def _changing_references(self, *names: str) -> Iterator[None]:
+        """Invalidate the cached references that the wrapped request changes, even if it fails because they are stale."""
+        try:
+            yield
+        finally:
+            if self._reference_cache is not None:
+                self._reference_cache.invalidate(*names)
+
+    def _cached_content(self, hash_: str, key: ContentKey) -> Optional[Content]:
+        content = self._content_cache.get(hash_, key) if self._content_cache is not None else None
+        if content is None and self._disk_cache is not None:
+            cached_json = self._disk_cache.get(self._disk_cache.key("content", self._base_url, hash_, key.elements))
+            if cached_json is not None:
+                content = load(ContentSchema, cached_json)
+                if self._content_cache is not None:
+                    self._content_cache.put(hash_, key, content)
+        return content
+
+    def _cache_content(self, hash_: str, key: ContentKey, content: Content) -> None:
+        if self._content_cache is not None:
+            self._content_cache.put(hash_, key, content)
+        if self._disk_cache is not None:
+            self._disk_cache.put(self._disk_cache.key("content", self._base_url, hash_, key.elements), ContentSchema().dump(content))
+
+    def _disk_cached(self, pinned_hash: Optional[str], fetch: Callable[[], dict], *key_parts: Any) -> dict:
+        """Return the response of 'fetch' from the on-disk cache if the request is pinned to a commit hash."""
+        if self._disk_cache is None or not pinned_hash:
+            return fetch()
+        key = self._disk_cache.key(self._base_url, pinned_hash, *key_parts)
+        cached_json = self._disk_cache.get(key)
+        if cached_json is None:
+            cached_json = fetch()
+            self._disk_cache.put(key, cached_json)
+        return cast(dict, cached_json)
+
+    @overload
+    def list_references(
+        self,
+        fetch_all: bool = ...,
+        max_records: Optional[int] = ...,
+        page_token: Optional[str] = ...,
+        query_filter: Optional[str] = ...,
+        raw: Literal[False] = ...,
+    ) -> ReferencesResponse: ...
+
+    @overload
+    def list_references(
+        self,
+        fetch_all: bool = ...,
+        max_records: Optional[int] = ...,
+        page_token: Optional[str] = ...,
+        query_filter: Optional[str] = ...,
+        *,
+        raw: Literal[True],
+    ) -> RawJson: ...
+
+    def list_references(
+        self,
+        fetch_all: bool = False,
+        max_records: Optional[int] = None,
+        page_token: Optional[str] = None,
+        query_filter: Optional[str] = None,
+        raw: bool = False,
+    ) -> Union[ReferencesResponse, RawJson]:
         """Fetch all known references.
 
+        :param fetch_all: indicates whether additional metadata should be fetched
+        :param max_records: hint for the server, maximum number of references to return
+        :param page_token: the token retrieved from a previous page of references
+        :param query_filter: A CEL expression that allows advanced filtering capabilities
+        :param raw: return the response of the server as RawJson, without decoding it into model objects
         :return: list of Nessie References
         """
-        references = all_references(self._base_url, self._auth, self._ssl_verify, fetch_all)
-        return ReferencesResponseSchema().load(references)
+        references = all_references(
+            self._base_url, self._auth, self._ssl_verify, fetch_all, max_records, page_token, query_filter, session=self._session, raw=raw
+        )
+        return references if isinstance(references, RawJson) else load(ReferencesResponseSchema, references)
+
+    def iter_references(
+        self, fetch_all: bool = False, page_size: Optional[int] = None, query_filter: Optional[str] = None
+    ) -> Generator[Reference, Any, None]:
+        """Iterate over all known references, following the server's pagination.
+
+        The next page is fetched in the background while the references of the current page are consumed.
+
+        :param fetch_all: indicates whether additional metadata should be fetched
+        :param page_size: hint for the server, maximum number of references per page
+        :param query_filter: A CEL expression that allows advanced filtering capabilities
+        :return: generator of Nessie references
+        """
+        for page in _prefetched_pages(lambda token: self.list_references(fetch_all, page_size, token, query_filter), _page_token):
+            yield from page.references
 
     def get_reference(self, name: Optional[str]) -> Reference:
         """Fetch a ref.
 
+        If the reference cache is enabled via 'cache.reference.ttl', a ref that was fetched within that many seconds and
+        has not been changed by this client since is returned without asking the server.
+
         :param name: name of ref to fetch
         :return: Nessie reference
         """
+        name = name if name else None
+        if self._reference_cache is not None:
+            cached = self._reference_cache.get(name)
+            if cached is not None:
+                return cached
         ref_obj = (
-            get_reference(self._base_url, self._auth, name, self._ssl_verify)
+            get_reference(self._base_url, self._auth, name, self._ssl_verify, session=self._session)
             if name
-            else get_default_branch(self._base_url, self._auth, self._ssl_verify)
+            else get_default_branch(self._base_url, self._auth, self._ssl_verify, session=self._session)
         )
-        ref = ReferenceSchema().load(ref_obj)
+        ref = load(ReferenceSchema, ref_obj)
+        if self._reference_cache is not None:
+            self._reference_cache.put(name, ref)
         return ref
 
     def create_branch(self, branch: str, ref: Optional[str] = None, hash_on_ref: Optional[str] = None) -> Branch:
@@ -116,8 +370,9 @@ class NessieClient:
         :return: Nessie branch object
         """
         ref_json = ReferenceSchema().dump(Branch(branch, hash_on_ref))
-        ref_obj = create_reference(self._base_url, self._auth, ref_json, ref, self._ssl_verify)
-        return cast(Branch, ReferenceSchema().load(ref_obj))
+        with self._changing_references(branch):
+            ref_obj = create_reference(self._base_url, self._auth, ref_json, ref, self._ssl_verify, session=self._session)
+        return cast(Branch, load(ReferenceSchema, ref_obj))
 
     def delete_branch(self, branch: str, hash_: str) -> None:
         """Delete a branch.
@@ -125,7 +380,8 @@ class NessieClient:
         :param branch: name of branch to delete
         :param hash_: hash of the branch
         """
-        delete_branch(self._base_url, self._auth, branch, hash_, self._ssl_verify)
+        with self._changing_references(branch):
+            delete_branch(self._base_url, self._auth, branch, hash_, self._ssl_verify, session=self._session)
 
     def create_tag(self, tag: str, ref: str, hash_on_ref: Optional[str] = None) -> Tag:
         """Create a tag.
@@ -136,8 +392,9 @@ class NessieClient:
         :return: Nessie tag object
         """
         ref_json = ReferenceSchema().dump(Tag(tag, hash_on_ref) if hash_on_ref else Tag(tag))
-        ref_obj = create_reference(self._base_url, self._auth, ref_json, ref, self._ssl_verify)
-        return cast(Tag, ReferenceSchema().load(ref_obj))
+        with self._changing_references(tag):
+            ref_obj = create_reference(self._base_url, self._auth, ref_json, ref, self._ssl_verify, session=self._session)
+        return cast(Tag, load(ReferenceSchema, ref_obj))
 
     def delete_tag(self, tag: str, hash_: str) -> None:
         """Delete a tag.
@@ -145,7 +402,32 @@ class NessieClient:
         :param tag: name of tag to delete
         :param hash_: hash of the branch
         """
-        delete_tag(self._base_url, self._auth, tag, hash_, self._ssl_verify)
+        with self._changing_references(tag):
+            delete_tag(self._base_url, self._auth, tag, hash_, self._ssl_verify, session=self._session)
+
+    @overload
+    def list_keys(
+        self,
+        ref: str,
+        hash_on_ref: Optional[str] = ...,
+        max_result_hint: Optional[int] = ...,
+        page_token: Optional[str] = ...,
+        query_filter: Optional[str] = ...,
+        raw: Literal[False] = ...,
+    ) -> Entries: ...
+
+    @overload
+    def list_keys(
+        self,
+        ref: str,
+        hash_on_ref: Optional[str] = ...,
+        max_result_hint: Optional[int] = ...,
+        page_token: Optional[str] = ...,
+        query_filter: Optional[str] = ...,
+        *,
+        raw: Literal[True],
+        stream: bool = ...,
+    ) -> RawJson: ...
 
     def list_keys(
         self,
@@ -154,46 +436,221 @@ class NessieClient:
         max_result_hint: Optional[int] = None,
         page_token: Optional[str] = None,
         query_filter: Optional[str] = None,
-    ) -> Entries:
+        raw: bool = False,
+        stream: bool = False,
+    ) -> Union[Entries, RawJson]:
         """Fetch a list of all tables from a known branch.
 
         :param ref: name of branch
         :param hash_on_ref: hash on reference
         :param entity_types: list of types to filter keys on
         :param query_filter: A CEL expression that allows advanced filtering capabilities
+        :param raw: return the response of the server as RawJson, without decoding it into model objects or caching it
+        :param stream: with raw=True, read the response body only when the RawJson is first used, e.g. by RawJson.write_to()
+            as it arrives, the pooled connection is held until then
         :return: list of Nessie table names
         """
-        ref_name, ref_hash = split_into_reference_and_hash(ref)
-        if hash_on_ref:
-            if ref_hash and ref_hash != hash_on_ref:
-                raise NessieInvalidUsageException(
-                    "Must not specify hash-on-ref using 'name@hash' and explicit hash-on-ref argument, use only one of those"
-                )
-        else:
-            hash_on_ref = ref_hash
+        ref_name, hash_on_ref = _split_hash_on_ref(ref, hash_on_ref)
+        if raw:
+            return cast(
+                RawJson,
+                list_tables(
+                    self._base_url,
+                    self._auth,
+                    ref_name,
+                    hash_on_ref,
+                    max_result_hint,
+                    page_token,
+                    query_filter,
+                    self._ssl_verify,
+                    session=self._session,
+                    raw=True,
+                    stream=stream,
+                ),
+            )
 
-        return EntriesSchema().load(
-            list_tables(self._base_url, self._auth, ref_name, hash_on_ref, max_result_hint, page_token, query_filter, self._ssl_verify)
-        )
+        def fetch() -> dict:
+            entries = list_tables(
+                self._base_url,
+                self._auth,
+                ref_name,
+                hash_on_ref,
+                max_result_hint,
+                page_token,
+                query_filter,
+                self._ssl_verify,
+                session=self._session,
+            )
+            return cast(dict, entries)
+
+        return load(EntriesSchema, self._disk_cached(hash_on_ref, fetch, "entries", ref_name, max_result_hint, page_token, query_filter))
+
+    def iter_keys(
+        self,
+        ref: str,
+        hash_on_ref: Optional[str] = None,
+        max_result_hint: Optional[int] = None,
+        query_filter: Optional[str] = None,
+    ) -> Generator[Entry, Any, None]:
+        """Iterate over all entries of a known ref, following the server's pagination.
+
+        The next page is fetched in the background while the entries of the current page are consumed.
+
+        :param ref: name of ref
+        :param hash_on_ref: hash on reference
+        :param max_result_hint: hint for the server, maximum number of entries per page
+        :param query_filter: A CEL expression that allows advanced filtering capabilities
+        :return: generator of Nessie entries
+        """
+        for page in self.iter_key_pages(ref, hash_on_ref, max_result_hint, query_filter):
+            yield from page.entries
 
-    def get_content(self, ref: str, content_key: ContentKey, hash_on_ref: Optional[str] = None) -> Content:
+    def iter_key_pages(
+        self,
+        ref: str,
+        hash_on_ref: Optional[str] = None,
+        max_result_hint: Optional[int] = None,
+        query_filter: Optional[str] = None,
+    ) -> Generator[Entries, Any, None]:
+        """Iterate over the pages of entries of a known ref, as returned by the server, see iter_keys.
+
+        :return: generator of the Nessie entries pages
+        """
+        ref_name, hash_on_ref = _split_hash_on_ref(ref, hash_on_ref)
+        yield from _prefetched_pages(lambda token: self.list_keys(ref_name, hash_on_ref, max_result_hint, token, query_filter), _page_token)
+
+    @overload
+    def get_content(self, ref: str, content_key: ContentKey, hash_on_ref: Optional[str] = ..., raw: Literal[False] = ...) -> Content: ...
+
+    @overload
+    def get_content(
+        self, ref: str, content_key: ContentKey, hash_on_ref: Optional[str] = ..., *, raw: Literal[True], stream: bool = ...
+    ) -> RawJson: ...
+
+    def get_content(
+        self, ref: str, content_key: ContentKey, hash_on_ref: Optional[str] = None, raw: bool = False, stream: bool = False
+    ) -> Union[Content, RawJson]:
         """Fetch a content from a known ref.
 
+        If the content cache or the on-disk cache is enabled, contents fetched at a pinned hash are served from it.
+
         :param ref: name of ref
         :param hash_on_ref: hash on reference
         :param content_key: content key to fetch
+        :param raw: return the response of the server as RawJson, without decoding it into model objects or caching it
+        :param stream: with raw=True, read the response body only when the RawJson is first used, e.g. by RawJson.write_to()
+            as it arrives, the pooled connection is held until then
         :return: A single content
         """
-        ref_name, ref_hash = split_into_reference_and_hash(ref)
+        ref_name, hash_on_ref = _split_hash_on_ref(ref, hash_on_ref)
+        if raw:
+            return cast(
+                RawJson,
+                get_content(
+                    self._base_url,
+                    self._auth,
+                    ref_name,
+                    content_key,
+                    hash_on_ref,
+                    self._ssl_verify,
+                    session=self._session,
+                    raw=True,
+                    stream=stream,
+                ),
+            )
+        # only a pinned hash identifies immutable content, the HEAD of a named reference moves
+        if not hash_on_ref:
+            return self._fetch_content(ref_name, content_key, hash_on_ref)
+
+        cached = self._cached_content(hash_on_ref, content_key)
+        if cached is not None:
+            return cached
+        content = self._fetch_content(ref_name, content_key, hash_on_ref)
+        self._cache_content(hash_on_ref, content_key, content)
+        return content
+
+    def _fetch_content(self, ref: str, content_key: ContentKey, hash_on_ref: Optional[str]) -> Content:
+        return load(
+            ContentSchema, get_content(self._base_url, self._auth, ref, content_key, hash_on_ref, self._ssl_verify, session=self._session)
+        )
+
+    def get_contents(
+        self, ref: str, keys: List[ContentKey], hash_on_ref: Optional[str] = None, chunk_size: int = 100, max_workers: int = 8
+    ) -> List[ContentWithKey]:
+        """Fetch the contents of many keys from a known ref.
+
+        Keys are sent to the server's multi-content endpoint in chunks of 'chunk_size'. Servers without that endpoint are
+        queried key by key instead, with up to 'max_workers' requests in flight. If the content cache or the on-disk cache
+        is enabled, contents at a pinned hash are served from it and only the remaining keys are fetched.
+
+        :param ref: name of ref
+        :param keys: content keys to fetch
+        :param hash_on_ref: hash on reference
+        :param chunk_size: maximum number of keys per multi-content request
+        :param max_workers: maximum number of concurrent single-content requests when falling back
+        :return: the found contents with their keys in the order of 'keys', keys without content are omitted
+        """
+        ref_name, hash_on_ref = _split_hash_on_ref(ref, hash_on_ref)
+        found: Dict[str, ContentWithKey] = {}
+        missing = keys
         if hash_on_ref:
-            if ref_hash and ref_hash != hash_on_ref:
-                raise NessieInvalidUsageException(
-                    "Must not specify hash-on-ref using 'name@hash' and explicit hash-on-ref argument, use only one of those"
-                )
-        else:
-            hash_on_ref = ref_hash
+            missing = []
+            for key in keys:
+                cached = self._cached_content(hash_on_ref, key)
+                if cached is None:
+                    missing.append(key)
+                else:
+                    found[key.to_path_string()] = ContentWithKey(key, cached)
+
+        if missing:
+            fetched = self._fetch_contents(ref_name, missing, hash_on_ref, chunk_size, max_workers)
+            if hash_on_ref:
+                for content_with_key in fetched.values():
+                    self._cache_content(hash_on_ref, content_with_key.key, content_with_key.content)
+            found.update(fetched)
+        return [found[k.to_path_string()] for k in keys if k.to_path_string() in found]
+
+    def _fetch_contents(
+        self, ref: str, keys: List[ContentKey], hash_on_ref: Optional[str], chunk_size: int, max_workers: int
+    ) -> Dict[str, ContentWithKey]:
+        # the flag only ever changes from unknown to known, threads that race on the first probe set the same value
+        if self._multi_contents_supported is not False:
+            try:
+                found = self._get_contents_in_chunks(ref, keys, hash_on_ref, chunk_size)
+                self._multi_contents_supported = True
+                return found
+            except NessieException as e:
+                if self._multi_contents_supported or not _is_unsupported_endpoint(e):
+                    raise
+                self._multi_contents_supported = False
+        return self._get_contents_one_by_one(ref, keys, hash_on_ref, max_workers)
 
-        return ContentSchema().load(get_content(self._base_url, self._auth, ref_name, content_key, hash_on_ref, self._ssl_verify))
+    def _get_contents_in_chunks(
+        self, ref: str, keys: List[ContentKey], hash_on_ref: Optional[str], chunk_size: int
+    ) -> Dict[str, ContentWithKey]:
+        found = {}
+        for start in range(0, len(keys), chunk_size):
+            end = start + chunk_size
+            request_json = GetMultipleContentsRequestSchema().dump(GetMultipleContentsRequest(keys[start:end]))
+            response = get_multiple_contents(
+                self._base_url, self._auth, ref, request_json, hash_on_ref, self._ssl_verify, session=self._session
+            )
+            for content_with_key in load(GetMultipleContentsResponseSchema, response).contents:
+                found[content_with_key.key.to_path_string()] = content_with_key
+        return found
+
+    def _get_contents_one_by_one(
+        self, ref: str, keys: List[ContentKey], hash_on_ref: Optional[str], max_workers: int
+    ) -> Dict[str, ContentWithKey]:
+        def fetch(key: ContentKey) -> Optional[ContentWithKey]:
+            try:
+                return ContentWithKey(key, self._fetch_content(ref, key, hash_on_ref))
+            except NessieContentNotFoundException:
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(fetch, keys))
+        return {c.key.to_path_string(): c for c in results if c is not None}
 
     # pylint: disable=keyword-arg-before-vararg
     def commit(self, branch: str, old_hash: str, reason: Optional[str] = None, author: Optional[str] = None, *ops: Operation) -> Branch:
@@ -201,8 +658,111 @@ class NessieClient:
         meta = CommitMeta(message=reason if reason else "")
         if author:
             meta.author = author
-        ref_obj = commit(self._base_url, self._auth, branch, MultiContentSchema().dumps(MultiContents(meta, list(ops))), old_hash)
-        return cast(Branch, ReferenceSchema().load(ref_obj))
+        with self._changing_references(branch):
+            ref_obj = commit(
+                self._base_url,
+                self._auth,
+                branch,
+                self._session.codec.dumps(dump(MultiContentSchema, MultiContents(meta, list(ops)))),
+                old_hash,
+                self._ssl_verify,
+                session=self._session,
+            )
+        return cast(Branch, load(ReferenceSchema, ref_obj))
+
+    def commit_with_retry(
+        self,
+        branch: str,
+        ops: Sequence[Operation],
+        reason: Optional[str] = None,
+        author: Optional[str] = None,
+        old_hash: Optional[str] = None,
+        attempts: int = 5,
+        backoff_sec: float = 0.05,
+        backoff_max_sec: float = 1.0,
+    ) -> CommitResult:
+        """Commit a set of operations, rebasing them onto the new HEAD of the branch if another writer committed first.
+
+        After a conflict the HEAD of the branch is fetched again and, if Put operations carry an expected content, it is
+        checked that those contents are unchanged at the new HEAD. If so, the commit is retried after a randomized,
+        exponentially growing delay, otherwise the conflict is raised.
+
+        :param branch: name of the branch to commit to
+        :param ops: operations to commit
+        :param reason: commit message
+        :param author: commit author
+        :param old_hash: expected HEAD for the first attempt, the current HEAD of the branch if not given
+        :param attempts: maximum number of commit requests
+        :param backoff_sec: upper bound of the delay before the first retry, doubled for every further retry
+        :param backoff_max_sec: upper bound of all delays
+        :return: the branch after the commit and the latency of every attempt
+        """
+        policy = RetryPolicy(attempts, backoff_sec, backoff_max_sec)
+        expected = expected_contents(ops)
+        expected_keys = [op.key for op in ops if op.key.to_path_string() in expected]
+        expected_hash = old_hash if old_hash else self.get_reference(branch).hash_
+        latencies: List[float] = []
+        while True:
+            started = time.monotonic()
+            try:
+                branch_ref = self.commit(branch, cast(str, expected_hash), reason, author, *ops)
+                latencies.append(time.monotonic() - started)
+                return CommitResult(branch_ref, latencies)
+            except NessieReferenceConflictException:
+                latencies.append(time.monotonic() - started)
+                if len(latencies) >= attempts:
+                    raise
+                time.sleep(policy.delay(len(latencies) - 1))
+                expected_hash = self.get_reference(branch).hash_
+                if expected and not expected_contents_unchanged(expected, self.get_contents(branch, expected_keys, expected_hash)):
+                    # another writer changed a content this commit is based on, rebasing would silently overwrite it
+                    raise
+
+    def commit_bulk(
+        self,
+        branch: str,
+        ops: Iterable[Operation],
+        reason: Optional[str] = None,
+        author: Optional[str] = None,
+        old_hash: Optional[str] = None,
+        max_operations: int = 1000,
+        max_bytes: int = 4 * 1024 * 1024,
+        progress: Optional[Callable[[BulkCommitStats], None]] = None,
+    ) -> BulkCommitStats:
+        """Commit a very large number of operations as a chain of size-bounded commits.
+
+        Every commit expects the hash produced by the previous one, so the chain fails with a conflict if another writer
+        commits to the branch in between. Operations are consumed lazily and serialized once, straight to the request body.
+
+        :param branch: name of the branch to commit to
+        :param ops: operations to commit
+        :param reason: commit message of every commit
+        :param author: commit author of every commit
+        :param old_hash: expected HEAD for the first commit, the current HEAD of the branch if not given
+        :param max_operations: maximum number of operations per commit
+        :param max_bytes: maximum size of the request body of a commit, unless a single operation is larger
+        :param progress: called with the progress after every commit
+        :return: the branch after the last commit and the totals of the bulk commit
+        """
+        meta = CommitMeta(message=reason if reason else "")
+        if author:
+            meta.author = author
+        expected_hash = old_hash if old_hash else self.get_reference(branch).hash_
+        stats = BulkCommitStats(Branch(branch, expected_hash))
+        started = time.monotonic()
+        for count, body in encode_commit_chunks(meta, ops, max_operations, max_bytes, self._session.codec):
+            with self._changing_references(branch):
+                ref_obj = commit(
+                    self._base_url, self._auth, branch, body, cast(str, stats.branch.hash_), self._ssl_verify, session=self._session
+                )
+            stats.branch = cast(Branch, load(ReferenceSchema, ref_obj))
+            stats.commits += 1
+            stats.operations += count
+            stats.bytes_sent += len(body)
+            stats.elapsed_sec = time.monotonic() - started
+            if progress:
+                progress(attr.evolve(stats))
+        return stats
 
     def _assign_to(self, to_ref: str, to_ref_hash: Optional[str] = None) -> Reference:
         ref_name, ref_hash = split_into_reference_and_hash(to_ref)
@@ -229,16 +789,18 @@ class NessieClient:
         if not old_hash:
             old_hash = self.get_reference(branch).hash_
         assert old_hash is not None
-        ref_json = ReferenceSchema().dumps(self._assign_to(to_ref, to_ref_hash))
-        assign_branch(self._base_url, self._auth, branch, ref_json, old_hash, self._ssl_verify)
+        ref_json = self._session.codec.dumps(ReferenceSchema().dump(self._assign_to(to_ref, to_ref_hash)))
+        with self._changing_references(branch):
+            assign_branch(self._base_url, self._auth, branch, ref_json, old_hash, self._ssl_verify, session=self._session)
 
     def assign_tag(self, tag: str, to_ref: str, to_ref_hash: Optional[str] = None, old_hash: Optional[str] = None) -> None:
         """Assign a hash to a tag."""
         if not old_hash:
             old_hash = self.get_reference(tag).hash_
         assert old_hash is not None
-        ref_json = ReferenceSchema().dumps(self._assign_to(to_ref, to_ref_hash))
-        assign_tag(self._base_url, self._auth, tag, ref_json, old_hash, self._ssl_verify)
+        ref_json = self._session.codec.dumps(ReferenceSchema().dump(self._assign_to(to_ref, to_ref_hash)))
+        with self._changing_references(tag):
+            assign_tag(self._base_url, self._auth, tag, ref_json, old_hash, self._ssl_verify, session=self._session)
 
     def merge(self, from_ref: str, onto_branch: str, from_hash: Optional[str] = None, old_hash: Optional[str] = None) -> MergeResponse:
         """Merge a branch into another branch."""
@@ -264,8 +826,9 @@ class NessieClient:
             from_hash = from_hash_ref
 
         merge_json = MergeSchema().dump(Merge(from_ref, str(from_hash)))
-        merge_response = merge(self._base_url, self._auth, onto_branch, merge_json, old_hash, self._ssl_verify)
-        return MergeResponseSchema().load(merge_response)
+        with self._changing_references(onto_branch):
+            merge_response = merge(self._base_url, self._auth, onto_branch, merge_json, old_hash, self._ssl_verify, session=self._session)
+        return load(MergeResponseSchema, merge_response)
 
     # pylint: disable=keyword-arg-before-vararg
     def cherry_pick(self, branch: str, from_ref: str, old_hash: Optional[str] = None, *hashes: str) -> MergeResponse:
@@ -274,43 +837,91 @@ class NessieClient:
             old_hash = self.get_reference(branch).hash_
         assert old_hash is not None
         transplant_json = TransplantSchema().dump(Transplant(from_ref, list(hashes)))
-        merge_response = cherry_pick(self._base_url, self._auth, branch, transplant_json, old_hash, self._ssl_verify)
-        return MergeResponseSchema().load(merge_response)
+        with self._changing_references(branch):
+            merge_response = cherry_pick(
+                self._base_url, self._auth, branch, transplant_json, old_hash, self._ssl_verify, session=self._session
+            )
+        return load(MergeResponseSchema, merge_response)
 
+    @overload
     def get_log(
+        self,
+        start_ref: str,
+        hash_on_ref: Optional[str] = ...,
+        max_records: Optional[int] = ...,
+        fetch_all: bool = ...,
+        lazy: bool = ...,
+        raw: Literal[False] = ...,
+        **filtering_args: Any,
+    ) -> Generator[LogEntry, Any, None]: ...
+
+    @overload
+    def get_log(
+        self,
+        start_ref: str,
+        hash_on_ref: Optional[str] = ...,
+        max_records: Optional[int] = ...,
+        fetch_all: bool = ...,
+        lazy: bool = ...,
+        *,
+        raw: Literal[True],
+        stream: bool = ...,
+        **filtering_args: Any,
+    ) -> Generator[RawJson, Any, None]: ...
+
+    def get_log(  # noqa: C901
         self,
         start_ref: str,
         hash_on_ref: Optional[str] = None,
         max_records: Optional[int] = None,
         fetch_all: bool = False,
-        **filtering_args: Any
-    ) -> Generator[LogEntry, Any, None]:
+        lazy: bool = False,
+        raw: bool = False,
+        stream: bool = False,
+        **filtering_args: Any,
+    ) -> Union[Generator[LogEntry, Any, None], Generator[RawJson, Any, None]]:
         """Fetch all logs starting at start_ref.
 
-        start_ref can be any ref.
+        start_ref can be any ref. The log is fetched one page at a time while the generator is consumed, following the
+        continuation tokens of the server. max_records is sent to the server as the page size and ends the iteration
+        after that many entries. fetch_all=True makes the server include the operations and the parent of every commit.
+        The filtering_args, e.g. startHash, endHash or a CEL filter, are sent as query parameters and evaluated by the
+        server.
+
+        With lazy=True the entries are LazyLogEntry objects, which decode their operations, commit metadata and
+        timestamps only when they are accessed, so scanning many commits for e.g. their hashes stays cheap.
 
-        Note:
-            this will load the log into local memory and filter at the client. Currently there are no
-            primitives in the REST api to limit logs or perform paging. TODO
+        With raw=True the pages of the server are yielded as RawJson documents instead of the entries, without
+        decoding them into model objects or caching them. The last page may hold more than max_records entries.
+        With stream=True as well, each page is read only when it is first used, e.g. by RawJson.write_to() as it
+        arrives, and has to be used before the next page is requested.
         """
+        if raw:
+            return self._raw_log_pages(start_ref, hash_on_ref, max_records, fetch_all, stream, filtering_args)
         page_token = filtering_args.get("pageToken", None)
 
         def fetch_logs(fetch_max: Optional[int], token: Optional[str] = page_token) -> LogResponse:
-            if token:
-                filtering_args["pageToken"] = token
-
-            fetched_logs = list_logs(
-                base_url=self._base_url,
-                auth=self._auth,
-                hash_on_ref=hash_on_ref,
-                ref=start_ref,
-                ssl_verify=self._ssl_verify,
-                max_records=fetch_max,
-                fetch_all=fetch_all,
-                **filtering_args
-            )
-            parsed_logs = LogResponseSchema().load(fetched_logs)
-            return parsed_logs
+            # the arguments of the call are never changed, each page gets its own copy with its token
+            page_args = {**filtering_args, "pageToken": token} if token else filtering_args
+
+            def fetch() -> dict:
+                logs = list_logs(
+                    base_url=self._base_url,
+                    auth=self._auth,
+                    hash_on_ref=hash_on_ref,
+                    ref=start_ref,
+                    ssl_verify=self._ssl_verify,
+                    max_records=fetch_max,
+                    fetch_all=fetch_all,
+                    session=self._session,
+                    **page_args,
+                )
+                return cast(dict, logs)
+
+            # the log below a pinned commit never changes
+            pinned_hash = hash_on_ref or page_args.get("endHash")
+            fetched_logs = self._disk_cached(pinned_hash, fetch, "log", start_ref, fetch_max, fetch_all, page_args)
+            return load_log_lazily(fetched_logs) if lazy else load(LogResponseSchema, fetched_logs)
 
         log_response = fetch_logs(fetch_max=max_records)
 
@@ -329,6 +940,43 @@ class NessieClient:
 
         return generator(log_response, max_records)
 
+    def _raw_log_pages(
+        self,
+        start_ref: str,
+        hash_on_ref: Optional[str],
+        max_records: Optional[int],
+        fetch_all: bool,
+        stream: bool,
+        filtering_args: Dict[str, Any],
+    ) -> Generator[RawJson, Any, None]:
+        remaining = max_records
+        while True:
+            page = cast(
+                RawJson,
+                list_logs(
+                    base_url=self._base_url,
+                    auth=self._auth,
+                    hash_on_ref=hash_on_ref,
+                    ref=start_ref,
+                    ssl_verify=self._ssl_verify,
+                    max_records=remaining,
+                    fetch_all=fetch_all,
+                    session=self._session,
+                    raw=True,
+                    stream=stream,
+                    **filtering_args,
+                ),
+            )
+            yield page
+            if remaining is not None:
+                remaining -= len(page.get("logEntries") or [])
+                if remaining <= 0:
+                    return
+            token = _raw_page_token(page)
+            if not token:
+                return
+            filtering_args = {**filtering_args, "pageToken": token}
+
     def get_default_branch(self) -> str:
         """Fetch default branch either from config if specified or from the server."""
         return self._base_branch if self._base_branch else self.get_reference(None).name
@@ -337,13 +985,101 @@ class NessieClient:
         """Return Nessie server configured base URL."""
         return self._base_url
 
+    @overload
+    def get_diff(
+        self,
+        from_ref: str,
+        to_ref: str,
+        from_hash_on_ref: Optional[str] = ...,
+        to_hash_on_ref: Optional[str] = ...,
+        max_records: Optional[int] = ...,
+        page_token: Optional[str] = ...,
+        raw: Literal[False] = ...,
+    ) -> DiffResponse: ...
+
+    @overload
     def get_diff(
-        self, from_ref: str, to_ref: str, from_hash_on_ref: Optional[str] = None, to_hash_on_ref: Optional[str] = None
-    ) -> DiffResponse:
+        self,
+        from_ref: str,
+        to_ref: str,
+        from_hash_on_ref: Optional[str] = ...,
+        to_hash_on_ref: Optional[str] = ...,
+        max_records: Optional[int] = ...,
+        page_token: Optional[str] = ...,
+        *,
+        raw: Literal[True],
+        stream: bool = ...,
+    ) -> RawJson: ...
+
+    def get_diff(
+        self,
+        from_ref: str,
+        to_ref: str,
+        from_hash_on_ref: Optional[str] = None,
+        to_hash_on_ref: Optional[str] = None,
+        max_records: Optional[int] = None,
+        page_token: Optional[str] = None,
+        raw: bool = False,
+        stream: bool = False,
+    ) -> Union[DiffResponse, RawJson]:
         """Retrieve the diff between from_ref and to_ref.
 
-        from_ref / to_ref can be any ref.
+        from_ref / to_ref can be any ref. With raw=True the response of the server is returned as RawJson, without
+        decoding it into model objects. With stream=True as well, the response is read only when the RawJson is first
+        used, e.g. by RawJson.write_to() as it arrives.
         """
-        return DiffResponseSchema().load(
-            get_diff(self._base_url, self._auth, from_ref, to_ref, from_hash_on_ref, to_hash_on_ref, self._ssl_verify)
+        page = self._get_diff_page(from_ref, to_ref, from_hash_on_ref, to_hash_on_ref, max_records, page_token, raw, stream)
+        return page if isinstance(page, RawJson) else load(DiffResponseSchema, page)
+
+    def iter_diff(
+        self,
+        from_ref: str,
+        to_ref: str,
+        from_hash_on_ref: Optional[str] = None,
+        to_hash_on_ref: Optional[str] = None,
+        page_size: Optional[int] = None,
+    ) -> Generator[DiffEntry, Any, None]:
+        """Iterate over the diff between from_ref and to_ref, following the server's pagination.
+
+        Each entry is decoded only when it is consumed, while the next page is fetched in the background.
+
+        :param from_ref: the starting ref for the diff
+        :param to_ref: the ending ref for the diff
+        :param from_hash_on_ref: optional hash on from reference
+        :param to_hash_on_ref: optional hash on to reference
+        :param page_size: hint for the server, maximum number of diff entries per page
+        :return: generator of Nessie diff entries
+        """
+        load_diff = loader(DiffEntrySchema)
+        pages = _prefetched_pages(
+            lambda token: self._get_diff_page(from_ref, to_ref, from_hash_on_ref, to_hash_on_ref, page_size, token), _raw_page_token
+        )
+        for page in pages:
+            for diff in page.get("diffs") or []:
+                yield load_diff(diff)
+
+    def _get_diff_page(
+        self,
+        from_ref: str,
+        to_ref: str,
+        from_hash_on_ref: Optional[str],
+        to_hash_on_ref: Optional[str],
+        max_records: Optional[int],
+        page_token: Optional[str],
+        raw: bool = False,
+        stream: bool = False,
+    ) -> Union[dict, RawJson]:
+        return get_diff(
+            self._base_url,
+            self._auth,
+            from_ref,
+            to_ref,
+            from_hash_on_ref,
+            to_hash_on_ref,
+            self._ssl_verify,
+            max_records,
+            page_token,
+            session=self._session,
+            raw=raw,
+            stream=stream,
         )
@@ -13,16 +13,7 @@
 # limitations under the License.
 #
 
-"""Top-level package for Nessie CLI commands."""
+"""Top-level package for Nessie CLI commands.
 
-from pynessie.commands.branch import branch_
-from pynessie.commands.cherry_pick import cherry_pick
-from pynessie.commands.config import config
-from pynessie.commands.content import content
-from pynessie.commands.diff import diff
-from pynessie.commands.log import log
-from pynessie.commands.merge import merge
-from pynessie.commands.remote import remote
-from pynessie.commands.tag import tag
-
-__all__ = ["remote", "tag", "branch_", "cherry_pick", "config", "log", "merge", "content", "diff"]
+The package imports none of its commands, the 'nessie' group imports each command module when the command is used.
+"""
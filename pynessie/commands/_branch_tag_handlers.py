@@ -15,13 +15,25 @@
 
 """Branch and tag common functions."""
 
-from typing import Optional
+from itertools import islice
+from typing import Iterable, Iterator, Optional
 
 import click
 
 from pynessie.client import NessieClient
 from pynessie.error import NessieConflictException
-from pynessie.model import Branch, ReferenceSchema, Tag, split_into_reference_and_hash
+from pynessie.model import (
+    Branch,
+    Reference,
+    ReferenceSchema,
+    Tag,
+    split_into_reference_and_hash,
+)
+from pynessie.utils import build_filter_for_references_listing
+
+# number of rows formatted at once while streaming the plain-text reference listing, the first batch sets the width of
+# the name column, which later batches only widen for longer names, so the columns stay aligned from batch to batch
+_LIST_BATCH_SIZE = 100
 
 
 def handle_branch_tag(
@@ -37,7 +49,7 @@ def handle_branch_tag(
     verbose: bool,
     fetch_all: bool,
     expected_hash: Optional[str] = None,
-) -> str:
+) -> Iterable[str]:
     """Perform branch/tag actions.
 
     :param nessie NessieClient to use
@@ -53,6 +65,7 @@ def handle_branch_tag(
     :param verbose the -v option choice
     :param fetch_all the -x option to fetch additional metadata for a branch/tag
     :param expected_hash hash whose existence needs to be checked (on the server side) before performing the operation
+    :return the output to print, as chunks that are produced while a listing is being read from the server
     """
     if list_references or (not list_references and not delete_reference and not ref_name and not base_ref):
         return _handle_list(nessie, json, verbose, is_branch, ref_name, fetch_all)
@@ -85,30 +98,44 @@ def handle_branch_tag(
                 getattr(nessie, "assign_{}".format("branch" if is_branch else "tag"))(ref_name, base_ref, hash_on_ref, expected_hash)
             else:
                 raise conflict
-    return ""
+    return []
 
 
-def _handle_list(nessie: NessieClient, json: bool, verbose: bool, is_branch: bool, ref_name: str, fetch_all: bool) -> str:
-    results = nessie.list_references(fetch_all=fetch_all).references
-    kept_results = [ref for ref in results if isinstance(ref, (Branch if is_branch else Tag))]
-    if ref_name:
-        kept_results = [i for i in kept_results if i.name == ref_name]
+def _handle_list(nessie: NessieClient, json: bool, verbose: bool, is_branch: bool, ref_name: str, fetch_all: bool) -> Iterator[str]:
+    query_filter = build_filter_for_references_listing(is_branch, ref_name)
+    results = nessie.iter_references(fetch_all=fetch_all, query_filter=query_filter)
+    # the server filters already, this only guards against servers that do not evaluate the filter
+    kept_results = (ref for ref in results if isinstance(ref, (Branch if is_branch else Tag)) and (not ref_name or ref.name == ref_name))
     if json:
         return _handle_json_output(kept_results, ref_name)
     return _handle_normal_output(kept_results, verbose, nessie.get_default_branch(), fetch_all)
 
 
-def _handle_json_output(input_data: list, ref_name: str) -> str:
-    if ref_name and len(input_data) == 1:
-        return ReferenceSchema().dumps(input_data[0], many=False)
-    if ref_name and len(input_data) < 1:
-        return "{}"
-    return ReferenceSchema().dumps(input_data, many=True)
-
-
-def _handle_normal_output(input_data: list, verbose: bool, default_branch: str, show_additional_info: bool = False) -> str:
-    output_rows = []
-    max_width = max((len(i.name) for i in input_data), default=0)
+def _handle_json_output(input_data: Iterator[Reference], ref_name: str) -> Iterator[str]:
+    if ref_name:
+        first = next(input_data, None)
+        yield ReferenceSchema().dumps(first, many=False) if first else "{}"
+        return
+    separator = "["
+    for ref in input_data:
+        yield separator + ReferenceSchema().dumps(ref, many=False)
+        separator = ", "
+    yield "[]" if separator == "[" else "]"
+
+
+def _handle_normal_output(
+    input_data: Iterator[Reference], verbose: bool, default_branch: str, show_additional_info: bool = False
+) -> Iterator[str]:
+    separator = ""
+    name_width = 0
+    while batch := list(islice(input_data, _LIST_BATCH_SIZE)):
+        name_width = max(name_width, *(len(ref.name) for ref in batch))
+        for row in _format_rows(batch, name_width, verbose, default_branch, show_additional_info):
+            yield separator + row
+            separator = "\n"
+
+
+def _format_rows(input_data: list, name_width: int, verbose: bool, default_branch: str, show_additional_info: bool) -> Iterator[str]:
     for x in input_data:
         additional_info = ""
         if show_additional_info and x.metadata:
@@ -133,10 +160,9 @@ def _handle_normal_output(input_data: list, verbose: bool, default_branch: str,
 
         next_row = "{}{}{}{}{}".format(
             "*".ljust(2) if x.name == default_branch else "  ",
-            x.name.ljust(max_width + 1),
+            x.name.ljust(name_width + 1),
             " " if verbose else "",
             x.hash_ if verbose else "",
             additional_info,
         )
-        output_rows.append(click.style(next_row, fg="yellow") if x.name == default_branch else next_row)
-    return "\n".join(output_rows)
+        yield click.style(next_row, fg="yellow") if x.name == default_branch else next_row
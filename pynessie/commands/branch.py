@@ -96,9 +96,6 @@ def branch_(
     results = handle_branch_tag(
         ctx.nessie, is_list, delete, branch, hash_on_ref, base_ref, True, ctx.json, force, ctx.verbose, fetch_all, expected_hash
     )
-    if ctx.json:
-        click.echo(results)
-    elif results:
-        click.echo(results)
-    else:
-        click.echo()
+    for chunk in results:
+        click.echo(chunk, nl=False)
+    click.echo()
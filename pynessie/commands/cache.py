@@ -0,0 +1,57 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Cache CLI group command."""
+
+import json
+
+import attr
+import click
+
+from pynessie.cli_common_context import ContextObject
+from pynessie.decorators import error_handler, pass_client
+
+
+@click.group()
+@pass_client
+def cache(ctx: ContextObject) -> None:
+    """View and clear the on-disk cache."""
+    pass
+
+
+@cache.command("stats")
+@pass_client
+@error_handler
+def stats(ctx: ContextObject) -> None:
+    """Show the counters of the on-disk cache."""
+    cache_stats = ctx.nessie.disk_cache_stats()
+    if ctx.json:
+        click.echo(json.dumps(attr.asdict(cache_stats) if cache_stats else {}))
+    elif cache_stats is None:
+        click.echo("The on-disk cache is disabled, set 'cache.disk.maxbytes' to enable it.")
+    else:
+        click.echo("Path: " + cache_stats.path)
+        click.echo(f"Entries: {cache_stats.entries}")
+        click.echo(f"Size: {cache_stats.size_bytes} of {cache_stats.max_bytes} bytes")
+        click.echo(f"Hits: {cache_stats.hits}")
+        click.echo(f"Misses: {cache_stats.misses}")
+
+
+@cache.command("clear")
+@pass_client
+@error_handler
+def clear(ctx: ContextObject) -> None:
+    """Remove all entries from the on-disk cache."""
+    ctx.nessie.clear_caches()
@@ -17,20 +17,20 @@
 
 import click
 
+from pynessie.cli import LazyGroup
 from pynessie.cli_common_context import ContextObject
-from pynessie.commands.content.commit import commit
-from pynessie.commands.content.list_ import list_
-from pynessie.commands.content.view import view
 from pynessie.decorators import pass_client
 
+# the module attribute that implements each subcommand, imported when the subcommand is looked up
+_COMMANDS = {
+    "list": "pynessie.commands.content.list_:list_",
+    "view": "pynessie.commands.content.view:view",
+    "commit": "pynessie.commands.content.commit:commit",
+}
 
-@click.group(name="content")
+
+@click.group(name="content", cls=LazyGroup, lazy_commands=_COMMANDS)
 @pass_client
 def content(ctx: ContextObject) -> None:
     """View, list content, and commit changes."""
     pass
-
-
-content.add_command(list_)
-content.add_command(view)
-content.add_command(commit)
@@ -16,11 +16,17 @@
 """Contents List Command CLI."""
 
 from collections import defaultdict
-from typing import List
+from typing import Iterable, List
 
 import click
 
-from pynessie.cli_common_context import ContextObject, MutuallyExclusiveOption
+from pynessie.cli_common_context import (
+    ContextObject,
+    MutuallyExclusiveOption,
+    echo_parquet,
+    echo_raw_json,
+    raw_json_pages,
+)
 from pynessie.decorators import error_handler, pass_client, validate_reference
 from pynessie.model import Entries, Entry, EntrySchema
 from pynessie.utils import build_filter_for_contents_listing_flags
@@ -48,10 +54,18 @@ from pynessie.utils import build_filter_for_contents_listing_flags
     "entry.contentType in ['ICEBERG_TABLE','DELTA_LAKE_TABLE']\n"
     "entry.namespace.startsWith('some.name.space') && entry.contentType in ['ICEBERG_TABLE','DELTA_LAKE_TABLE']\n",
 )
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["text", "parquet"]),
+    default="text",
+    help="Output format. 'parquet' writes key, content type and content id of the entries as a Parquet file to stdout "
+    "and requires pyarrow. 'text' honors --json.",
+)
 @pass_client
 @error_handler
 @validate_reference
-def list_(ctx: ContextObject, ref: str, query_filter: str, entity_types: List[str]) -> None:
+def list_(ctx: ContextObject, ref: str, query_filter: str, entity_types: List[str], output_format: str) -> None:
     """List content.
 
     Examples:
@@ -63,30 +77,48 @@ def list_(ctx: ContextObject, ref: str, query_filter: str, entity_types: List[st
 
         nessie content list -r dev --filter "entry.namespace.startsWith('some.name.space')" -> List all contents in
     'dev' branch that start with 'some.name.space'
+
+        nessie content list -r dev --format parquet > keys.parquet -> Write all contents in 'dev' branch to a
+    Parquet file.
     """
-    keys = ctx.nessie.list_keys(
-        ref,
-        query_filter=build_filter_for_contents_listing_flags(query_filter, entity_types),
-    )
-    results = EntrySchema().dumps(_format_keys_json(keys), many=True) if ctx.json else _format_keys(keys)
-    click.echo(results)
+    expr = build_filter_for_contents_listing_flags(query_filter, entity_types)
+    if ctx.raw_json or output_format == "parquet":
+        stream = output_format != "parquet"
+        pages = raw_json_pages(lambda token: ctx.nessie.list_keys(ref, page_token=token, query_filter=expr, raw=True, stream=stream))
+        if output_format == "parquet":
+            echo_parquet(pages)
+        else:
+            echo_raw_json(pages)
+        return
+    if ctx.json:
+        _echo_keys_json(ctx.nessie.iter_keys(ref, query_filter=expr))
+    else:
+        _echo_keys(ctx.nessie.iter_key_pages(ref, query_filter=expr))
 
 
-def _format_keys_json(keys: Entries) -> List[Entry]:
-    results = []
-    for k in keys.entries:
-        results.append(k)
-    return results
+def _echo_keys_json(entries: Iterable[Entry]) -> None:
+    schema = EntrySchema()
+    separator = ""
+    click.echo("[", nl=False)
+    for entry in entries:
+        click.echo(separator + schema.dumps(entry), nl=False)
+        separator = ", "
+    click.echo("]")
 
 
-def _format_keys(keys: Entries) -> str:
-    results = defaultdict(list)
-    result_str = ""
-    for entry in keys.entries:
-        results[entry.kind].append(entry.name)
-    for k, result_list in results.items():
-        result_str += k + ":\n"
-        for v in result_list:
-            value = ['"{}"'.format(i) if "." in i else i for i in v.elements]
-            result_str += "\t{}\n".format(".".join(value))
-    return result_str
+def _echo_keys(pages: Iterable[Entries]) -> None:
+    # the entries of a page are grouped by kind and printed before the next page is read, a kind is only repeated if
+    # the previous page ended with another kind
+    last_kind = None
+    for page in pages:
+        results = defaultdict(list)
+        for entry in page.entries:
+            results[entry.kind].append(".".join('"{}"'.format(i) if "." in i else i for i in entry.name.elements))
+        for k, result_list in results.items():
+            if k != last_kind:
+                click.echo(k + ":")
+                last_kind = k
+            for v in result_list:
+                click.echo("\t{}".format(v))
+    # the listing has always ended with an empty line, scripts that parse it may rely on that
+    click.echo()
@@ -19,7 +19,7 @@ from typing import List
 
 import click
 
-from pynessie.cli_common_context import ContextObject
+from pynessie.cli_common_context import ContextObject, echo_raw_json
 from pynessie.client import NessieClient
 from pynessie.decorators import error_handler, pass_client, validate_reference
 from pynessie.model import Content, ContentKey, ContentSchema
@@ -44,6 +44,9 @@ def view(ctx: ContextObject, ref: str, key: List[ContentKey]) -> None:
         nessie content view -r dev my_table -> View content details for content "my_table"
     in 'dev' branch.
     """
+    if ctx.raw_json:
+        echo_raw_json(ctx.nessie.get_content(ref, k, raw=True, stream=True) for k in key)
+        return
     if ctx.json:
         results = ContentSchema().dumps(_get_content_for_all_keys(ctx.nessie, ref, key), many=True)
     else:
@@ -53,9 +56,12 @@ def view(ctx: ContextObject, ref: str, key: List[ContentKey]) -> None:
 
 
 def _get_content_for_all_keys(client: NessieClient, ref: str, keys: List[ContentKey]) -> List[Content]:
-    contents: List[Content] = []
+    found = {c.key.to_path_string(): c.content for c in client.get_contents(ref, keys)}
 
+    contents: List[Content] = []
     for key in keys:
-        contents.append(client.get_content(ref, key))
+        content = found.get(key.to_path_string())
+        # let the server report why a key has no content, exactly as for a single key
+        contents.append(content if content is not None else client.get_content(ref, key))
 
     return contents
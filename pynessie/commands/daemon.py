@@ -0,0 +1,68 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Daemon CLI group command."""
+
+import json
+
+import click
+
+from pynessie.daemon import daemon_status, serve, socket_path, stop_daemon
+
+
+@click.group()
+def daemon() -> None:
+    """Run nessie commands in a resident process with warm connections and caches."""
+    pass
+
+
+@daemon.command("start")
+@click.option("--idle-timeout", type=int, default=0, help="stop after this many seconds without commands, 0 to never stop.")
+def start(idle_timeout: int) -> None:
+    """Serve the commands of the nessie script in the foreground until stopped.
+
+    While the daemon runs, nessie commands whose stdin is not a terminal run in the daemon. Start it in the
+    background, e.g. 'nessie daemon start &', the socket is NESSIE_DAEMON_SOCKET or a per-user socket.
+
+    The daemon runs one command at a time, a long command or a script reading its output slowly delays the others.
+    """
+    path = socket_path()
+    if daemon_status(path) is not None:
+        raise click.ClickException(f"A daemon is already running on {path}")
+    serve(path, click.get_current_context().find_root().command, idle_timeout or None)
+
+
+@daemon.command("stop")
+def stop() -> None:
+    """Stop the running daemon."""
+    if not stop_daemon():
+        raise click.ClickException(f"No daemon is running on {socket_path()}")
+
+
+@daemon.command("status")
+@click.pass_context
+def status(ctx: click.Context) -> None:
+    """Show the socket, pid and counters of the running daemon."""
+    daemon_info = daemon_status()
+    if daemon_info is None:
+        raise click.ClickException(f"No daemon is running on {socket_path()}")
+    if ctx.find_root().params["json"]:
+        click.echo(json.dumps(daemon_info))
+    else:
+        click.echo("Socket: " + daemon_info["socket"])
+        click.echo(f"Pid: {daemon_info['pid']}")
+        click.echo(f"Uptime: {daemon_info['uptime']:.0f} s")
+        click.echo(f"Commands: {daemon_info['commands']}")
+        click.echo(f"Clients: {daemon_info['clients']}")
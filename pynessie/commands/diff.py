@@ -15,11 +15,13 @@
 
 """diff CLI command."""
 
+from typing import Iterable
+
 import click
 
-from pynessie.cli_common_context import ContextObject
+from pynessie.cli_common_context import ContextObject, echo_raw_json, raw_json_pages
 from pynessie.decorators import error_handler, pass_client
-from pynessie.model import DiffResponseSchema, split_into_reference_and_hash
+from pynessie.model import DiffEntry, DiffEntrySchema, split_into_reference_and_hash
 
 
 @click.command("diff")
@@ -55,8 +57,28 @@ def diff(ctx: ContextObject, from_ref: str, to_ref: str) -> None:  # noqa: C901
 
     to_ref, to_hash_on_ref = split_into_reference_and_hash(to_ref)
 
-    diff_response = ctx.nessie.get_diff(from_ref=from_ref, to_ref=to_ref, from_hash_on_ref=from_hash_on_ref, to_hash_on_ref=to_hash_on_ref)
+    if ctx.raw_json:
+        echo_raw_json(
+            raw_json_pages(
+                lambda token: ctx.nessie.get_diff(
+                    from_ref, to_ref, from_hash_on_ref, to_hash_on_ref, page_token=token, raw=True, stream=True
+                )
+            )
+        )
+        return
+    diffs = ctx.nessie.iter_diff(from_ref=from_ref, to_ref=to_ref, from_hash_on_ref=from_hash_on_ref, to_hash_on_ref=to_hash_on_ref)
     if ctx.json:
-        click.echo(DiffResponseSchema().dumps(diff_response))
+        _echo_diffs_json(diffs)
     else:
-        click.echo_via_pager(x.pretty_print() + "\n" for index, x in enumerate(diff_response.diffs))
+        click.echo_via_pager(x.pretty_print() + "\n" for x in diffs)
+
+
+def _echo_diffs_json(diffs: Iterable[DiffEntry]) -> None:
+    # same document as DiffResponseSchema().dumps() of the complete diff, written one entry at a time
+    schema = DiffEntrySchema()
+    separator = ""
+    click.echo('{"diffs": [', nl=False)
+    for entry in diffs:
+        click.echo(separator + schema.dumps(entry), nl=False)
+        separator = ", "
+    click.echo('], "hasMore": false, "token": null}')
@@ -21,7 +21,12 @@ from typing import Any, List, Optional, Tuple
 import click
 from dateutil.tz import tzlocal
 
-from pynessie.cli_common_context import ContextObject, MutuallyExclusiveOption
+from pynessie.cli_common_context import (
+    ContextObject,
+    MutuallyExclusiveOption,
+    echo_parquet,
+    echo_raw_json,
+)
 from pynessie.decorators import error_handler, pass_client, validate_reference
 from pynessie.model import (
     CommitMetaSchema,
@@ -78,6 +83,14 @@ from pynessie.utils import build_filter_for_commit_log_flags
     "This option will also return the operations for each commit and the parent hash. "
     "The schema of the JSON output will then produce a list of LogEntrySchema, otherwise a list of CommitMetaSchema.",
 )
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["text", "parquet"]),
+    default="text",
+    help="Output format. 'parquet' writes hash, author, committer, commit time, message and parent of the commits "
+    "as a Parquet file to stdout and requires pyarrow. 'text' honors --json.",
+)
 @pass_client
 @error_handler
 @validate_reference
@@ -92,6 +105,7 @@ def log(  # noqa: C901
     revision_range: str,
     query_filter: str,
     fetch_all: bool,
+    output_format: str,
 ) -> None:
     """Show commit log.
 
@@ -120,6 +134,8 @@ def log(  # noqa: C901
         nessie log --after "2019-01-01T00:00:00+00:00" --before "2021-01-01T00:00:00+00:00" dev ->
     show commit logs between "2019-01-01T00:00:00+00:00" and "2021-01-01T00:00:00+00:00" in 'dev' branch
 
+        nessie log -x --format parquet dev > log.parquet -> write the commit logs of 'dev' branch to a Parquet file
+
     """
     ref, start_hash, end_hash = _log_ref_and_hashes(ref, revision_range)
 
@@ -133,6 +149,15 @@ def log(  # noqa: C901
         filtering_args["filter"] = expr
 
     # TODO: limiting by path is not yet supported.
+    if ctx.raw_json or output_format == "parquet":
+        pages = ctx.nessie.get_log(
+            start_ref=ref, max_records=number, fetch_all=fetch_all, raw=True, stream=output_format != "parquet", **filtering_args
+        )
+        if output_format == "parquet":
+            echo_parquet(pages)
+        else:
+            echo_raw_json(pages)
+        return
     log_result = ctx.nessie.get_log(start_ref=ref, max_records=number, fetch_all=fetch_all, **filtering_args)
     if ctx.json:
         if fetch_all:
@@ -0,0 +1,169 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Shell CLI command."""
+
+import shlex
+import time
+from typing import Callable, Dict, List, Optional, cast
+
+import click
+
+from pynessie.cli_common_context import ContextObject, config_args
+from pynessie.client import NessieClient
+from pynessie.conf import build_config
+from pynessie.error import NessieException
+from pynessie.model import ContentKey
+
+# commands that make no sense inside a shell
+_EXCLUDED_COMMANDS = {"daemon", "shell"}
+_EXIT_COMMANDS = {"exit", "quit"}
+
+
+class ShellCompleter:
+    """Completes command names, reference names and content keys.
+
+    References and the keys of each reference are listed once per shell and completed from these cached listings.
+    """
+
+    def __init__(self, client: NessieClient, commands: List[str]) -> None:
+        """Create a completer for the given client and top-level command names."""
+        self._client = client
+        self._commands = commands
+        self._references: Optional[List[str]] = None
+        self._keys: Dict[Optional[str], List[str]] = {}
+
+    def candidates(self, line: str, text: str) -> List[str]:
+        """Return the completions of the word 'text', which follows 'line' on the command line."""
+        words = line.split()
+        if not words:
+            names = self._commands
+        else:
+            ref = _option_value(words, "-r", "--ref")
+            names = self._reference_names() + self._key_names(ref)
+        return sorted(name for name in names if name.startswith(text))
+
+    def _reference_names(self) -> List[str]:
+        if self._references is None:
+            self._references = _listed(lambda: [ref.name for ref in self._client.iter_references()])
+        return self._references
+
+    def _key_names(self, ref: Optional[str]) -> List[str]:
+        if ref not in self._keys:
+            self._keys[ref] = _listed(
+                lambda: [ContentKey(e.name.elements).to_string() for e in self._client.iter_keys(ref or self._client.get_default_branch())]
+            )
+        return self._keys[ref]
+
+
+def _listed(listing: Callable[[], List[str]]) -> List[str]:
+    # a failed listing must not end the shell, it just offers nothing to complete
+    try:
+        return listing()
+    except NessieException:
+        return []
+
+
+def _option_value(words: List[str], *names: str) -> Optional[str]:
+    for option, value in zip(words, words[1:], strict=False):
+        if option in names:
+            return value
+    return None
+
+
+def _install_completer(completer: ShellCompleter) -> None:
+    try:
+        import readline  # pylint: disable=C0415
+    except ImportError:
+        # e.g. on Windows, the shell works without completion
+        return
+    matches: List[str] = []
+
+    def complete(text: str, state: int) -> Optional[str]:
+        if state == 0:
+            matches[:] = completer.candidates(readline.get_line_buffer()[: readline.get_begidx()], text)
+        return matches[state] if state < len(matches) else None
+
+    # keys contain dots and references dashes, so only whitespace separates the completed words
+    readline.set_completer_delims(" \t\n")
+    readline.set_completer(complete)
+    readline.parse_and_bind("tab: complete")
+
+
+@click.command("shell")
+@click.option("--reference-ttl", type=int, default=30, show_default=True, help="seconds for which resolved references are reused.")
+@click.option("--content-cache-size", type=int, default=10000, show_default=True, help="number of contents kept in memory.")
+@click.pass_context
+def shell(ctx: click.Context, reference_ttl: int, content_cache_size: int) -> None:
+    """Run nessie commands interactively with one client, its connections and its caches.
+
+    Enter commands without the leading 'nessie', e.g. 'log main' or 'content list -r dev'. Tab completes command
+    names, references and content keys. The time and the number of requests of each command are written to stderr.
+    Use 'exit', 'quit' or Ctrl-D to leave the shell.
+    """
+    root = ctx.find_root()
+    args = {
+        **config_args(root.params["endpoint"], root.params["auth_token"]),
+        "cache.reference.ttl": reference_ttl,
+        "cache.content.maxsize": content_cache_size,
+    }
+    client = NessieClient(build_config(args))
+    ctx.call_on_close(client.close)
+    obj = ContextObject(client, root.params["verbose"], root.params["json"], root.params["raw_json"])
+    group = cast(click.Group, root.command)
+    _install_completer(ShellCompleter(client, [c for c in group.list_commands(root) if c not in _EXCLUDED_COMMANDS]))
+    while True:
+        try:
+            line = input("nessie> ")
+        except EOFError:
+            click.echo()
+            return
+        except KeyboardInterrupt:
+            click.echo()
+            continue
+        try:
+            words = shlex.split(line)
+        except ValueError as e:
+            click.echo(f"Error: {e}", err=True)
+            continue
+        if not words:
+            continue
+        if words[0] in _EXIT_COMMANDS:
+            return
+        requests = client.request_stats().requests
+        started = time.perf_counter()
+        _run_command(root, group, obj, words)
+        requests = client.request_stats().requests - requests
+        click.echo(f"{time.perf_counter() - started:.3f} s, {requests} request{'' if requests == 1 else 's'}", err=True)
+
+
+def _run_command(root: click.Context, group: click.Group, obj: ContextObject, words: List[str]) -> None:
+    """Run one command line of the shell as a subcommand of the nessie command with the shell's context object."""
+    try:
+        name, command, args = group.resolve_command(root, words)
+        if name in _EXCLUDED_COMMANDS or command is None:
+            raise click.UsageError(f"{name!r} is not available in the shell")
+        with command.make_context(name, args, parent=root, obj=obj) as command_ctx:
+            command.invoke(command_ctx)
+    except click.ClickException as e:
+        e.show()
+    except click.exceptions.Exit:
+        # e.g. after --help
+        pass
+    except click.Abort:
+        click.echo("Aborted!", err=True)
+    except SystemExit:
+        # the commands exit after printing an error, the shell carries on
+        pass
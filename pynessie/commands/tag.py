@@ -107,9 +107,6 @@ def tag(
         fetch_all,
         expected_hash,
     )
-    if ctx.json:
-        click.echo(results)
-    elif results:
-        click.echo(results)
-    else:
-        click.echo()
+    for chunk in results:
+        click.echo(chunk, nl=False)
+    click.echo()
@@ -15,28 +15,79 @@
 """Parser for confuse Configuration object."""
 
 import os
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 import confuse
 
+_DEFAULT_CONFIG_FILE = os.path.join(os.path.dirname(__file__), confuse.DEFAULT_FILENAME)
+
+# parsed YAML files by path with the modification time and size they had when they were parsed
+_PARSED_FILES: Dict[str, Tuple[Optional[Tuple[int, int]], confuse.YamlSource]] = {}
+
+# config keys that are read as integers and therefore have to be converted when they come from the environment
+_INT_ARGS = {
+    "auth.timeout",
+    "http.pool.connections",
+    "http.pool.maxsize",
+    "http.pool.keepalive",
+    "http.retry.attempts",
+    "http.retry.backoff",
+    "http.retry.maxbackoff",
+    "cache.content.maxsize",
+    "cache.reference.ttl",
+    "cache.disk.maxbytes",
+}
+
 
 def _get_env_args() -> dict:
     args = {}
-    for k, v in os.environ.items():
+    # only the values of the NESSIE_ variables are looked up, decoding all values was the largest cost after parsing the files
+    for k in os.environ:
         if "NESSIE_" in k and k != "NESSIE_CLIENTDIR":
+            v = os.environ[k]
             name = k.replace("NESSIE_", "").lower().replace("_", ".")
-            if name == "auth.timeout":
+            if name in _INT_ARGS:
                 v = int(v)  # type: ignore
             args[name] = v
     return args
 
 
 def build_config(args: Optional[dict] = None) -> confuse.Configuration:
-    """Build configuration object from input params, env variables and yaml file."""
-    config = confuse.Configuration("nessie", __name__)
+    """Build configuration object from input params, env variables and yaml file.
+
+    The YAML files are parsed once and shared by all configurations built while the files are unchanged, so building
+    a configuration is cheap. Every configuration is a separate view of these files, values set on one affect no other.
+    """
+    config = confuse.Configuration("nessie", __name__, read=False)
+    config.add(_parsed_file(config.user_config_path(), default=False))
+    config.add(_parsed_file(_DEFAULT_CONFIG_FILE, default=True))
     env_args = _get_env_args()
     config.set_args(env_args, dots=True)
     if args:
         config.set_args(args, dots=True)
     config["auth"]["password"].redact = True
     return config
+
+
+def _parsed_file(path: str, default: bool) -> confuse.YamlSource:
+    """Return the parsed YAML file at 'path', parsing it again only if it changed since it was last parsed."""
+    try:
+        status = os.stat(path)
+        version: Optional[Tuple[int, int]] = (status.st_mtime_ns, status.st_size)
+    except OSError:
+        version = None
+    parsed = _PARSED_FILES.get(path)
+    if parsed is not None and parsed[0] == version:
+        return parsed[1]
+    # confuse never changes a source once it is part of a configuration, so one source can be shared by all of them
+    source = confuse.YamlSource(path, optional=True, default=default)
+    _PARSED_FILES[path] = (version, source)
+    return source
+
+
+def forget_parsed_files(*paths: str) -> None:
+    """Parse the given YAML files, or all files if no path is given, again when they are next read, e.g. after writing them."""
+    if not paths:
+        _PARSED_FILES.clear()
+    for path in paths:
+        _PARSED_FILES.pop(path, None)
@@ -18,9 +18,13 @@ import os
 
 import confuse
 
+from pynessie.conf.config_parser import forget_parsed_files
+
 
 def write_to_file(config: confuse.Configuration) -> None:
     """Write updated config to file."""
     config_filename = os.path.join(config.config_dir(), confuse.CONFIG_FILENAME)
     with open(config_filename, "w", encoding="UTF-8") as f:
         f.write(config.dump())
+    # the file may be rewritten within the resolution of its modification time, with the same size
+    forget_parsed_files(config_filename)
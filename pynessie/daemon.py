@@ -0,0 +1,341 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Resident process that runs CLI commands with warm clients, started via 'nessie daemon start'.
+
+The 'nessie' script forwards its command line, environment and stdin over a Unix socket to a running daemon, which
+keeps one NessieClient with its connection pool and caches per configuration and sends the output back while the
+command runs. Without a daemon the script runs the command in-process. Only the forwarding side is imported by the
+script, the client is imported when serving.
+
+A command runs with the environment, stdin, stdout and stderr of the script that forwarded it, which are process-wide,
+so the daemon runs one command at a time: a long command, or a script that reads its output slowly, delays the
+commands of all other scripts until it is done.
+"""
+
+import io
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+import time
+import traceback
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, List, Optional, Tuple
+
+import click
+
+if TYPE_CHECKING:
+    from pynessie.client import NessieClient
+
+# every message is one length-prefixed frame
+_FRAME = struct.Struct("!Q")
+# the first byte of each reply frame tells whether it holds stdout, stderr or, as the last frame, the exit status
+_STDOUT, _STDERR, _EXIT = b"o", b"e", b"x"
+# stdout is sent in chunks of this size while the command runs, like the output of a command writing to a pipe
+_STDOUT_BUFFER_BYTES = 64 * 1024
+# environment variables that select the configuration, the credentials or the transport of a client
+_CLIENT_ENV_PREFIXES = ("NESSIE_", "AWS_", "REQUESTS_", "CURL_", "HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY")
+# clients of configurations that are no longer used are closed once there are more than this many
+_MAX_CLIENTS = 16
+
+
+def socket_path() -> str:
+    """Return the socket of the daemon, NESSIE_DAEMON_SOCKET or a per-user socket in XDG_RUNTIME_DIR or the temp directory."""
+    path = os.environ.get("NESSIE_DAEMON_SOCKET")
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir:
+        import tempfile  # pylint: disable=C0415
+
+        runtime_dir = tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"nessie-{os.getuid()}.sock")
+
+
+def forward(
+    args: List[str], stdin: bytes = b"", path: Optional[str] = None, out: Optional[BinaryIO] = None, err: Optional[BinaryIO] = None
+) -> Optional[int]:
+    """Run a command line of the 'nessie' script in the running daemon, writing its output as it arrives.
+
+    :param args: the arguments of the 'nessie' script
+    :param stdin: the input of the command
+    :param path: the socket of the daemon, socket_path() by default
+    :param out: where to write the stdout of the command, the binary stdout by default
+    :param err: where to write the stderr of the command, the binary stderr by default
+    :return: the exit code of the command, None if no daemon is running
+    """
+    if out is None:
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+    if err is None:
+        sys.stderr.flush()
+        err = sys.stderr.buffer
+    status = _request({"argv": args, "env": dict(os.environ)}, stdin, path, {_STDOUT: out, _STDERR: err})
+    return int(status["exit_code"]) if status is not None else None
+
+
+def daemon_status(path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Return the pid, uptime and counters of the running daemon, None if no daemon is running."""
+    return _request({"control": "status"}, b"", path, {})
+
+
+def stop_daemon(path: Optional[str] = None) -> bool:
+    """Stop the running daemon after the command it is running, return whether a daemon was running."""
+    return _request({"control": "stop"}, b"", path, {}) is not None
+
+
+def _request(message: Dict[str, Any], payload: bytes, path: Optional[str], streams: Dict[bytes, BinaryIO]) -> Optional[Dict[str, Any]]:
+    """Send a request, write the output frames of the reply to 'streams' and return its exit status."""
+    sock = _connect(path or socket_path())
+    if sock is None:
+        return None
+    with sock:
+        _send(sock, json.dumps(message).encode("utf-8"))
+        _send(sock, payload)
+        while True:
+            frame = _receive(sock)
+            channel, data = frame[:1], frame[1:]
+            if channel == _EXIT:
+                return json.loads(data)
+            stream = streams.get(channel)
+            if stream is not None:
+                stream.write(data)
+                stream.flush()
+
+
+def _connect(path: str) -> Optional[socket.socket]:
+    """Connect to the daemon at 'path', None if no daemon of the current user listens there."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    # the socket may live in a shared directory, never send the environment to a socket of another user
+    if not _is_own_socket(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _is_own_socket(path: str) -> bool:
+    try:
+        status = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(status.st_mode) and status.st_uid == os.getuid()
+
+
+def _send(sock: socket.socket, data: bytes) -> None:
+    # one write per frame, the peer may have read an empty frame and closed the connection before a second write
+    sock.sendall(_FRAME.pack(len(data)) + data)
+
+
+def _receive(sock: socket.socket) -> bytes:
+    (size,) = _FRAME.unpack(_receive_exactly(sock, _FRAME.size))
+    return _receive_exactly(sock, size)
+
+
+def _receive_exactly(sock: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(min(size - len(data), 1 << 20))
+        if not chunk:
+            raise ConnectionError("The nessie daemon closed the connection in the middle of a message")
+        data += chunk
+    return bytes(data)
+
+
+class ClientPool:
+    """The clients of a daemon, one per configuration, shared by all commands that run with the same configuration.
+
+    A configuration consists of the command line options of the 'nessie' group, the environment variables that
+    configure a client and the config file, a changed config file replaces the client of its configurations.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty pool."""
+        self._clients: Dict[Tuple, Tuple["NessieClient", str, Optional[float]]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of pooled clients."""
+        return len(self._clients)
+
+    def client(self, args: Dict[str, Any]) -> "NessieClient":
+        """Return the client for the configuration 'args' and the current environment, creating it on first use."""
+        # pylint: disable=C0415
+        from pynessie.client import NessieClient
+        from pynessie.conf import build_config
+
+        env = tuple(sorted((k, v) for k, v in os.environ.items() if k.upper().startswith(_CLIENT_ENV_PREFIXES)))
+        key = (tuple(sorted(args.items())), env)
+        pooled = self._clients.pop(key, None)
+        if pooled is not None:
+            client, config_file, modified = pooled
+            if _modified(config_file) == modified:
+                self._clients[key] = pooled
+                return client
+            client.close()
+        config = build_config(args)
+        config_file = config.user_config_path()
+        modified = _modified(config_file)
+        client = NessieClient(config)
+        self._clients[key] = (client, config_file, modified)
+        while len(self._clients) > _MAX_CLIENTS:
+            self._clients.pop(next(iter(self._clients)))[0].close()
+        return client
+
+    def close(self) -> None:
+        """Close all pooled clients."""
+        for client, _, _ in self._clients.values():
+            client.close()
+        self._clients.clear()
+
+
+def _modified(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def serve(path: str, command: click.Command, idle_timeout: Optional[float] = None) -> None:
+    """Run the forwarded commands one at a time until the daemon is stopped or was idle for 'idle_timeout' seconds.
+
+    :param path: the Unix socket to listen on, a stale socket of a previous daemon is replaced
+    :raises click.ClickException: if something else than a socket of the current user exists at 'path'
+    :param command: the 'nessie' command group that runs the forwarded command lines
+    :param idle_timeout: seconds without commands after which the daemon stops, None to run until stopped
+    """
+    server = _bind(path)
+    clients = ClientPool()
+    state: Dict[str, Any] = {"pid": os.getpid(), "socket": path, "started": time.time(), "commands": 0}
+    try:
+        server.listen()
+        server.settimeout(idle_timeout)
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                return
+            with conn:
+                try:
+                    stop = _handle(conn, command, state, clients)
+                except (OSError, ValueError):
+                    # a client that went away or sent garbage must not stop the daemon
+                    continue
+            if stop:
+                return
+    finally:
+        server.close()
+        if _is_own_socket(path):
+            os.unlink(path)
+        clients.close()
+
+
+def _bind(path: str) -> socket.socket:
+    if os.path.lexists(path):
+        # only a stale socket of the current user is replaced, never a file, a link or the socket of another user
+        if not _is_own_socket(path):
+            raise click.ClickException(f"{path} exists and is not a socket of the current user")
+        os.unlink(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # only the current user may connect, the socket is created without any permissions for others
+    umask = os.umask(0o177)
+    try:
+        server.bind(path)
+    except OSError:
+        server.close()
+        raise
+    finally:
+        os.umask(umask)
+    return server
+
+
+def _handle(conn: socket.socket, command: click.Command, state: Dict[str, Any], clients: ClientPool) -> bool:
+    """Answer one request, return whether it asked the daemon to stop."""
+    conn.settimeout(None)
+    message = json.loads(_receive(conn))
+    stdin = _receive(conn)
+    status: Dict[str, Any] = {"exit_code": 0}
+    if "argv" in message:
+        status["exit_code"] = _run(command, message["argv"], message["env"], stdin, clients, conn)
+        state["commands"] += 1
+    elif message.get("control") == "status":
+        status.update(state, uptime=time.time() - state["started"], clients=len(clients))
+    _send(conn, _EXIT + json.dumps(status).encode("utf-8"))
+    return message.get("control") == "stop"
+
+
+class _FrameWriter(io.RawIOBase):
+    """Sends everything written to it as frames of one channel of a reply."""
+
+    def __init__(self, conn: socket.socket, channel: bytes) -> None:
+        super().__init__()
+        self._conn = conn
+        self._channel = channel
+        self._broken = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        if not self._broken:
+            try:
+                _send(self._conn, self._channel + bytes(data))
+            except OSError:
+                # the script went away, e.g. its output was piped into 'head', the rest of the output is dropped
+                self._broken = True
+        return len(data)
+
+
+def _run(  # pylint: disable=R0913
+    command: click.Command, argv: List[str], env: Dict[str, str], stdin: bytes, clients: ClientPool, conn: socket.socket
+) -> int:
+    """Run the 'nessie' command line 'argv' in the environment 'env', send its output over 'conn', return its exit code."""
+    saved_streams = sys.stdin, sys.stdout, sys.stderr
+    saved_env = dict(os.environ)
+    sys.stdin = io.TextIOWrapper(io.BytesIO(stdin), encoding="utf-8")
+    sys.stdout = io.TextIOWrapper(io.BufferedWriter(_FrameWriter(conn, _STDOUT), _STDOUT_BUFFER_BYTES), encoding="utf-8")
+    sys.stderr = io.TextIOWrapper(_FrameWriter(conn, _STDERR), encoding="utf-8", write_through=True)  # type: ignore[arg-type]
+    os.environ.clear()
+    os.environ.update(env)
+    exit_code = 0
+    try:
+        command.main(argv, prog_name="nessie", obj=clients)
+    except SystemExit as e:
+        exit_code = _exit_code(e.code)
+    except Exception:  # pylint: disable=W0703
+        # the same output and exit code as an uncaught error of the in-process command
+        traceback.print_exc()
+        exit_code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        sys.stdin, sys.stdout, sys.stderr = saved_streams
+        os.environ.clear()
+        os.environ.update(saved_env)
+    return exit_code
+
+
+def _exit_code(code: Any) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
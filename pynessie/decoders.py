@@ -0,0 +1,279 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Fast decoding of server responses into the attrs classes of pynessie.model.
+
+The marshmallow schemas in pynessie.model validate every field through several layers of indirection, which costs
+more than the network for large log pages. For every schema this module builds a loader once: a table of per-field
+converters that produce the same objects for valid documents. Types that are already right are taken as is, other
+values are converted by the marshmallow field itself. Documents that a loader cannot decode, e.g. because of unknown
+or invalid fields, are passed to a cached instance of the marshmallow schema, so errors are reported exactly as before.
+
+    ref = load(ReferenceSchema, ref_json)  # same as ReferenceSchema().load(ref_json)
+
+Log entries can also be decoded lazily: LazyLogEntry and LazyCommitMeta keep the server's JSON and decode each field
+on first access, so scanning many commits for their hashes never decodes operations, contents or timestamps.
+"""
+
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeGuard, TypeVar, Union
+
+import attr
+from marshmallow import Schema, ValidationError, fields
+from marshmallow_oneofschema import OneOfSchema
+
+from pynessie import model
+
+Loader = Callable[[Any], Any]
+_Converter = Callable[[Any], Any]
+_F = TypeVar("_F", bound=fields.Field)
+
+
+class _NotDecodable(Exception):
+    """Raised by a loader for documents that must be decoded by the marshmallow schema."""
+
+
+# desert names every generated schema class after the attrs class it loads
+_MODEL_CLASSES: Dict[str, type] = {name: cls for name, cls in vars(model).items() if isinstance(cls, type) and attr.has(cls)}
+
+
+def load(schema: Union[Type[Schema], Schema], data: Any) -> Any:
+    """Decode a JSON document with the loader of 'schema', producing the same object as the marshmallow schema."""
+    return loader(schema if isinstance(schema, type) else type(schema))(data)
+
+
+@lru_cache(maxsize=None)
+def schema_instance(schema: Type[Schema]) -> Schema:
+    """Return a shared instance of a schema class, marshmallow schemas hold no state between loads."""
+    return schema()
+
+
+@lru_cache(maxsize=None)
+def loader(schema: Type[Schema]) -> Loader:
+    """Return the loader for a schema class, building it on first use."""
+    decode = _build(schema, None)
+
+    def load_or_fall_back(data: Any) -> Any:
+        try:
+            return decode(data)
+        except (_NotDecodable, ValidationError, KeyError, TypeError, ValueError):
+            return schema_instance(schema).load(data)
+
+    load_or_fall_back.__name__ = f"load_{schema.__name__}"
+    return load_or_fall_back
+
+
+def _build(schema: Type[Schema], skip: Optional[str], overrides: Optional[Dict[str, _Converter]] = None) -> Loader:
+    if issubclass(schema, OneOfSchema):
+        return _one_of(schema)
+    cls = _MODEL_CLASSES[schema.__name__]
+    converters: Dict[str, Tuple[str, _Converter]] = {}
+    for name, field in schema_instance(schema).fields.items():
+        convert = overrides[name] if overrides and name in overrides else _converter(field)
+        converters[field.data_key or name] = (field.attribute or name, convert)
+
+    def decode(data: Any) -> Any:
+        if not isinstance(data, dict):
+            raise _NotDecodable()
+        kwargs = {}
+        for key, value in data.items():
+            converter = converters.get(key)
+            if converter is None:
+                if key == skip:
+                    continue
+                raise _NotDecodable()
+            kwargs[converter[0]] = converter[1](value)
+        return cls(**kwargs)
+
+    return decode
+
+
+def _one_of(schema: Type[OneOfSchema]) -> Loader:
+    type_field = schema.type_field
+    decoders: Dict[Any, Loader] = {
+        name: _build(sub_schema if isinstance(sub_schema, type) else type(sub_schema), type_field)
+        for name, sub_schema in schema.type_schemas.items()
+    }
+
+    def decode(data: Any) -> Any:
+        if not isinstance(data, dict):
+            raise _NotDecodable()
+        decoder = decoders.get(data.get(type_field))
+        if decoder is None:
+            raise _NotDecodable()
+        return decoder(data)
+
+    return decode
+
+
+def _converter(field: fields.Field) -> _Converter:
+    convert = _value_converter(field)
+    allow_none = field.allow_none
+
+    def convert_or_none(value: Any) -> Any:
+        if value is None:
+            if allow_none:
+                return None
+            raise _NotDecodable()
+        return convert(value)
+
+    return convert_or_none
+
+
+def _value_converter(field: fields.Field) -> _Converter:
+    if field.validators:
+        return field.deserialize
+    if _is(field, fields.Nested) and not (field.many or field.only or field.exclude or field.unknown):
+        nested = field.nested
+        return _build(nested if isinstance(nested, type) else type(nested), None)
+    if _is(field, fields.List):
+        convert_item = _converter(field.inner)
+
+        def convert_list(value: Any) -> Any:
+            if not isinstance(value, list):
+                raise _NotDecodable()
+            return [convert_item(item) for item in value]
+
+        return convert_list
+    if field.__class__ in _TYPED_FIELDS:
+        return _typed(_TYPED_FIELDS[field.__class__], field)
+    if _is(field, fields.Dict) and field.key_field is None and field.value_field is None:
+        return _typed(dict, field)
+    if _is(field, fields.DateTime) and field.format in (None, "iso"):
+        return _iso_datetime(field)
+    return field.deserialize
+
+
+def _is(field: fields.Field, field_class: Type[_F]) -> TypeGuard[_F]:
+    # exact classes only, subclasses of marshmallow fields may deserialize differently
+    return field.__class__ is field_class
+
+
+_TYPED_FIELDS: Dict[type, type] = {fields.String: str, fields.Integer: int, fields.Boolean: bool}
+
+
+def _typed(value_type: type, field: fields.Field) -> _Converter:
+    def convert(value: Any) -> Any:
+        # exact types only, marshmallow rejects booleans for integer fields
+        return value if value.__class__ is value_type else field.deserialize(value)
+
+    return convert
+
+
+# the RFC 3339 timestamps of the server, fromisoformat also accepts forms that marshmallow rejects, e.g. "00:00:00,5"
+_RFC_3339 = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}(\.[0-9]+)?(Z|[+-][0-9]{2}:?[0-9]{2})?")
+
+
+def _iso_datetime(field: fields.Field) -> _Converter:
+    def convert(value: Any) -> Any:
+        # other forms take the marshmallow path
+        if isinstance(value, str) and _RFC_3339.fullmatch(value):
+            try:
+                return datetime.fromisoformat(value)
+            except ValueError:
+                pass
+        return field.deserialize(value)
+
+    return convert
+
+
+class _LazyField:
+    """Data descriptor that decodes one field from the raw JSON of its object on first access."""
+
+    def __init__(self, key: str, field: fields.Field, convert: _Converter, default: Any) -> None:
+        self._key = key
+        self._field = field
+        self._convert = convert
+        self._default = default
+        self._name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        values = obj.__dict__
+        if self._name not in values:
+            raw = values["_raw"]
+            if self._key not in raw:
+                values[self._name] = self._default
+            else:
+                try:
+                    values[self._name] = self._convert(raw[self._key])
+                except (_NotDecodable, KeyError, TypeError, ValueError):
+                    # let marshmallow report the invalid value
+                    values[self._name] = self._field.deserialize(raw[self._key])
+        return values[self._name]
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        obj.__dict__[self._name] = value
+
+
+def _lazy_class(schema: Type[Schema], overrides: Optional[Dict[str, _Converter]] = None) -> type:
+    """Create a subclass of the attrs class of 'schema' whose instances are created from raw JSON and decode lazily."""
+    cls = _MODEL_CLASSES[schema.__name__]
+    attributes = attr.fields_dict(cls)
+    required = set()
+    namespace: Dict[str, Any] = {}
+    for name, field in schema_instance(schema).fields.items():
+        key = field.data_key or name
+        default = attributes[name].default
+        if default is attr.NOTHING:
+            required.add(key)
+        convert = overrides[name] if overrides and name in overrides else _converter(field)
+        namespace[name] = _LazyField(key, field, convert, None if default is attr.NOTHING else default)
+
+    def __init__(self: Any, raw: dict) -> None:  # noqa: N807
+        if not isinstance(raw, dict) or not required.issubset(raw):
+            raise _NotDecodable()
+        self.__dict__["_raw"] = raw
+
+    def __eq__(self: Any, other: Any) -> bool:  # noqa: N807
+        # equal to eagerly decoded objects with the same values
+        if not isinstance(other, cls):
+            return NotImplemented
+        return all(getattr(self, a.name) == getattr(other, a.name) for a in attr.fields(cls))
+
+    namespace.update(
+        __init__=__init__,
+        __eq__=__eq__,
+        __hash__=None,
+        __doc__=f"{cls.__name__} that decodes its fields from the server's JSON on first access.",
+        __module__=__name__,
+    )
+    return type(f"Lazy{cls.__name__}", (cls,), namespace)
+
+
+LazyCommitMeta = _lazy_class(model.CommitMetaSchema)
+LazyLogEntry = _lazy_class(model.LogEntrySchema, {"commit_meta": LazyCommitMeta})
+
+
+def _lazy_entries(value: Any) -> Any:
+    if not isinstance(value, list):
+        raise _NotDecodable()
+    return [LazyLogEntry(entry) for entry in value]
+
+
+_load_log_lazily = _build(model.LogResponseSchema, None, {"log_entries": _lazy_entries})
+
+
+def load_log_lazily(data: Any) -> model.LogResponse:
+    """Decode a log response into LazyLogEntry objects, falling back to eager decoding for invalid responses."""
+    try:
+        return _load_log_lazily(data)
+    except (_NotDecodable, ValidationError, KeyError, TypeError, ValueError):
+        return load(model.LogResponseSchema, data)
@@ -0,0 +1,146 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Fast encoding of the attrs classes of pynessie.model into JSON documents, the counterpart of pynessie.decoders.
+
+Dumping a large commit through the marshmallow schemas costs far more than serializing the resulting document. For
+every schema this module builds a dumper once: a table of per-field converters that produce the same document as the
+marshmallow schema. Values of the expected types are taken as is, other values are converted by the marshmallow field
+itself. Objects that a dumper cannot encode, e.g. of an unknown class, are passed to the marshmallow schema, so errors
+are reported exactly as before.
+
+    body = dump(MultiContentSchema, contents)  # same as MultiContentSchema().dump(contents)
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple, Type, Union, cast
+
+from marshmallow import Schema, fields
+from marshmallow_oneofschema import OneOfSchema
+
+from pynessie.decoders import _MODEL_CLASSES, _is, schema_instance
+
+Dumper = Callable[[Any], Any]
+_Converter = Callable[[Any], Any]
+
+
+class _NotEncodable(Exception):
+    """Raised by a dumper for objects that must be encoded by the marshmallow schema."""
+
+
+def dump(schema: Union[Type[Schema], Schema], obj: Any) -> Any:
+    """Encode an object with the dumper of 'schema', producing the same document as the marshmallow schema."""
+    return dumper(schema if isinstance(schema, type) else type(schema))(obj)
+
+
+@lru_cache(maxsize=None)
+def dumper(schema: Type[Schema]) -> Dumper:
+    """Return the dumper for a schema class, building it on first use."""
+    encode = _build(schema)
+
+    def dump_or_fall_back(obj: Any) -> Any:
+        try:
+            return encode(obj)
+        except (_NotEncodable, AttributeError, KeyError, TypeError, ValueError):
+            return schema_instance(schema).dump(obj)
+
+    dump_or_fall_back.__name__ = f"dump_{schema.__name__}"
+    return dump_or_fall_back
+
+
+def _build(schema: Type[Schema]) -> Dumper:
+    if issubclass(schema, OneOfSchema):
+        return _one_of(schema)
+    cls = _MODEL_CLASSES[schema.__name__]
+    converters: List[Tuple[str, str, _Converter]] = [
+        (field.attribute or name, name if field.data_key is None else field.data_key, _converter(field))
+        for name, field in schema_instance(schema).dump_fields.items()
+    ]
+
+    def encode(obj: Any) -> Any:
+        if not isinstance(obj, cls):
+            raise _NotEncodable()
+        return {key: convert(getattr(obj, attribute)) for attribute, key, convert in converters}
+
+    return encode
+
+
+def _one_of(schema: Type[OneOfSchema]) -> Dumper:
+    type_field = schema.type_field
+    get_obj_type = cast(OneOfSchema, schema_instance(schema)).get_obj_type
+    encoders: Dict[Any, Dumper] = {
+        name: _build(sub_schema if isinstance(sub_schema, type) else type(sub_schema)) for name, sub_schema in schema.type_schemas.items()
+    }
+
+    def encode(obj: Any) -> Any:
+        obj_type = get_obj_type(obj)
+        document = encoders[obj_type](obj)
+        # like OneOfSchema, the type comes after the fields of the object
+        document[type_field] = obj_type
+        return document
+
+    return encode
+
+
+def _converter(field: fields.Field) -> _Converter:
+    convert = _value_converter(field)
+
+    def convert_or_none(value: Any) -> Any:
+        # every marshmallow field dumps None as None
+        return None if value is None else convert(value)
+
+    return convert_or_none
+
+
+def _value_converter(field: fields.Field) -> _Converter:
+    if _is(field, fields.Nested) and not (field.many or field.only or field.exclude):
+        nested = field.nested
+        return _build(nested if isinstance(nested, type) else type(nested))
+    if _is(field, fields.List):
+        convert_item = _converter(field.inner)
+
+        def convert_list(value: Any) -> Any:
+            if not isinstance(value, (list, tuple)):
+                raise _NotEncodable()
+            return [convert_item(item) for item in value]
+
+        return convert_list
+    if field.__class__ in _TYPED_FIELDS and not getattr(field, "as_string", False):
+        return _typed(_TYPED_FIELDS[field.__class__], field)
+    if _is(field, fields.Dict) and field.key_field is None and field.value_field is None:
+        return dict
+    if _is(field, fields.DateTime) and field.format in (None, "iso"):
+        return _typed(datetime, field, datetime.isoformat)
+    return _serialized(field)
+
+
+_TYPED_FIELDS: Dict[type, type] = {fields.String: str, fields.Integer: int, fields.Boolean: bool}
+
+
+def _typed(value_type: type, field: fields.Field, convert: _Converter = lambda value: value) -> _Converter:
+    serialize = _serialized(field)
+
+    def convert_typed(value: Any) -> Any:
+        # exact types only, marshmallow converts e.g. integer subclasses and datetime subclasses its own way
+        return convert(value) if value.__class__ is value_type else serialize(value)
+
+    return convert_typed
+
+
+def _serialized(field: fields.Field) -> _Converter:
+    def serialize(value: Any) -> Any:
+        return field.serialize("value", {"value": value})
+
+    return serialize
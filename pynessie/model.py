@@ -15,8 +15,9 @@
 """Nessie Data objects."""
 
 import re
+import sys
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
 
 import attr
 import desert
@@ -49,6 +50,11 @@ def is_valid_hash(ref: str) -> bool:
     return __RE_HASH.match(ref) is not None
 
 
+def _interned(elements: Iterable[str]) -> Tuple[str, ...]:
+    """Convert key elements to a tuple of interned strings, so that all keys in a namespace share its element strings."""
+    return tuple(sys.intern(e) if e.__class__ is str else e for e in elements)
+
+
 def split_into_reference_and_hash(ref_with_hash: Optional[str]) -> Tuple[str, Optional[str]]:
     """Returns a tuple of reference-name + hash, if the given string represents a ref-name + hash tuple 'ref_name@commit_id'."""
     if not ref_with_hash:
@@ -173,11 +179,11 @@ class ContentSchema(OneOfSchema):
         raise ValueError("Unknown object type: {}".format(obj.__class__.__name__))
 
 
-@attr.dataclass
+@attr.s(auto_attribs=True, slots=True, frozen=True)
 class ContentKey:
-    """ContentKey."""
+    """ContentKey, immutable and hashable, its elements are an interned tuple of strings."""
 
-    elements: List[str] = desert.ib(fields.List(fields.Str))
+    elements: Tuple[str, ...] = attr.ib(converter=_interned, metadata=desert.metadata(fields.List(fields.Str)))
 
     def to_string(self) -> str:
         """Convert this key to friendly CLI string."""
@@ -215,6 +221,37 @@ class ContentKey:
 ContentKeySchema = desert.schema_class(ContentKey)
 
 
+@attr.dataclass
+class ContentWithKey:
+    """Dataclass for a content together with its key."""
+
+    key: ContentKey = desert.ib(fields.Nested(ContentKeySchema))
+    content: Content = desert.ib(fields.Nested(ContentSchema))
+
+
+ContentWithKeySchema = desert.schema_class(ContentWithKey)
+
+
+@attr.dataclass
+class GetMultipleContentsRequest:
+    """Dataclass for the keys requested in one multi-content fetch."""
+
+    requested_keys: List[ContentKey] = desert.ib(fields.List(fields.Nested(ContentKeySchema), data_key="requestedKeys"))
+
+
+GetMultipleContentsRequestSchema = desert.schema_class(GetMultipleContentsRequest)
+
+
+@attr.dataclass
+class GetMultipleContentsResponse:
+    """Dataclass for the response of a multi-content fetch, keys without content are omitted."""
+
+    contents: List[ContentWithKey] = desert.ib(fields.List(fields.Nested(ContentWithKeySchema)))
+
+
+GetMultipleContentsResponseSchema = desert.schema_class(GetMultipleContentsResponse)
+
+
 @attr.dataclass
 class Operation:
     """Single Commit Operation."""
@@ -289,9 +326,13 @@ class OperationsSchema(OneOfSchema):
         raise ValueError("Unknown object type: {}".format(obj.__class__.__name__))
 
 
-@attr.dataclass
-class CommitMeta:
-    """Dataclass for commit metadata."""
+# slotted, pylint checks the camelCase field names of the API as instance attribute names
+@attr.s(auto_attribs=True, slots=True)
+class CommitMeta:  # pylint: disable=C0103
+    """Dataclass for commit metadata.
+
+    Unlike the keys it is not frozen, the commit paths set the author of the given meta before sending it.
+    """
 
     hash_: str = attr.ib(default=None, metadata=desert.metadata(fields.Str(data_key="hash")))
     commitTime: datetime = attr.ib(default=None, metadata=desert.metadata(fields.DateTime()))
@@ -394,19 +435,19 @@ class ReferencesResponse:
 ReferencesResponseSchema = desert.schema_class(ReferencesResponse)
 
 
-@attr.dataclass
+@attr.s(auto_attribs=True, slots=True, frozen=True)
 class EntryName:
-    """Dataclass for Nessie Entry Name."""
+    """Dataclass for Nessie Entry Name, immutable and hashable, its elements are an interned tuple of strings."""
 
-    elements: List[str] = desert.ib(fields.List(fields.Str()))
+    elements: Tuple[str, ...] = attr.ib(converter=_interned, metadata=desert.metadata(fields.List(fields.Str())))
 
 
 EntryNameSchema = desert.schema_class(EntryName)
 
 
-@attr.dataclass
+@attr.s(auto_attribs=True, slots=True, frozen=True)
 class Entry:
-    """Dataclass for Nessie Entry."""
+    """Dataclass for Nessie Entry, immutable and hashable."""
 
     kind: str = desert.ib(fields.Str(data_key="type"))
     name: EntryName = desert.ib(fields.Nested(EntryNameSchema))
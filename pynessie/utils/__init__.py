@@ -18,11 +18,13 @@
 from pynessie.utils.expression_util import (
     build_filter_for_commit_log_flags,
     build_filter_for_contents_listing_flags,
+    build_filter_for_references_listing,
     parse_to_iso8601,
 )
 
 __all__ = [
     "build_filter_for_commit_log_flags",
     "build_filter_for_contents_listing_flags",
+    "build_filter_for_references_listing",
     "parse_to_iso8601",
 ]
@@ -54,6 +54,14 @@ def build_filter_for_contents_listing_flags(query_filter: str, types: List[str])
     return None
 
 
+def build_filter_for_references_listing(is_branch: bool, ref_name: Optional[str]) -> str:
+    """Produces a CEL expression to be used for filtering the references by type and, optionally, by name."""
+    expressions = ["refType=='{}'".format("BRANCH" if is_branch else "TAG")]
+    if ref_name:
+        expressions.append("ref.name=='{}'".format(ref_name))
+    return _and_join(expressions)
+
+
 def _expression_for_commit_log_by_author(authors: List[str]) -> str:
     return __generate_expression(authors, "commit.author=='{}'")
 
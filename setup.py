@@ -57,10 +57,15 @@ setup(
     description="Project Nessie: Transactional Catalog for Data Lakes with Git-like semantics",
     entry_points={
         "console_scripts": [
-            "nessie=pynessie.cli:cli",
+            "nessie=pynessie.cli:main",
         ],
     },
     install_requires=requirements,
+    extras_require={
+        "async": ["httpx"],  # non-blocking transport of AsyncNessieClient
+        "arrow": ["pyarrow"],  # columnar export of log, entries and diff pages
+        "orjson": ["orjson"],  # faster encoding and decoding of request and response bodies
+    },
     license="Apache Software License 2.0",
     long_description=readme + "\n" + history,
     include_package_data=True,
@@ -17,7 +17,7 @@
 import os
 import shutil
 import tempfile
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 import attr
 import pytest
@@ -29,6 +29,8 @@ from testcontainers.core.wait_strategies import HttpWaitStrategy
 from pynessie import cli
 from pynessie.model import Content, ContentSchema, ReferenceSchema
 
+from .fake_server import FakeNessieServer
+
 
 class NessieContainer(DockerContainer):
     """Nessie test container."""
@@ -103,6 +105,15 @@ def pytest_runtest_teardown(item: pytest.Item, nextitem: Optional[pytest.Item])
         reset_nessie_server_state()
 
 
+@pytest.fixture
+def fake_server() -> Iterator[FakeNessieServer]:
+    """Provide a running in-process fake Nessie server."""
+    server = FakeNessieServer()
+    server.start()
+    yield server
+    server.stop()
+
+
 def execute_cli_command_raw(args: List[str], input_data: Optional[str] = None, ret_val: int = 0) -> Result:
     """Execute a Nessie CLI command."""
     result = CliRunner().invoke(cli.cli, args, input=input_data)
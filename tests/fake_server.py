@@ -0,0 +1,130 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""In-process fake Nessie HTTP server for tests that do not need a real Nessie container."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import attr
+
+
+@attr.dataclass
+class RecordedRequest:
+    """A request received by the fake server."""
+
+    method: str
+    path: str
+    params: Dict[str, str]
+    body: Any
+    client_port: int
+    headers: Dict[str, str]
+
+
+Response = Union[Tuple[int, Any], Tuple[int, Any, Dict[str, str]]]
+Handler = Callable[[RecordedRequest], Response]
+
+
+class FakeNessieServer:
+    """Serves canned JSON responses for registered (method, path) routes and records all requests.
+
+    Paths are registered relative to the API root, e.g. ``server.add_route("GET", "/trees/tree/main", (200, {...}))``.
+    """
+
+    API_ROOT = "/api/v1"
+
+    def __init__(self) -> None:
+        """Create a server listening on a random local port, call start() to serve requests."""
+        self.routes: Dict[Tuple[str, str], Handler] = {}
+        self.requests: List[RecordedRequest] = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Nessie API URL of this server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host!s}:{port}{FakeNessieServer.API_ROOT}"
+
+    def add_route(self, method: str, path: str, response: Union[Response, Handler]) -> None:
+        """Register a static (status, json_body[, headers]) response or a handler callable for a route."""
+        self.routes[(method, path)] = response if callable(response) else (lambda _, r=response: r)  # type: ignore[misc]
+
+    def requests_to(self, method: str, path: str) -> List[RecordedRequest]:
+        """Return all recorded requests for the given route."""
+        with self._lock:
+            return [r for r in self.requests if r.method == method and r.path == path]
+
+    def client_ports(self) -> set:
+        """Return the distinct client ports, i.e. TCP connections, seen by this server."""
+        with self._lock:
+            return {r.client_port for r in self.requests}
+
+    def start(self) -> None:
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def handle(self, request: RecordedRequest) -> Response:
+        """Record the request and produce the registered response for it."""
+        with self._lock:
+            self.requests.append(request)
+        handler = self.routes.get((request.method, request.path))
+        if handler is None:
+            return 404, {"message": f"No route for {request.method} {request.path}", "status": 404}
+        return handler(request)
+
+
+def _make_handler(server: FakeNessieServer) -> type:
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+        def _serve(self) -> None:
+            split = urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            raw_body = self.rfile.read(length) if length else b""
+            request = RecordedRequest(
+                method=self.command,
+                path=unquote(split.path.removeprefix(FakeNessieServer.API_ROOT)),
+                params={k: v[0] for k, v in parse_qs(split.query).items()},
+                body=json.loads(raw_body) if raw_body else None,
+                client_port=self.client_address[1],
+                headers=dict(self.headers.items()),
+            )
+            status, body, *headers = server.handle(request)
+            payload = b"" if body is None else (body if isinstance(body, bytes) else json.dumps(body).encode("utf-8"))
+            self.send_response(status)
+            for name, value in (headers[0] if headers else {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        do_GET = do_POST = do_PUT = do_DELETE = _serve  # noqa: N815
+
+    return _Handler
@@ -16,7 +16,11 @@
 """Tests for pynessie package setup."""
 
 import os
+import subprocess  # noqa: S404
+import sys
+from typing import List, Set
 
+import pytest
 from assertpy import assert_that
 
 
@@ -32,3 +36,43 @@ def _test_if_file_exists_nested_folders(input_folder: str, expected_file_name: s
         if os.path.isdir(file_full_path) and file not in "__pycache__":
             assert_that(os.path.join(file_full_path, expected_file_name)).exists()
             _test_if_file_exists_nested_folders(file_full_path, expected_file_name)
+
+
+def _run_cold(code: str) -> Set[str]:
+    """Run 'code' in a fresh interpreter, return the modules it imported."""
+    script = f"import sys\n{code}\nprint(*sys.modules)"
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout.splitlines()  # noqa: S603
+    return set(output[-1].split())
+
+
+def test_cli_cold_start() -> None:
+    """Importing the CLI must not import the commands, the client or any auth backend."""
+    modules = _run_cold("import pynessie.cli")
+    assert_that(modules).does_not_contain("pynessie.commands", "pynessie.client", "pynessie.model", "marshmallow", "botocore")
+
+
+@pytest.mark.parametrize(
+    "args, command_modules",
+    [
+        (["log", "--help"], {"pynessie.commands.log"}),
+        (["content", "list", "--help"], {"pynessie.commands.content", "pynessie.commands.content.list_"}),
+    ],
+)
+def test_cli_imports_only_invoked_command(args: List[str], command_modules: Set[str]) -> None:
+    """Running a command must import its own modules but none of the other commands and not the daemon."""
+    modules = _run_cold(f"from pynessie.cli import cli\ntry:\n    cli({args!r})\nexcept SystemExit:\n    pass")
+    assert_that({m for m in modules if m.startswith("pynessie.commands.")}).is_equal_to(command_modules)
+    assert_that(modules).does_not_contain("pynessie.daemon")
+
+
+def test_auth_backends_imported_on_demand() -> None:
+    """The AWS auth backend must only be imported when the config selects it."""
+    setup_bearer_auth = "setup_auth(build_config({'auth.type': 'bearer', 'auth.token': 't'}))"
+    modules = _run_cold(f"from pynessie.conf import build_config\nfrom pynessie.auth import setup_auth\n{setup_bearer_auth}")
+    assert_that(modules).contains("pynessie.auth.bearer").does_not_contain("pynessie.auth.aws", "botocore", "requests_aws4auth")
+
+
+def test_async_client_imported_on_demand() -> None:
+    """The asyncio client and its optional httpx dependency must only be imported when the client is used."""
+    assert_that(_run_cold("import pynessie.client")).does_not_contain("pynessie.client.async_nessie_client", "httpx")
+    assert_that(_run_cold("from pynessie.client import AsyncNessieClient")).contains("httpx")
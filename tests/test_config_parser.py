@@ -15,9 +15,12 @@
 """Tests for `config_parser.py`."""
 
 import os
+from pathlib import Path
 
+import pytest
 from assertpy import assert_that
 
+from pynessie.conf import write_to_file
 from pynessie.conf.config_parser import build_config
 
 
@@ -39,3 +42,36 @@ def test_args_take_precedence_over_env() -> None:
     os.environ["NESSIE_TEST1_TEST2_TEST3"] = "env_val"
     config = build_config({"test1.test2.test3": "arg_val"})
     assert_that(config["test1"]["test2"]["test3"].get()).is_equal_to("arg_val")
+
+
+def test_int_config_from_env() -> None:
+    """Makes sure integer settings from NESSIE environment variables are converted."""
+    os.environ["NESSIE_HTTP_POOL_MAXSIZE"] = "42"
+    try:
+        config = build_config()
+        assert_that(config["http"]["pool"]["maxsize"].get(int)).is_equal_to(42)
+    finally:
+        del os.environ["NESSIE_HTTP_POOL_MAXSIZE"]
+
+
+def test_config_files_parsed_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Makes sure the config file is parsed once, re-read when it changes, and that configurations stay independent."""
+    monkeypatch.setenv("NESSIEDIR", str(tmp_path))
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("endpoint: http://first\n", encoding="utf-8")
+    first = build_config()
+    second = build_config({"default_branch": "dev"})
+    assert_that(second.sources).contains(*first.sources[-2:])
+    assert_that(first["default_branch"].exists()).is_false()
+    assert_that(second["endpoint"].get()).is_equal_to("http://first")
+
+    config_file.write_text("endpoint: http://second/longer\n", encoding="utf-8")
+    assert_that(build_config()["endpoint"].get()).is_equal_to("http://second/longer")
+
+    # a rewrite via the config command must be seen even if the file keeps its size and modification time
+    modified = config_file.stat().st_mtime_ns
+    config = build_config()
+    config.set_args({"endpoint": "http://third/longer!"}, dots=True)
+    write_to_file(config)
+    os.utime(config_file, ns=(modified, modified))
+    assert_that(build_config()["endpoint"].get()).is_equal_to("http://third/longer!")
@@ -20,6 +20,7 @@ from assertpy import assert_that
 from pynessie.utils import (
     build_filter_for_commit_log_flags,
     build_filter_for_contents_listing_flags,
+    build_filter_for_references_listing,
     parse_to_iso8601,
 )
 
@@ -119,6 +120,13 @@ def test_building_filter_for_content_entries() -> None:
     )
 
 
+def test_building_filter_for_references() -> None:
+    """Makes sure the expression building function for the references listing produces what we expect."""
+    assert_that(build_filter_for_references_listing(True, None)).is_equal_to("refType=='BRANCH'")
+    assert_that(build_filter_for_references_listing(False, "")).is_equal_to("refType=='TAG'")
+    assert_that(build_filter_for_references_listing(False, "v1")).is_equal_to("(refType=='TAG' && ref.name=='v1')")
+
+
 def test_date_parsing() -> None:
     """Tests date parsing."""
     assert_that(parse_to_iso8601("2021-05-31 08:23:15Z")).is_equal_to("2021-05-31T08:23:15+00:00")
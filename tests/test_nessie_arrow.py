@@ -0,0 +1,84 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the columnar export of `pynessie.arrow`."""
+
+from datetime import datetime, timezone
+
+import pytest
+from assertpy import assert_that
+
+from pynessie.error import NessieInvalidUsageException
+
+from .conftest import execute_cli_command_raw
+from .fake_server import FakeNessieServer, RecordedRequest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from pynessie.arrow import (  # noqa: E402 # pylint: disable=C0411,C0413
+    DIFF_SCHEMA,
+    ENTRIES_SCHEMA,
+    iter_record_batches,
+    to_arrow,
+)
+
+_NEXT_PAGE = "page-2"
+
+
+def _log_entry(hash_: str, commit_time: str) -> dict:
+    return {"commitMeta": {"hash": hash_, "author": "me", "message": hash_, "commitTime": commit_time}, "parentCommitHash": "beef"}
+
+
+def test_to_arrow_log_pages() -> None:
+    """Each log page must become one record batch with the commit metadata as columns."""
+    pages = [
+        {"logEntries": [_log_entry("c1", "2022-06-01T10:00:00.123456789Z")], "hasMore": True, "token": _NEXT_PAGE},
+        {"logEntries": [_log_entry("c2", "2022-06-01T12:00:00Z"), {"commitMeta": {"hash": "c3"}}], "hasMore": False},
+    ]
+    table = to_arrow(pages)
+    assert_that(table.num_rows).is_equal_to(3)
+    assert_that([b.num_rows for b in iter_record_batches(pages)]).is_equal_to([1, 2])
+    assert_that(table.column("hash").to_pylist()).is_equal_to(["c1", "c2", "c3"])
+    assert_that(table.column("parent").to_pylist()).is_equal_to(["beef", "beef", None])
+    assert_that(table.column("commit_time")[0].value).is_equal_to(1654077600123456789)
+    assert_that(table.column("commit_time")[1].as_py()).is_equal_to(datetime(2022, 6, 1, 12, tzinfo=timezone.utc))
+
+
+def test_to_arrow_entries_and_diff_pages() -> None:
+    """Entries and diff pages must convert to their own schemas, other documents must be rejected."""
+    entries = to_arrow([{"entries": [{"type": "ICEBERG_TABLE", "name": {"elements": ["a", "b"]}, "contentId": "1"}], "hasMore": False}])
+    assert_that(entries.schema).is_equal_to(ENTRIES_SCHEMA)
+    assert_that(entries.to_pylist()).is_equal_to([{"key": ["a", "b"], "content_type": "ICEBERG_TABLE", "content_id": "1"}])
+    diffs = to_arrow([{"diffs": [{"key": {"elements": ["a"]}, "from": None, "to": {"type": "ICEBERG_TABLE", "id": "2"}}]}])
+    assert_that(diffs.schema).is_equal_to(DIFF_SCHEMA)
+    assert_that(diffs.column("to_content_id").to_pylist()).is_equal_to(["2"])
+    assert_that(diffs.column("from_content_type").to_pylist()).is_equal_to([None])
+    with pytest.raises(NessieInvalidUsageException):
+        to_arrow([{"type": "BRANCH", "name": "main"}])
+
+
+def test_content_list_parquet(fake_server: FakeNessieServer) -> None:
+    """The content listing must be written as Parquet with one row group per page."""
+
+    def entries(request: RecordedRequest) -> tuple:
+        if request.params.get("pageToken") == _NEXT_PAGE:
+            return 200, {"entries": [{"type": "ICEBERG_TABLE", "name": {"elements": ["b"]}}], "hasMore": False}
+        return 200, {"entries": [{"type": "NAMESPACE", "name": {"elements": ["a"]}}], "hasMore": True, "token": _NEXT_PAGE}
+
+    fake_server.add_route("GET", "/trees/tree/main/entries", entries)
+    result = execute_cli_command_raw(["--endpoint", fake_server.url, "content", "list", "-r", "main", "--format", "parquet"])
+    parquet = pq.ParquetFile(pa.BufferReader(result.stdout_bytes))
+    assert_that(parquet.num_row_groups).is_equal_to(2)
+    assert_that(parquet.read().column("key").to_pylist()).is_equal_to([["a"], ["b"]])
@@ -0,0 +1,127 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for `AsyncNessieClient`."""
+
+import asyncio
+import threading
+from typing import Any, List
+
+import pytest
+from assertpy import assert_that
+from pytest_mock import MockerFixture
+from requests import PreparedRequest
+
+from pynessie.client import AsyncNessieClient, RequestStats
+from pynessie.conf import build_config
+from pynessie.error import NessieNotFoundException
+from pynessie.model import Branch, ContentKey, Delete, IcebergTable, LogEntry
+
+from .fake_server import FakeNessieServer, RecordedRequest
+
+_NEXT_PAGE = "page-2"
+_MAIN = {"type": "BRANCH", "name": "main", "hash": "1234567890abcdef"}
+_TABLE = {"type": "ICEBERG_TABLE", "id": "1", "metadataLocation": "/a", "snapshotId": 1, "schemaId": 2, "specId": 3, "sortOrderId": 4}
+
+
+def _client(server: FakeNessieServer, **settings: Any) -> AsyncNessieClient:
+    return AsyncNessieClient(build_config({"endpoint": server.url, "auth.type": "bearer", "auth.token": "token123", **settings}))
+
+
+def test_async_client_concurrent_reads(fake_server: FakeNessieServer) -> None:
+    """Many concurrent reads must be served through the shared pool and carry the configured auth."""
+    fake_server.add_route("GET", "/contents/a.b", (200, _TABLE))
+
+    async def run() -> list:
+        async with _client(fake_server) as client:
+            return await asyncio.gather(*[client.get_content("main", ContentKey(["a", "b"])) for _ in range(50)])
+
+    contents = asyncio.run(run())
+    assert_that(contents).is_length(50)
+    assert_that(contents[0]).is_equal_to(IcebergTable("1", "/a", 1, 2, 3, 4))
+    requests = fake_server.requests_to("GET", "/contents/a.b")
+    assert_that(requests).is_length(50)
+    assert_that(requests[0].params).is_equal_to({"ref": "main"})
+    assert_that(requests[0].headers["Authorization"]).is_equal_to("Bearer token123")
+    assert_that(len(fake_server.client_ports())).is_less_than_or_equal_to(10)
+
+
+def test_async_client_get_log_follows_pages(fake_server: FakeNessieServer) -> None:
+    """get_log must be an async generator that follows the page tokens."""
+
+    def log_page(request: RecordedRequest) -> tuple:
+        if request.params.get("pageToken") == _NEXT_PAGE:
+            return 200, {"logEntries": [{"commitMeta": {"hash": "c3", "message": "3"}}], "hasMore": False}
+        entries = [{"commitMeta": {"hash": "c1", "message": "1"}}, {"commitMeta": {"hash": "c2", "message": "2"}}]
+        return 200, {"logEntries": entries, "hasMore": True, "token": _NEXT_PAGE}
+
+    fake_server.add_route("GET", "/trees/tree/main/log", log_page)
+
+    async def run() -> List[LogEntry]:
+        async with _client(fake_server) as client:
+            return [entry async for entry in client.get_log("main")]
+
+    assert_that([e.commit_meta.hash_ for e in asyncio.run(run())]).is_equal_to(["c1", "c2", "c3"])
+
+
+def test_async_client_commit_and_errors(fake_server: FakeNessieServer) -> None:
+    """Commits must send the operations and errors must map to Nessie exceptions."""
+    fake_server.add_route("POST", "/trees/branch/main/commit", (200, {"type": "BRANCH", "name": "main", "hash": "abcdef1234"}))
+
+    async def run() -> Branch:
+        async with _client(fake_server) as client:
+            with pytest.raises(NessieNotFoundException):
+                await client.get_reference("missing")
+            return await client.commit("main", "1234abcdef", "msg", "me", Delete(ContentKey(["a", "b"])))
+
+    assert_that(asyncio.run(run())).is_equal_to(Branch("main", "abcdef1234"))
+    commit = fake_server.requests_to("POST", "/trees/branch/main/commit")[0]
+    assert_that(commit.params).is_equal_to({"expectedHash": "1234abcdef"})
+    assert_that(commit.body["operations"]).is_equal_to([{"type": "DELETE", "key": {"elements": ["a", "b"]}}])
+    assert_that(commit.body["commitMeta"]["author"]).is_equal_to("me")
+
+
+def test_async_client_retries_reads(fake_server: FakeNessieServer, mocker: MockerFixture) -> None:
+    """Reads must be retried on unavailable servers according to 'http.retry', honoring Retry-After, and be counted."""
+    sleep = mocker.patch("pynessie.client._async_session.asyncio.sleep")
+    statuses = [503, 200]
+    fake_server.add_route("GET", "/trees/tree/main", lambda _: (statuses.pop(0), _MAIN, {"Retry-After": "2"}))
+
+    async def run() -> Any:
+        async with _client(fake_server, **{"http.retry.attempts": 3}) as client:
+            return await client.get_reference("main"), client.request_stats()
+
+    assert_that(asyncio.run(run())).is_equal_to((Branch("main", _MAIN["hash"]), RequestStats(requests=2, retries=1)))
+    sleep.assert_awaited_once_with(2.0)
+
+
+def test_async_client_applies_auth_in_worker_thread(fake_server: FakeNessieServer, mocker: MockerFixture) -> None:
+    """A requests auth may block, so it must not run on the thread of the event loop."""
+    threads = []
+
+    def auth(request: PreparedRequest) -> PreparedRequest:
+        threads.append(threading.get_ident())
+        request.headers["Authorization"] = "Signed"
+        return request
+
+    mocker.patch("pynessie.client.async_nessie_client.setup_auth", return_value=auth)
+    fake_server.add_route("GET", "/trees/tree/main", (200, _MAIN))
+
+    async def run() -> None:
+        async with _client(fake_server) as client:
+            await client.get_reference("main")
+
+    asyncio.run(run())
+    assert_that(threads).is_length(1).does_not_contain(threading.get_ident())
+    assert_that(fake_server.requests_to("GET", "/trees/tree/main")[0].headers["Authorization"]).is_equal_to("Signed")
@@ -0,0 +1,128 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the on-disk cache."""
+
+import json
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from threading import Thread
+from typing import Any, List
+
+import pytest
+from assertpy import assert_that
+
+from pynessie.client import NessieClient
+from pynessie.client._disk_cache import DiskCache, DiskCacheStats
+from pynessie.conf import build_config
+from pynessie.model import ContentKey, IcebergTable
+
+from .conftest import execute_cli_command
+from .fake_server import FakeNessieServer
+
+_TABLE = {"type": "ICEBERG_TABLE", "id": "1", "metadataLocation": "/a", "snapshotId": 1, "schemaId": 2, "specId": 3, "sortOrderId": 4}
+
+
+def _client(server: FakeNessieServer, path: Path) -> NessieClient:
+    return NessieClient(build_config({"endpoint": server.url, "cache.disk.maxbytes": 100000, "cache.disk.path": str(path)}))
+
+
+def test_disk_cache_shared_between_clients(fake_server: FakeNessieServer, tmp_path: Path) -> None:
+    """Hash-pinned contents, entries and log pages must be served from the disk cache by a later client."""
+    fake_server.add_route("GET", "/contents/a", (200, _TABLE))
+    fake_server.add_route("GET", "/trees/tree/main/entries", (200, {"entries": [], "hasMore": False}))
+    fake_server.add_route("GET", "/trees/tree/main/log", (200, {"logEntries": [{"commitMeta": {"hash": "cafebabe"}}], "hasMore": False}))
+    for _ in range(2):
+        with _client(fake_server, tmp_path / "cache.sqlite") as client:
+            assert_that(client.get_content("main@cafebabe", ContentKey(["a"]))).is_equal_to(IcebergTable("1", "/a", 1, 2, 3, 4))
+            client.get_content("main", ContentKey(["a"]))
+            client.list_keys("main", "cafebabe")
+            assert_that([e.commit_meta.hash_ for e in client.get_log("main", endHash="cafebabe")]).is_equal_to(["cafebabe"])
+    assert_that(fake_server.requests_to("GET", "/contents/a")).is_length(3)
+    assert_that(fake_server.requests_to("GET", "/trees/tree/main/entries")).is_length(1)
+    assert_that(fake_server.requests_to("GET", "/trees/tree/main/log")).is_length(1)
+    stats = _client(fake_server, tmp_path / "cache.sqlite").disk_cache_stats()
+    assert stats is not None
+    assert_that((stats.hits, stats.misses, stats.entries)).is_equal_to((3, 3, 3))
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    """The disk cache must stay within its size cap by evicting the least recently used documents."""
+    cache = DiskCache(str(tmp_path / "cache.sqlite"), 25)
+    cache.put("a", "x" * 8)
+    cache.put("b", "y" * 8)
+    assert_that(cache.get("a")).is_equal_to("x" * 8)
+    cache.put("c", "z" * 8)
+    cache.put("too-big", "x" * 40)
+    assert_that(cache.get("b")).is_none()
+    assert_that(cache.get("too-big")).is_none()
+    assert_that(cache.get("c")).is_equal_to("z" * 8)
+    assert_that(cache.stats()).is_equal_to(DiskCacheStats(str(tmp_path / "cache.sqlite"), 2, 2, 2, 20, 25))
+    cache.clear()
+    assert_that(cache.stats()).is_equal_to(DiskCacheStats(str(tmp_path / "cache.sqlite"), 0, 0, 0, 0, 25))
+
+
+def test_disk_cache_concurrent_writers(tmp_path: Path) -> None:
+    """Concurrent writers, each with its own cache instance like separate processes, must not corrupt the counters."""
+
+    def write(worker: int) -> None:
+        cache = DiskCache(str(tmp_path / "cache.sqlite"), 100000)
+        for i in range(20):
+            cache.put(f"{worker}-{i}", i)
+            cache.get(f"{worker}-{i}")
+
+    threads = [Thread(target=write, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = DiskCache(str(tmp_path / "cache.sqlite"), 100000).stats()
+    assert_that((stats.hits, stats.misses, stats.entries)).is_equal_to((80, 0, 80))
+
+
+def test_cache_cli(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test cache stats and clear commands."""
+    assert_that(json.loads(execute_cli_command(["--json", "cache", "stats"]))).is_equal_to({})
+    monkeypatch.setenv("NESSIE_CACHE_DISK_MAXBYTES", "1000")
+    monkeypatch.setenv("NESSIE_CACHE_DISK_PATH", str(tmp_path / "cache.sqlite"))
+    DiskCache(str(tmp_path / "cache.sqlite"), 1000).put("a", [1, 2])
+    assert_that(execute_cli_command(["cache", "stats"])).contains("Entries: 1\n", "Size: 6 of 1000 bytes\n")
+    execute_cli_command(["cache", "clear"])
+    assert_that(json.loads(execute_cli_command(["--json", "cache", "stats"]))).contains_entry({"entries": 0}, {"max_bytes": 1000})
+
+
+def test_disk_cache_readers_take_no_write_lock(tmp_path: Path) -> None:
+    """Concurrent readers must neither wait for a writer nor for each other, their hits are counted later."""
+    path = str(tmp_path / "cache.sqlite")
+    DiskCache(path, 1000).put("a", [1, 2])
+    readers = [DiskCache(path, 1000, timeout_sec=0.01) for _ in range(2)]
+    results: List[Any] = []
+
+    def read(cache: DiskCache) -> None:
+        for _ in range(10):
+            results.append(cache.get("a"))
+
+    with closing(sqlite3.connect(path, isolation_level=None)) as writer:
+        writer.execute("BEGIN IMMEDIATE")
+        threads = [Thread(target=read, args=(reader,)) for reader in readers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        writer.execute("ROLLBACK")
+    assert_that(results).is_equal_to([[1, 2]] * 20)
+    for reader in readers:
+        reader.flush()
+    assert_that(DiskCache(path, 1000).stats().hits).is_equal_to(20)
@@ -44,6 +44,9 @@ from .conftest import (
     make_commit,
     ref_hash,
 )
+from .fake_server import FakeNessieServer, RecordedRequest
+
+_NEXT_PAGE = "page-2"
 
 
 @pytest.mark.nessieserver
@@ -241,6 +244,59 @@ def test_branch() -> None:
     assert len(references) == 1
 
 
+def test_branch_list_all_pages(fake_server: FakeNessieServer) -> None:
+    """Test that branch listing filters on the server and follows its pagination."""
+
+    def references(request: RecordedRequest) -> tuple:
+        if request.params.get("pageToken") == _NEXT_PAGE:
+            return 200, {"references": [{"type": "BRANCH", "name": "dev", "hash": "cafe"}], "hasMore": False}
+        return 200, {"references": [{"type": "BRANCH", "name": "main", "hash": "beef"}], "hasMore": True, "token": _NEXT_PAGE}
+
+    fake_server.add_route("GET", "/trees", references)
+    fake_server.add_route("GET", "/trees/tree", (200, {"type": "BRANCH", "name": "main", "hash": "beef"}))
+    branches = ReferenceSchema().loads(execute_cli_command(["--endpoint", fake_server.url, "--json", "branch", "-l"]), many=True)
+    assert_that([b.name for b in branches]).is_equal_to(["main", "dev"])
+    assert_that(execute_cli_command(["--endpoint", fake_server.url, "branch", "-l"])).is_equal_to("* main \n  dev  \n")
+    assert_that(fake_server.requests_to("GET", "/trees")[0].params).is_equal_to({"filter": "refType=='BRANCH'"})
+
+
+def test_branch_list_keeps_columns_aligned(fake_server: FakeNessieServer) -> None:
+    """The hashes of a long listing, which is printed in batches, must stay in one column."""
+    names = ["a-long-branch-name", *(f"b-{i}" for i in range(250))]
+    references = [{"type": "BRANCH", "name": name, "hash": "beef"} for name in names]
+    fake_server.add_route("GET", "/trees", (200, {"references": references, "hasMore": False}))
+    fake_server.add_route("GET", "/trees/tree", (200, {"type": "BRANCH", "name": "main", "hash": "beef"}))
+    rows = execute_cli_command(["--endpoint", fake_server.url, "--verbose", "branch", "-l"]).splitlines()
+    assert_that([row.split()[0] for row in rows]).is_equal_to(names)
+    assert_that({row.index("beef") for row in rows}).is_equal_to({len("  a-long-branch-name  ")})
+
+
+def test_diff_all_pages(fake_server: FakeNessieServer) -> None:
+    """Test that diff follows the server's pagination and writes the same JSON document as for a single page."""
+
+    def diffs(request: RecordedRequest) -> tuple:
+        if request.params.get("pageToken") == _NEXT_PAGE:
+            return 200, {"diffs": [{"key": {"elements": ["b"]}, "from": None, "to": None}], "hasMore": False}
+        return 200, {"diffs": [{"key": {"elements": ["a"]}, "from": None, "to": None}], "hasMore": True, "token": _NEXT_PAGE}
+
+    fake_server.add_route("GET", "/diffs/main...dev", diffs)
+    output = execute_cli_command(["--endpoint", fake_server.url, "--json", "diff", "main", "dev"])
+    diff_response = DiffResponseSchema().loads(output)
+    assert_that([d.content_key for d in diff_response.diffs]).is_equal_to([ContentKey(["a"]), ContentKey(["b"])])
+    assert_that(output).is_equal_to(DiffResponseSchema().dumps(diff_response) + "\n")
+
+
+def test_raw_json_output(fake_server: FakeNessieServer) -> None:
+    """Test that --raw-json writes the server responses unchanged, one page per line."""
+    first = b'{"logEntries": [{"commitMeta": {"hash": "c1"}, "extra": 1}], "hasMore": true, "token": "page-2"}'
+    second = b'{"logEntries": [{"commitMeta": {"hash": "c2"}}], "hasMore": false}'
+    fake_server.add_route("GET", "/trees/tree/main/log", lambda r: (200, second if r.params.get("pageToken") == _NEXT_PAGE else first))
+    fake_server.add_route("GET", "/contents/a.b", (200, b'{"type": "SOMETHING_NEW"}'))
+    args = ["--endpoint", fake_server.url, "--raw-json"]
+    assert_that(execute_cli_command([*args, "log", "main"]).encode()).is_equal_to(first + b"\n" + second + b"\n")
+    assert_that(execute_cli_command([*args, "content", "view", "-r", "main", "a.b"])).is_equal_to('{"type": "SOMETHING_NEW"}\n')
+
+
 @pytest.mark.nessieserver
 def test_tag() -> None:
     """Test create and assign refs."""
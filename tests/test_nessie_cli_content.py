@@ -29,8 +29,10 @@ from pynessie.model import (
 )
 
 from .conftest import execute_cli_command, make_commit, ref_hash
+from .fake_server import FakeNessieServer, RecordedRequest
 
 CONTENT_COMMAND = "content"
+_NEXT_PAGE = "page-2"
 
 
 @pytest.mark.nessieserver
@@ -141,6 +143,25 @@ def test_content_list() -> None:
     assert_that(set(i.kind for i in tables)).is_equal_to({"ICEBERG_TABLE", "ICEBERG_VIEW", "DELTA_LAKE_TABLE"})
 
 
+def test_content_list_all_pages(fake_server: FakeNessieServer) -> None:
+    """Test that content list follows the server's pagination, for both output formats."""
+
+    def entries(request: RecordedRequest) -> tuple:
+        if request.params.get("pageToken") == _NEXT_PAGE:
+            page = [("DELTA_LAKE_TABLE", ["b.c", "d"]), ("ICEBERG_TABLE", ["e"])]
+            return 200, {"entries": [{"type": kind, "name": {"elements": name}} for kind, name in page], "hasMore": False}
+        page = [("ICEBERG_TABLE", ["a"]), ("DELTA_LAKE_TABLE", ["b"]), ("ICEBERG_TABLE", ["c"])]
+        return 200, {"entries": [{"type": kind, "name": {"elements": name}} for kind, name in page], "hasMore": True, "token": _NEXT_PAGE}
+
+    fake_server.add_route("GET", "/trees/tree/main/entries", entries)
+    args = ["--endpoint", fake_server.url, CONTENT_COMMAND, "list", "--ref", "main"]
+    listed = EntrySchema().loads(execute_cli_command(["--json", *args]), many=True)
+    assert_that([e.name.elements for e in listed]).is_equal_to([("a",), ("b",), ("c",), ("b.c", "d"), ("e",)])
+    # the text output groups the entries of every page by kind, a kind that continues on the next page is not repeated
+    text = execute_cli_command(args)
+    assert_that(text).is_equal_to('ICEBERG_TABLE:\n\ta\n\tc\nDELTA_LAKE_TABLE:\n\tb\n\t"b.c".d\nICEBERG_TABLE:\n\te\n\n')
+
+
 @pytest.mark.nessieserver
 def test_content_commit_delete() -> None:
     """Test content commit delete operation."""
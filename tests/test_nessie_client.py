@@ -14,12 +14,50 @@
 #
 """Tests for `pynessie` package."""
 
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
 import pytest
+from assertpy import assert_that
+from pytest_mock import MockerFixture
 
 from pynessie import init
+from pynessie.client import CacheStats, NessieClient, RawJson, RequestStats
+from pynessie.client._cache import ContentCache
 from pynessie.client._endpoints import _sanitize_url
-from pynessie.error import NessieConflictException
-from pynessie.model import Branch, Entries
+from pynessie.client._json import STDLIB_CODEC, get_codec
+from pynessie.client._session import RetryPolicy
+from pynessie.conf import build_config
+from pynessie.error import (
+    NessieConflictException,
+    NessieInvalidUsageException,
+    NessieReferenceConflictException,
+    NessieServerException,
+)
+from pynessie.model import Branch, ContentKey, Delete, Entries, IcebergTable, Put
+
+from .fake_server import FakeNessieServer, RecordedRequest
+
+_MAIN = {"type": "BRANCH", "name": "main", "hash": "1234567890abcdef"}
+_NEXT_PAGE = "page-2"
+
+
+def _table(table_id: str) -> dict:
+    return {
+        "type": "ICEBERG_TABLE",
+        "id": table_id,
+        "metadataLocation": "/" + table_id,
+        "snapshotId": 1,
+        "schemaId": 2,
+        "specId": 3,
+        "sortOrderId": 4,
+    }
+
+
+def _client(server: FakeNessieServer, **config: object) -> NessieClient:
+    return NessieClient(build_config({"endpoint": server.url, **config}))
 
 
 @pytest.mark.nessieserver
@@ -76,3 +114,474 @@ def test_client_sanitize_url() -> None:
         _sanitize_url(base_url + "/trees/tree/{}/{}", "tag/name", "other/string@with-at")
         == base_url + "/trees/tree/tag%2Fname/other%2Fstring%40with-at"
     )
+
+
+def test_client_reuses_pooled_connections(fake_server: FakeNessieServer) -> None:
+    """Consecutive requests of one client must share a keep-alive connection."""
+    fake_server.add_route("GET", "/trees/tree/main", (200, _MAIN))
+    with _client(fake_server) as client:
+        for _ in range(5):
+            assert_that(client.get_reference("main")).is_equal_to(Branch("main", _MAIN["hash"]))
+    assert_that(fake_server.requests_to("GET", "/trees/tree/main")).is_length(5)
+    assert_that(fake_server.client_ports()).is_length(1)
+
+
+def test_client_drops_idle_connections(fake_server: FakeNessieServer, mocker: MockerFixture) -> None:
+    """Pooled connections idle for longer than the keep-alive timeout must not be reused."""
+    fake_server.add_route("GET", "/trees/tree/main", (200, _MAIN))
+    monotonic = mocker.patch("pynessie.client._session.time.monotonic", return_value=1000.0)
+    with _client(fake_server, **{"http.pool.keepalive": 30}) as client:
+        client.get_reference("main")
+        monotonic.return_value = 1010.0
+        client.get_reference("main")
+        monotonic.return_value = 1100.0
+        client.get_reference("main")
+    assert_that(fake_server.client_ports()).is_length(2)
+
+
+def test_client_shared_by_threads(fake_server: FakeNessieServer) -> None:
+    """Concurrent reads and commits of many threads through one client must not see each other's arguments or state."""
+    threads = 64
+    heads: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def log_page(request: RecordedRequest) -> tuple:
+        author = request.params["author"]
+        if request.params.get("pageToken") == _NEXT_PAGE + author:
+            return 200, {"logEntries": [{"commitMeta": {"hash": author + "-2"}}], "hasMore": False}
+        return 200, {"logEntries": [{"commitMeta": {"hash": author + "-1"}}], "hasMore": True, "token": _NEXT_PAGE + author}
+
+    def commit(request: RecordedRequest) -> tuple:
+        name = request.path.split("/")[-2]
+        with lock:
+            head = heads.get(name, 0)
+            if request.params["expectedHash"] != f"{head:016x}":
+                return 409, {"message": "expected hash mismatch", "status": 409, "errorCode": "REFERENCE_CONFLICT"}
+            heads[name] = head + 1
+        return 200, {"type": "BRANCH", "name": name, "hash": f"{head + 1:016x}"}
+
+    fake_server.add_route("GET", "/trees/tree/main", (200, _MAIN))
+    fake_server.add_route("GET", "/trees/tree/main/log", log_page)
+    for i in range(threads):
+        fake_server.add_route("POST", f"/trees/branch/b{i}/commit", commit)
+
+    def work(i: int) -> list:
+        assert_that(client.get_reference("main")).is_equal_to(Branch("main", _MAIN["hash"]))
+        hashes = [e.commit_meta.hash_ for e in client.get_log("main", author=f"t{i}")]
+        branch = client.commit(f"b{i}", f"{0:016x}", "first", None, Delete(ContentKey(["a"])))
+        branch = client.commit(f"b{i}", str(branch.hash_), "second", None, Delete(ContentKey(["a"])))
+        return hashes + [branch.hash_]
+
+    with _client(fake_server, **{"http.pool.maxsize": threads}) as client:
+        with ThreadPoolExecutor(threads) as executor:
+            results = list(executor.map(work, range(threads)))
+        assert_that(client.request_stats().requests).is_equal_to(5 * threads)
+    assert_that(results).is_equal_to([[f"t{i}-1", f"t{i}-2", f"{2:016x}"] for i in range(threads)])
+    logs = fake_server.requests_to("GET", "/trees/tree/main/log")
+    assert_that([r.params for r in logs if "pageToken" in r.params]).is_length(threads)
+    assert_that(
+        [r for r in logs if r.params.get("pageToken", _NEXT_PAGE + r.params["author"]) != _NEXT_PAGE + r.params["author"]]
+    ).is_empty()
+    assert_that(len(fake_server.client_ports())).is_less_than_or_equal_to(threads)
+
+
+def test_client_context_manager_closes_session(fake_server: FakeNessieServer, mocker: MockerFixture) -> None:
+    """Leaving the client context must close the pooled session."""
+    close = mocker.patch("pynessie.client._session.NessieSession.close")
+    with _client(fake_server):
+        close.assert_not_called()
+    close.assert_called_once()
+
+
+def test_client_get_contents_in_chunks(fake_server: FakeNessieServer) -> None:
+    """get_contents must fetch keys in chunks from the multi-content endpoint and keep the requested order."""
+
+    def contents(request: RecordedRequest) -> tuple:
+        keys = [k["elements"] for k in request.body["requestedKeys"] if k["elements"] != ["missing"]]
+        return 200, {"contents": [{"key": {"elements": k}, "content": _table(k[0])} for k in reversed(keys)]}
+
+    fake_server.add_route("POST", "/contents", contents)
+    keys = [ContentKey(["t1"]), ContentKey(["missing"]), ContentKey(["t2"]), ContentKey(["t3"])]
+    with _client(fake_server) as client:
+        found = client.get_contents("main@1234567890abcdef", keys, chunk_size=3)
+    assert_that([c.key for c in found]).is_equal_to([ContentKey(["t1"]), ContentKey(["t2"]), ContentKey(["t3"])])
+    assert_that(found[0].content).is_equal_to(IcebergTable("t1", "/t1", 1, 2, 3, 4))
+    requests = fake_server.requests_to("POST", "/contents")
+    assert_that([len(r.body["requestedKeys"]) for r in requests]).is_equal_to([3, 1])
+    assert_that(requests[0].params).is_equal_to({"ref": "main", "hashOnRef": "1234567890abcdef"})
+
+
+def test_client_get_contents_falls_back_to_single_fetches(fake_server: FakeNessieServer) -> None:
+    """Servers without the multi-content endpoint must be queried key by key, and only asked once for the endpoint."""
+    fake_server.add_route("GET", "/contents/t1", (200, _table("t1")))
+    fake_server.add_route("GET", "/contents/t2", (200, _table("t2")))
+    fake_server.add_route("GET", "/contents/missing", (404, {"message": "not found", "status": 404, "errorCode": "CONTENT_NOT_FOUND"}))
+    keys = [ContentKey(["t2"]), ContentKey(["missing"]), ContentKey(["t1"])]
+    with _client(fake_server) as client:
+        assert_that([c.key for c in client.get_contents("main", keys)]).is_equal_to([ContentKey(["t2"]), ContentKey(["t1"])])
+        assert_that(client.get_contents("main", keys[:1])).is_length(1)
+    assert_that(fake_server.requests_to("POST", "/contents")).is_length(1)
+    assert_that(fake_server.requests_to("GET", "/contents/t2")).is_length(2)
+
+
+def _paged_entries(request: RecordedRequest) -> tuple:
+    page = int(request.params.get("pageToken", "0"))
+    entries = [{"type": "ICEBERG_TABLE", "name": {"elements": ["t", str(page * 2 + i)]}} for i in range(2)]
+    if page < 2:
+        return 200, {"entries": entries, "hasMore": True, "token": str(page + 1)}
+    return 200, {"entries": entries, "hasMore": False}
+
+
+def test_client_iter_keys_follows_pages(fake_server: FakeNessieServer) -> None:
+    """iter_keys must yield the entries of all pages, requesting each page once."""
+    fake_server.add_route("GET", "/trees/tree/main/entries", _paged_entries)
+    with _client(fake_server) as client:
+        entries = list(client.iter_keys("main", max_result_hint=2, query_filter="true"))
+    assert_that([e.name.elements[1] for e in entries]).is_equal_to([str(i) for i in range(6)])
+    requests = fake_server.requests_to("GET", "/trees/tree/main/entries")
+    assert_that([r.params.get("pageToken") for r in requests]).is_equal_to([None, "1", "2"])
+    assert_that(requests[2].params).contains_entry({"maxRecords": "2"}, {"filter": "true"})
+
+
+def test_client_iter_keys_stops_early(fake_server: FakeNessieServer) -> None:
+    """Abandoning iter_keys must not fetch more than the one prefetched page."""
+    fake_server.add_route("GET", "/trees/tree/main/entries", _paged_entries)
+    with _client(fake_server) as client:
+        entries = client.iter_keys("main")
+        next(entries)
+        entries.close()
+    assert_that(len(fake_server.requests_to("GET", "/trees/tree/main/entries"))).is_less_than_or_equal_to(2)
+
+
+def test_client_iter_references(fake_server: FakeNessieServer) -> None:
+    """iter_references must yield the references of all pages and pass the page size and filter."""
+
+    def references(request: RecordedRequest) -> tuple:
+        if request.params.get("pageToken") == _NEXT_PAGE:
+            return 200, {"references": [{"type": "TAG", "name": "v1", "hash": "cafe"}], "hasMore": False}
+        return 200, {"references": [_MAIN], "hasMore": True, "token": _NEXT_PAGE}
+
+    fake_server.add_route("GET", "/trees", references)
+    with _client(fake_server) as client:
+        names = [r.name for r in client.iter_references(fetch_all=True, page_size=1, query_filter="true")]
+    assert_that(names).is_equal_to(["main", "v1"])
+    requests = fake_server.requests_to("GET", "/trees")
+    assert_that(requests[1].params).is_equal_to({"fetch": "ALL", "maxRecords": "1", "pageToken": _NEXT_PAGE, "filter": "true"})
+
+
+def test_client_iter_diff(fake_server: FakeNessieServer) -> None:
+    """iter_diff must yield the diff entries of all pages."""
+
+    def diffs(request: RecordedRequest) -> tuple:
+        if request.params.get("pageToken") == _NEXT_PAGE:
+            return 200, {"diffs": [{"key": {"elements": ["b"]}, "from": _table("b"), "to": None}], "hasMore": False}
+        return 200, {"diffs": [{"key": {"elements": ["a"]}, "from": None, "to": _table("a")}], "hasMore": True, "token": _NEXT_PAGE}
+
+    fake_server.add_route("GET", "/diffs/main*1234...dev", diffs)
+    with _client(fake_server) as client:
+        entries = list(client.iter_diff("main", "dev", from_hash_on_ref="1234", page_size=1))
+    assert_that([e.content_key for e in entries]).is_equal_to([ContentKey(["a"]), ContentKey(["b"])])
+    assert_that(entries[0].to_content).is_equal_to(IcebergTable("a", "/a", 1, 2, 3, 4))
+    assert_that(entries[1].to_content).is_none()
+    assert_that(fake_server.requests_to("GET", "/diffs/main*1234...dev")[1].params).is_equal_to(
+        {"maxRecords": "1", "pageToken": _NEXT_PAGE}
+    )
+
+
+def test_client_content_cache(fake_server: FakeNessieServer) -> None:
+    """Hash-pinned content lookups must be served from the content cache, HEAD lookups must always go to the server."""
+    fake_server.add_route("GET", "/contents/t1", (200, _table("t1")))
+    fake_server.add_route("POST", "/contents", (200, {"contents": [{"key": {"elements": ["t2"]}, "content": _table("t2")}]}))
+    with _client(fake_server, **{"cache.content.maxsize": 10}) as client:
+        for _ in range(3):
+            assert_that(client.get_content("main@cafebabe", ContentKey(["t1"]))).is_equal_to(IcebergTable("t1", "/t1", 1, 2, 3, 4))
+        client.get_content("main", ContentKey(["t1"]))
+        found = client.get_contents("main", [ContentKey(["t1"]), ContentKey(["t2"])], hash_on_ref="cafebabe")
+        assert_that([c.key for c in found]).is_equal_to([ContentKey(["t1"]), ContentKey(["t2"])])
+        assert_that(client.content_cache_stats()).is_equal_to(CacheStats(hits=3, misses=2, size=2, maxsize=10))
+    assert_that(fake_server.requests_to("GET", "/contents/t1")).is_length(2)
+    assert_that(fake_server.requests_to("POST", "/contents")[0].body).is_equal_to({"requestedKeys": [{"elements": ["t2"]}]})
+
+
+def test_client_content_cache_disabled_by_default(fake_server: FakeNessieServer) -> None:
+    """Without 'cache.content.maxsize' every lookup must go to the server."""
+    fake_server.add_route("GET", "/contents/t1", (200, _table("t1")))
+    with _client(fake_server) as client:
+        client.get_content("main@cafebabe", ContentKey(["t1"]))
+        client.get_content("main@cafebabe", ContentKey(["t1"]))
+        assert_that(client.content_cache_stats()).is_none()
+    assert_that(fake_server.requests_to("GET", "/contents/t1")).is_length(2)
+
+
+def test_content_cache_evicts_least_recently_used() -> None:
+    """The content cache must stay within its size bound by evicting the least recently used content."""
+    cache = ContentCache(2)
+    table = IcebergTable("t", "/t", 1, 2, 3, 4)
+    cache.put("h1", ContentKey(["a"]), table)
+    cache.put("h1", ContentKey(["b"]), table)
+    assert_that(cache.get("h1", ContentKey(["a"]))).is_same_as(table)
+    cache.put("h2", ContentKey(["a"]), table)
+    assert_that(cache.get("h1", ContentKey(["b"]))).is_none()
+    assert_that(cache.get("h1", ContentKey(["a"]))).is_same_as(table)
+    assert_that(cache.stats()).is_equal_to(CacheStats(hits=2, misses=1, size=2, maxsize=2))
+
+
+def test_client_reference_cache(fake_server: FakeNessieServer, mocker: MockerFixture) -> None:
+    """References must be resolved once within the TTL and again after this client changed them or the TTL expired."""
+    now = mocker.patch("pynessie.client._cache.time.monotonic", return_value=100.0)
+    fake_server.add_route("GET", "/trees/tree/main", (200, _MAIN))
+    fake_server.add_route("GET", "/trees/tree/dev", (200, {"type": "BRANCH", "name": "dev", "hash": "cafebabe"}))
+    fake_server.add_route("GET", "/trees/tree", (200, _MAIN))
+    merge_response: dict = {
+        "targetBranch": "main",
+        "effectiveTargetHash": _MAIN["hash"],
+        "sourceCommits": [],
+        "details": [],
+        "resultantTargetHash": None,
+        "commonAncestor": None,
+        "expectedHash": None,
+        "targetCommits": [],
+    }
+    fake_server.add_route("POST", "/trees/branch/main/merge", (200, merge_response))
+    with _client(fake_server, **{"cache.reference.ttl": 5}) as client:
+        assert_that(client.get_default_branch()).is_equal_to("main")
+        client.get_reference("dev").hash_ = "modified"
+        client.merge("dev", "main")
+        client.merge("dev", "main")
+        assert_that(client.get_reference("dev").hash_).is_equal_to("cafebabe")
+        assert_that(fake_server.requests_to("GET", "/trees/tree/dev")).is_length(1)
+        assert_that(fake_server.requests_to("GET", "/trees/tree/main")).is_length(2)
+        assert_that(fake_server.requests_to("POST", "/trees/branch/main/merge")[0].body).is_equal_to(
+            {"fromRefName": "dev", "fromHash": "cafebabe"}
+        )
+        now.return_value = 105.0
+        client.get_reference("dev")
+        client.get_default_branch()
+    assert_that(fake_server.requests_to("GET", "/trees/tree/dev")).is_length(2)
+    assert_that(fake_server.requests_to("GET", "/trees/tree")).is_length(2)
+
+
+def _unavailable_first(times: int, status: int, response: tuple) -> Callable[[RecordedRequest], tuple]:
+    calls = []
+
+    def handle(_: RecordedRequest) -> tuple:
+        calls.append(1)
+        return (status, {"message": "unavailable", "status": status}, {"Retry-After": "2"}) if len(calls) <= times else response
+
+    return handle
+
+
+def test_client_retries_reads(fake_server: FakeNessieServer, mocker: MockerFixture) -> None:
+    """Reads must be retried on unavailable servers, honoring Retry-After, until the configured attempts are used up."""
+    sleep = mocker.patch("pynessie.client._session.time.sleep")
+    fake_server.add_route("GET", "/trees/tree/main", _unavailable_first(2, 503, (200, _MAIN)))
+    fake_server.add_route("GET", "/trees/tree/dev", (502, {"message": "bad gateway", "status": 502}))
+    with _client(fake_server, **{"http.retry.attempts": 3}) as client:
+        assert_that(client.get_reference("main")).is_equal_to(Branch("main", _MAIN["hash"]))
+        assert_that(client.request_stats()).is_equal_to(RequestStats(requests=3, retries=2, failed_after_retries=0))
+        with pytest.raises(NessieServerException):
+            client.get_reference("dev")
+        assert_that(client.request_stats()).is_equal_to(RequestStats(requests=6, retries=4, failed_after_retries=1))
+    assert_that(sleep.call_args_list[0].args).is_equal_to((2.0,))
+    for call in sleep.call_args_list[2:]:
+        assert_that(call.args[0]).is_between(0, 0.2)
+
+
+def test_client_retries_only_rejected_changes(fake_server: FakeNessieServer, mocker: MockerFixture) -> None:
+    """Commits carry an expected hash, so they may be retried, but only if the server certainly did not apply them."""
+    mocker.patch("pynessie.client._session.time.sleep")
+    fake_server.add_route("POST", "/trees/branch/main/commit", _unavailable_first(1, 503, (200, _MAIN)))
+    fake_server.add_route("POST", "/trees/branch/dev/commit", _unavailable_first(1, 504, (200, _MAIN)))
+    with _client(fake_server, **{"http.retry.attempts": 3}) as client:
+        client.commit("main", "1234567890abcdef", "msg", "me", Delete(ContentKey(["a"])))
+        with pytest.raises(NessieServerException):
+            client.commit("dev", "1234567890abcdef", "msg", "me", Delete(ContentKey(["a"])))
+    assert_that(fake_server.requests_to("POST", "/trees/branch/main/commit")).is_length(2)
+    assert_that(fake_server.requests_to("POST", "/trees/branch/dev/commit")).is_length(1)
+
+
+def test_client_does_not_retry_by_default(fake_server: FakeNessieServer) -> None:
+    """Without 'http.retry.attempts' a failed request must surface immediately."""
+    fake_server.add_route("GET", "/trees/tree/main", _unavailable_first(1, 503, (200, _MAIN)))
+    with _client(fake_server) as client:
+        with pytest.raises(NessieServerException):
+            client.get_reference("main")
+        assert_that(client.request_stats()).is_equal_to(RequestStats(requests=1, retries=0, failed_after_retries=0))
+
+
+def test_retry_policy_full_jitter() -> None:
+    """Backoff delays must be drawn from [0, min(cap, base * 2 ** retry)]."""
+    policy = RetryPolicy(attempts=10, backoff_sec=0.1, backoff_max_sec=0.5)
+    for retry, cap in [(0, 0.1), (1, 0.2), (2, 0.4), (3, 0.5), (8, 0.5)]:
+        delays = [policy.delay(retry) for _ in range(50)]
+        assert_that(min(delays)).is_greater_than_or_equal_to(0)
+        assert_that(max(delays)).is_less_than_or_equal_to(cap)
+
+
+def _contended_branch(fake_server: FakeNessieServer, conflicts: int) -> None:
+    heads = ["0000000000000000"]
+
+    def head(_: RecordedRequest) -> tuple:
+        return 200, {"type": "BRANCH", "name": "main", "hash": heads[-1]}
+
+    def commit(request: RecordedRequest) -> tuple:
+        if len(heads) <= conflicts:
+            heads.append(f"{len(heads):016x}")
+            return 409, {"message": "expected hash mismatch", "status": 409, "errorCode": "REFERENCE_CONFLICT"}
+        return 200, {"type": "BRANCH", "name": "main", "hash": "ffffffffffffffff"}
+
+    fake_server.add_route("GET", "/trees/tree/main", head)
+    fake_server.add_route("POST", "/trees/branch/main/commit", commit)
+
+
+def test_client_commit_with_retry_rebases(fake_server: FakeNessieServer, mocker: MockerFixture) -> None:
+    """Conflicting commits must be retried on the new HEAD of the branch."""
+    sleep = mocker.patch("pynessie.client.nessie_client.time.sleep")
+    _contended_branch(fake_server, conflicts=2)
+    with _client(fake_server) as client:
+        result = client.commit_with_retry("main", [Delete(ContentKey(["a"]))], "msg")
+    assert_that(result.branch).is_equal_to(Branch("main", "ffffffffffffffff"))
+    assert_that(result.latencies).is_length(3)
+    commits = fake_server.requests_to("POST", "/trees/branch/main/commit")
+    assert_that([c.params["expectedHash"] for c in commits]).is_equal_to(["0000000000000000", "0000000000000001", "0000000000000002"])
+    assert_that(sleep.call_count).is_equal_to(2)
+
+    _contended_branch(fake_server, conflicts=5)
+    with _client(fake_server) as client:
+        with pytest.raises(NessieReferenceConflictException):
+            client.commit_with_retry("main", [Delete(ContentKey(["a"]))], attempts=3)
+
+
+def test_client_commit_with_retry_checks_expected_contents(fake_server: FakeNessieServer, mocker: MockerFixture) -> None:
+    """A conflict must be raised without retrying if a content that a Put expects was changed by another writer."""
+    mocker.patch("pynessie.client.nessie_client.time.sleep")
+    _contended_branch(fake_server, conflicts=1)
+    changed = dict(_table("t1"), metadataLocation="/changed")
+    fake_server.add_route("POST", "/contents", (200, {"contents": [{"key": {"elements": ["t1"]}, "content": changed}]}))
+    table = IcebergTable("t1", "/t1", 1, 2, 3, 4)
+    with _client(fake_server) as client:
+        with pytest.raises(NessieReferenceConflictException):
+            client.commit_with_retry("main", [Put(ContentKey(["t1"]), table, table)])
+    assert_that(fake_server.requests_to("POST", "/trees/branch/main/commit")).is_length(1)
+    assert_that(fake_server.requests_to("POST", "/contents")[0].params).is_equal_to({"ref": "main", "hashOnRef": "0000000000000001"})
+
+
+def test_client_commit_bulk_chains_chunks(fake_server: FakeNessieServer) -> None:
+    """Bulk commits must be split by operation count and body size and every commit must expect the previous hash."""
+
+    def commit(request: RecordedRequest) -> tuple:
+        return 200, {"type": "BRANCH", "name": "main", "hash": f"{int(request.params['expectedHash'], 16) + 1:016x}"}
+
+    fake_server.add_route("GET", "/trees/tree/main", (200, {"type": "BRANCH", "name": "main", "hash": "0000000000000000"}))
+    fake_server.add_route("POST", "/trees/branch/main/commit", commit)
+    ops = (Delete(ContentKey(["t", str(i)])) for i in range(25))
+    progress: list = []
+    with _client(fake_server) as client:
+        stats = client.commit_bulk("main", ops, "onboard", "me", max_operations=10, progress=progress.append)
+    assert_that(stats.branch).is_equal_to(Branch("main", "0000000000000003"))
+    assert_that((stats.commits, stats.operations)).is_equal_to((3, 25))
+    assert_that([p.operations for p in progress]).is_equal_to([10, 20, 25])
+    commits = fake_server.requests_to("POST", "/trees/branch/main/commit")
+    assert_that([c.params["expectedHash"] for c in commits]).is_equal_to(["0000000000000000", "0000000000000001", "0000000000000002"])
+    assert_that(commits[2].body["operations"][0]).is_equal_to({"type": "DELETE", "key": {"elements": ["t", "20"]}})
+    assert_that(commits[0].body["commitMeta"]["author"]).is_equal_to("me")
+    assert_that(stats.bytes_sent).is_equal_to(sum(int(c.headers["Content-Length"]) for c in commits))
+
+    with _client(fake_server) as client:
+        stats = client.commit_bulk("main", [Delete(ContentKey(["t", str(i)])) for i in range(25)], max_bytes=1000)
+    assert_that(stats.commits).is_greater_than(1)
+    assert_that(
+        max(int(c.headers["Content-Length"]) for c in fake_server.requests_to("POST", "/trees/branch/main/commit")[3:])
+    ).is_less_than_or_equal_to(1000)
+
+
+def test_client_sends_encoded_bodies(fake_server: FakeNessieServer) -> None:
+    """Commits and assignments must send their JSON bodies as encoded by the client."""
+    fake_server.add_route("GET", "/trees/tree/dev", (200, {"type": "BRANCH", "name": "dev", "hash": "cafebabe"}))
+    fake_server.add_route("PUT", "/trees/branch/main", (204, None))
+    fake_server.add_route("POST", "/trees/branch/main/commit", (200, _MAIN))
+    with _client(fake_server) as client:
+        client.assign_branch("main", "dev", old_hash="1234567890abcdef")
+        client.commit("main", "1234567890abcdef", "msg", None, Delete(ContentKey(["a"])))
+    assign = fake_server.requests_to("PUT", "/trees/branch/main")[0]
+    assert_that(assign.body).is_equal_to({"type": "BRANCH", "name": "dev", "hash": "cafebabe", "metadata": None})
+    assert_that(assign.headers["Content-Type"]).is_equal_to("application/json")
+    commit = fake_server.requests_to("POST", "/trees/branch/main/commit")[0]
+    assert_that(commit.body["operations"]).is_equal_to([{"type": "DELETE", "key": {"elements": ["a"]}}])
+
+
+@pytest.mark.parametrize("codec", ["stdlib", "orjson"])
+def test_client_json_codecs(fake_server: FakeNessieServer, codec: str) -> None:
+    """Request and response bodies must be encoded and decoded the same way by every codec."""
+    if codec != "stdlib":
+        pytest.importorskip(codec)
+    fake_server.add_route("POST", "/contents", (200, {"contents": [{"key": {"elements": ["t1"]}, "content": _table("t1")}]}))
+    with _client(fake_server, **{"http.json": codec}) as client:
+        found = client.get_contents("main", [ContentKey(["t1"])])
+    assert_that(found[0].content).is_equal_to(IcebergTable("t1", "/t1", 1, 2, 3, 4))
+    assert_that(fake_server.requests_to("POST", "/contents")[0].body).is_equal_to({"requestedKeys": [{"elements": ["t1"]}]})
+
+
+def test_get_codec() -> None:
+    """The automatic choice must fall back to the standard library and unknown codecs must be rejected."""
+    assert_that(get_codec("stdlib")).is_same_as(STDLIB_CODEC)
+    assert_that(get_codec("auto").name).is_in("orjson", "stdlib")
+    with pytest.raises(NessieInvalidUsageException):
+        get_codec("simplejson")
+
+
+def test_client_get_log_lazily(fake_server: FakeNessieServer) -> None:
+    """Lazy logs must follow the pages like eager ones."""
+
+    def log_page(request: RecordedRequest) -> tuple:
+        page = int(request.params.get("pageToken", "0"))
+        entries = [{"commitMeta": {"hash": f"{page}{i}" * 4, "commitTime": "2022-06-01T10:00:00Z"}} for i in range(2)]
+        return 200, {"logEntries": entries, "hasMore": page == 0, "token": str(page + 1)}
+
+    fake_server.add_route("GET", "/trees/tree/main/log", log_page)
+    with _client(fake_server) as client:
+        lazy = list(client.get_log("main", lazy=True))
+        eager = list(client.get_log("main"))
+    assert_that([e.commit_meta.hash_ for e in lazy]).is_equal_to(["00000000", "01010101", "10101010", "11111111"])
+    assert_that(lazy).is_equal_to(eager)
+
+
+def test_client_raw_responses(fake_server: FakeNessieServer) -> None:
+    """Raw reads must return the server documents without validating them."""
+    entries = b'{"entries": [{"type": "NOT_A_TYPE", "name": {"elements": ["a"]}}], "hasMore": false}'
+    fake_server.add_route("GET", "/trees/tree/main/entries", (200, entries))
+    fake_server.add_route("GET", "/contents/a", (200, {"type": "ICEBERG_TABLE", "id": "1"}))
+    with _client(fake_server) as client:
+        page = client.list_keys("main", raw=True)
+        content = client.get_content("main", ContentKey(["a"]), raw=True)
+    assert_that(page).is_instance_of(RawJson)
+    assert_that(page.content).is_equal_to(entries)
+    assert_that(page["entries"][0]["type"]).is_equal_to("NOT_A_TYPE")
+    assert_that(dict(content)).is_equal_to({"type": "ICEBERG_TABLE", "id": "1"})
+
+
+def test_client_get_log_raw_pages(fake_server: FakeNessieServer) -> None:
+    """Raw logs must yield the pages of the server and stop once max_records entries were returned."""
+
+    def log_page(request: RecordedRequest) -> tuple:
+        page = int(request.params.get("pageToken", "0"))
+        return 200, {"logEntries": [{"commitMeta": {"hash": f"{page}{i}"}} for i in range(2)], "hasMore": True, "token": str(page + 1)}
+
+    fake_server.add_route("GET", "/trees/tree/main/log", log_page)
+    with _client(fake_server) as client:
+        pages = list(client.get_log("main", max_records=3, raw=True))
+    assert_that([[e["commitMeta"]["hash"] for e in p["logEntries"]] for p in pages]).is_equal_to([["00", "01"], ["10", "11"]])
+    assert_that([r.params.get("maxRecords") for r in fake_server.requests_to("GET", "/trees/tree/main/log")]).is_equal_to(["3", "1"])
+
+
+def test_client_streams_raw_pages(fake_server: FakeNessieServer) -> None:
+    """Streamed raw pages must be written unchanged and give their connection back before the next page is fetched."""
+    pages = [b'{"logEntries": [{"commitMeta": {"hash": "00"}}], "hasMore": true, "token": "1"}', b'{"logEntries": [], "hasMore": false}']
+    fake_server.add_route("GET", "/trees/tree/main/log", lambda request: (200, pages[int(request.params.get("pageToken", "0"))]))
+    out = io.BytesIO()
+    with _client(fake_server) as client:
+        for page in client.get_log("main", raw=True, stream=True):
+            page.write_to(out)
+        assert_that(next(client.get_log("main", raw=True, stream=True)).content).is_equal_to(pages[0])
+    assert_that(out.getvalue()).is_equal_to(b"".join(pages))
+    assert_that(fake_server.client_ports()).is_length(1)
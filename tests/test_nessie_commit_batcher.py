@@ -0,0 +1,92 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for `CommitBatcher`."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+from assertpy import assert_that
+
+from pynessie.client import CommitBatcher, NessieClient
+from pynessie.client._commit_batcher import _Submission, split_into_commits
+from pynessie.conf import build_config
+from pynessie.error import NessieNotFoundException
+from pynessie.model import Branch, ContentKey, Delete
+
+from .fake_server import FakeNessieServer, RecordedRequest
+
+
+def _client(server: FakeNessieServer) -> NessieClient:
+    return NessieClient(build_config({"endpoint": server.url}))
+
+
+def _serve_branch(fake_server: FakeNessieServer) -> None:
+    heads = ["0000000000000000"]
+
+    def commit(request: RecordedRequest) -> tuple:
+        heads.append(f"{len(heads):016x}")
+        return 200, {"type": "BRANCH", "name": "main", "hash": heads[-1]}
+
+    fake_server.add_route("GET", "/trees/tree/main", lambda _: (200, {"type": "BRANCH", "name": "main", "hash": heads[-1]}))
+    fake_server.add_route("POST", "/trees/branch/main/commit", commit)
+
+
+def _committed_keys(fake_server: FakeNessieServer) -> list:
+    commits = fake_server.requests_to("POST", "/trees/branch/main/commit")
+    return [[".".join(op["key"]["elements"]) for op in c.body["operations"]] for c in commits]
+
+
+def test_split_into_commits() -> None:
+    """Submissions must share a commit unless they change the same key, which keeps their order."""
+    submissions = [_Submission([Delete(ContentKey([k])) for k in keys], Future()) for keys in ["a", "bc", "a", "d", "ca"]]
+    commits = split_into_commits(submissions)
+    assert_that([[s.ops[0].key.elements[0] for s in c] for c in commits]).is_equal_to([["a", "b", "d"], ["a"], ["c"]])
+
+
+def test_commit_batcher_coalesces_producers(fake_server: FakeNessieServer) -> None:
+    """Operations of many threads must be committed together and every producer must see the resulting branch."""
+    _serve_branch(fake_server)
+    with _client(fake_server) as client:
+        with CommitBatcher(client, "main", "batch", flush_interval_sec=60, max_operations=20) as batcher:
+            with ThreadPoolExecutor(8) as pool:
+                futures = list(pool.map(lambda i: batcher.submit(Delete(ContentKey(["t", str(i)]))), range(20)))
+            branches = [f.result(timeout=10) for f in futures]
+    assert_that(branches).is_equal_to([Branch("main", "0000000000000001")] * 20)
+    assert_that(_committed_keys(fake_server)).is_length(1)
+    assert_that(sorted(_committed_keys(fake_server)[0])).is_equal_to(sorted(f"t.{i}" for i in range(20)))
+    assert_that(fake_server.requests_to("POST", "/trees/branch/main/commit")[0].body["commitMeta"]["message"]).is_equal_to("batch")
+
+
+def test_commit_batcher_splits_conflicting_operations(fake_server: FakeNessieServer) -> None:
+    """Operations on the same key must end up in consecutive commits, in the order they were submitted."""
+    _serve_branch(fake_server)
+    with _client(fake_server) as client:
+        with CommitBatcher(client, "main", flush_interval_sec=60) as batcher:
+            first = batcher.submit(Delete(ContentKey(["a"])), Delete(ContentKey(["b"])))
+            second = batcher.submit(Delete(ContentKey(["a"])))
+            third = batcher.submit(Delete(ContentKey(["c"])))
+    assert_that(_committed_keys(fake_server)).is_equal_to([["a", "b", "c"], ["a"]])
+    assert_that(first.result().hash_).is_equal_to(third.result().hash_)
+    assert_that(second.result().hash_).is_equal_to("0000000000000002")
+
+
+def test_commit_batcher_fails_futures(fake_server: FakeNessieServer) -> None:
+    """A failed commit must fail the futures of all operations in it."""
+    fake_server.add_route("GET", "/trees/tree/main", (200, {"type": "BRANCH", "name": "main", "hash": "0000000000000000"}))
+    with _client(fake_server) as client:
+        with CommitBatcher(client, "main", flush_interval_sec=0.01) as batcher:
+            future = batcher.submit(Delete(ContentKey(["a"])))
+            with pytest.raises(NessieNotFoundException):
+                future.result(timeout=10)
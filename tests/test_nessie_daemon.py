@@ -0,0 +1,181 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the forwarding of CLI commands to `nessie daemon`."""
+
+import io
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Iterator
+
+import click
+import pytest
+from assertpy import assert_that
+
+from pynessie import cli
+from pynessie.daemon import daemon_status, forward, serve, stop_daemon
+
+from .conftest import execute_cli_command
+from .fake_server import FakeNessieServer
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "getuid"), reason="the daemon listens on a Unix socket")
+
+
+@pytest.fixture(name="daemon_socket")
+def _daemon_socket(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    """Run a daemon on a socket in a temporary directory, which is also the config directory of its clients."""
+    path = str(tmp_path / "nessie.sock")
+    monkeypatch.setenv("NESSIE_DAEMON_SOCKET", path)
+    monkeypatch.setenv("NESSIEDIR", str(tmp_path))
+    server = threading.Thread(target=serve, args=(path, cli.cli))
+    server.start()
+    while daemon_status(path) is None:
+        assert_that(server.is_alive()).is_true()
+    yield path
+    stop_daemon(path)
+    server.join()
+    assert_that(os.path.exists(path)).is_false()
+
+
+def test_serve_keeps_other_files(tmp_path: Path) -> None:
+    """A file at the socket path must not be replaced by the daemon."""
+    path = tmp_path / "nessie.sock"
+    path.write_text("data")
+    with pytest.raises(click.ClickException):
+        serve(str(path), cli.cli)
+    assert_that(path.read_text()).is_equal_to("data")
+
+
+def _references(fake_server: FakeNessieServer) -> None:
+    fake_server.add_route("GET", "/trees", (200, {"references": [{"type": "BRANCH", "name": "main", "hash": "beef"}], "hasMore": False}))
+    fake_server.add_route("GET", "/trees/tree", (200, {"type": "BRANCH", "name": "main", "hash": "beef"}))
+
+
+def test_forward_reuses_client(daemon_socket: str, fake_server: FakeNessieServer, capsysbinary: pytest.CaptureFixture) -> None:
+    """Forwarded commands must print what the in-process command prints and share one client per configuration."""
+    _references(fake_server)
+    args = ["--endpoint", fake_server.url, "branch", "-l"]
+    expected = execute_cli_command(args)
+    capsysbinary.readouterr()
+    for _ in range(3):
+        assert_that(forward(args, path=daemon_socket)).is_equal_to(0)
+        assert_that(capsysbinary.readouterr().out.decode()).is_equal_to(expected)
+    status = daemon_status(daemon_socket)
+    assert status is not None
+    assert_that(status).contains_entry({"commands": 3}, {"clients": 1})
+    # every in-process command opens its own connection, the daemon keeps one open for all its commands
+    assert_that(fake_server.client_ports()).is_length(2)
+
+    assert_that(forward(["--endpoint", fake_server.url, "--json", "branch", "-l"], path=daemon_socket)).is_equal_to(0)
+    assert_that(daemon_status(daemon_socket)).contains_entry({"clients": 1})
+    assert_that(forward(["--auth-token", "other", "--endpoint", fake_server.url, "branch", "-l"], path=daemon_socket)).is_equal_to(0)
+    assert_that(daemon_status(daemon_socket)).contains_entry({"clients": 2})
+
+
+def test_forward_exit_code_and_stderr(daemon_socket: str, capsysbinary: pytest.CaptureFixture) -> None:
+    """Errors of forwarded commands must reach stderr and the exit code of the script."""
+    assert_that(forward(["no-such-command"], path=daemon_socket)).is_equal_to(2)
+    assert_that(capsysbinary.readouterr().err.decode()).contains("No such command 'no-such-command'")
+
+
+def test_main_runs_in_process_without_daemon(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fake_server: FakeNessieServer, capsys: pytest.CaptureFixture
+) -> None:
+    """Without a running daemon, and for the commands that manage the config, the script must run the command itself."""
+    _references(fake_server)
+    monkeypatch.setenv("NESSIE_DAEMON_SOCKET", str(tmp_path / "missing.sock"))
+    monkeypatch.setattr(sys, "argv", ["nessie", "--endpoint", fake_server.url, "branch", "-l"])
+    with pytest.raises(SystemExit) as e:
+        cli.main()
+    assert_that(e.value.code).is_equal_to(0)
+    assert_that(capsys.readouterr().out).contains("main")
+
+
+_TABLE = b'{"type": "ICEBERG_TABLE", "id": "t", "metadataLocation": "/t", "snapshotId": 1, "schemaId": 2, "specId": 3, "sortOrderId": 4}'
+
+
+def _run_main(monkeypatch: pytest.MonkeyPatch, args: list, stdin: bytes) -> None:
+    monkeypatch.setattr(sys, "argv", ["nessie", *args])
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(stdin), encoding="utf-8"))
+    with pytest.raises(SystemExit) as e:
+        cli.main()
+    assert_that(e.value.code).is_equal_to(0)
+
+
+def test_main_forwards_stdin_of_commit(
+    daemon_socket: str, monkeypatch: pytest.MonkeyPatch, fake_server: FakeNessieServer, capsysbinary: pytest.CaptureFixture
+) -> None:
+    """The content read from stdin must be forwarded, also when its flag is combined with other short flags."""
+    fake_server.add_route("POST", "/trees/branch/main/commit", (200, {"type": "BRANCH", "name": "main", "hash": "cafe"}))
+    _run_main(
+        monkeypatch, ["--endpoint", fake_server.url, "content", "commit", "-is", "-m", "msg", "-c", "beef", "-r", "main", "t"], _TABLE
+    )
+    assert_that(capsysbinary.readouterr().out.decode()).contains("Changes have been committed.")
+    assert_that(daemon_status(daemon_socket)).contains_entry({"commands": 1})
+    operation = fake_server.requests_to("POST", "/trees/branch/main/commit")[0].body["operations"][0]
+    assert_that(operation["content"]).contains_entry({"metadataLocation": "/t"})
+
+
+def test_main_runs_editor_in_process(daemon_socket: str, monkeypatch: pytest.MonkeyPatch, fake_server: FakeNessieServer) -> None:
+    """Commands that start an editor must run in-process, where the editor can use the terminal."""
+    fake_server.add_route("POST", "/trees/branch/main/commit", (200, {"type": "BRANCH", "name": "main", "hash": "cafe"}))
+    monkeypatch.setattr("click.edit", lambda *_, **__: "edited message")
+    _run_main(monkeypatch, ["--endpoint", fake_server.url, "content", "commit", "-i", "-c", "beef", "-r", "main", "t"], _TABLE)
+    assert_that(daemon_status(daemon_socket)).contains_entry({"commands": 0})
+    commit = fake_server.requests_to("POST", "/trees/branch/main/commit")[0]
+    assert_that(commit.body["commitMeta"]).contains_entry({"message": "edited message"})
+
+
+class _Arrivals(io.BytesIO):
+    """Output stream that tells when the first output has arrived."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.arrived = threading.Event()
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        self.arrived.set()
+        return super().write(data)
+
+
+def test_forward_streams_output(tmp_path: Path) -> None:
+    """The output of a command must reach the script while the command still runs."""
+    out = _Arrivals()
+
+    @click.command()
+    def produce() -> None:
+        click.echo("x" * 100_000)
+        assert_that(out.arrived.wait(5)).is_true()
+        click.echo("done")
+
+    path = str(tmp_path / "nessie.sock")
+    server = threading.Thread(target=serve, args=(path, produce))
+    server.start()
+    while daemon_status(path) is None:
+        assert_that(server.is_alive()).is_true()
+    try:
+        assert_that(forward([], path=path, out=out, err=io.BytesIO())).is_equal_to(0)
+    finally:
+        stop_daemon(path)
+        server.join()
+    assert_that(out.getvalue().decode()).is_equal_to("x" * 100_000 + "\ndone\n")
+
+
+def test_daemon_status(daemon_socket: str) -> None:
+    """The status must list the counters of the running daemon, as JSON with the --json option of the group."""
+    assert_that(execute_cli_command(["daemon", "status"])).contains(f"Socket: {daemon_socket}", "Commands: 0")
+    assert_that(json.loads(execute_cli_command(["--json", "daemon", "status"]))).contains_entry({"commands": 0})
@@ -0,0 +1,200 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Equivalence of the fast decoders in `pynessie.decoders` and encoders in `pynessie.encoders` with the marshmallow schemas."""
+
+import json
+from typing import Any, Callable
+
+import pytest
+from assertpy import assert_that
+from marshmallow import Schema, ValidationError
+from marshmallow_oneofschema import OneOfSchema
+
+from pynessie.decoders import load, load_log_lazily, loader
+from pynessie.encoders import dump
+from pynessie.model import (
+    Branch,
+    CommitMeta,
+    CommitMetaSchema,
+    ContentSchema,
+    DiffResponseSchema,
+    EntriesSchema,
+    GetMultipleContentsResponseSchema,
+    IcebergTable,
+    LogEntry,
+    LogResponseSchema,
+    MergeResponseSchema,
+    MultiContentSchema,
+    ReferenceSchema,
+    ReferencesResponseSchema,
+)
+
+_NEXT_PAGE = "page-2"
+_ICEBERG = {"type": "ICEBERG_TABLE", "id": "1", "metadataLocation": "/a", "snapshotId": 1, "schemaId": 2, "specId": 3, "sortOrderId": 4}
+_DELTA = {"type": "DELTA_LAKE_TABLE", "id": "2", "lastCheckpoint": "c", "checkpointLocationHistory": ["x"], "metadataLocationHistory": []}
+_VIEW = {"type": "ICEBERG_VIEW", "id": "3", "metadataLocation": "/v", "versionId": 1, "schemaId": 2, "dialect": "SPARK", "sqlText": "x"}
+_NAMESPACE = {"type": "NAMESPACE", "id": None, "elements": ["a", "b"]}
+_META = {
+    "hash": "cafebabe",
+    "committer": "c",
+    "author": "a",
+    "signedOffBy": None,
+    "message": "m",
+    "commitTime": "2022-06-01T10:00:00.123456789Z",
+    "authorTime": "2022-06-01T12:00:00+02:00",
+    "properties": {"k": "v"},
+}
+_LOG_ENTRY = {
+    "commitMeta": _META,
+    "parentCommitHash": "deadbeef",
+    "operations": [
+        {"type": "PUT", "key": {"elements": ["a", "b"]}, "content": _ICEBERG, "expectedContent": _ICEBERG},
+        {"type": "DELETE", "key": {"elements": ["c"]}},
+        {"type": "UNCHANGED", "key": {"elements": ["d"]}},
+    ],
+}
+_REFERENCE_METADATA = {
+    "commitMetaOfHEAD": _META,
+    "numCommitsAhead": 1,
+    "numCommitsBehind": None,
+    "commonAncestorHash": "cafebabe",
+    "numTotalCommits": 3,
+}
+
+_VALID = [(ContentSchema, content) for content in (_ICEBERG, _DELTA, _VIEW, _NAMESPACE)] + [
+    (ReferenceSchema, {"type": "BRANCH", "name": "main", "hash": "cafebabe"}),
+    (ReferenceSchema, {"type": "TAG", "name": "v1", "hash": None, "metadata": _REFERENCE_METADATA}),
+    (ReferenceSchema, {"type": "DETACHED", "name": "DETACHED", "hash": "cafebabe", "metadata": None}),
+    (ReferencesResponseSchema, {"references": [{"type": "BRANCH", "name": "main"}], "hasMore": True, "token": _NEXT_PAGE}),
+    (EntriesSchema, {"entries": [{"type": "ICEBERG_TABLE", "name": {"elements": ["a"]}}], "hasMore": False}),
+    (LogResponseSchema, {"logEntries": [_LOG_ENTRY, {"commitMeta": {"hash": "cafebabe"}, "operations": None}], "hasMore": False}),
+    (DiffResponseSchema, {"diffs": [{"key": {"elements": ["a"]}, "from": None, "to": _ICEBERG}], "hasMore": False}),
+    (GetMultipleContentsResponseSchema, {"contents": [{"key": {"elements": ["a"]}, "content": _DELTA}]}),
+    (MultiContentSchema, {"commitMeta": {"message": "m"}, "operations": _LOG_ENTRY["operations"]}),
+    (
+        MergeResponseSchema,
+        {
+            "targetBranch": "main",
+            "effectiveTargetHash": "cafebabe",
+            "sourceCommits": [_LOG_ENTRY],
+            "details": [
+                {
+                    "key": {"elements": ["a"]},
+                    "mergeBehavior": "NORMAL",
+                    "conflictType": "NONE",
+                    "sourceCommits": ["cafebabe"],
+                    "targetCommits": [None],
+                }
+            ],
+            "resultantTargetHash": None,
+            "commonAncestor": None,
+            "expectedHash": None,
+            "targetCommits": None,
+            "wasApplied": True,
+            "wasSuccessful": True,
+        },
+    ),
+]
+
+_INVALID = [
+    (ReferenceSchema, {"type": "BRANCH", "name": "main", "unknown": 1}),
+    (ReferenceSchema, {"name": "main"}),
+    (ReferenceSchema, {"type": "REMOTE", "name": "main"}),
+    (ReferenceSchema, {"type": "BRANCH", "name": None}),
+    (ReferenceSchema, {"type": "BRANCH", "name": 1}),
+    (ReferenceSchema, ["main"]),
+    (ContentSchema, dict(_ICEBERG, snapshotId="5")),
+    (ContentSchema, dict(_ICEBERG, snapshotId=True)),
+    (ContentSchema, dict(_ICEBERG, snapshotId=1.5)),
+    (ContentSchema, {"type": "ICEBERG_TABLE", "id": "1"}),
+    (EntriesSchema, {"entries": {"type": "ICEBERG_TABLE"}}),
+    (EntriesSchema, {"entries": [], "hasMore": "true"}),
+    (LogResponseSchema, {"logEntries": [{"commitMeta": dict(_META, commitTime="2022-06-01")}]}),
+    (LogResponseSchema, {"logEntries": [{"commitMeta": dict(_META, commitTime="20220601T100000")}]}),
+    (LogResponseSchema, {"logEntries": [{"commitMeta": dict(_META, commitTime="2022-06-01T10:00:00,123Z")}]}),
+    (LogResponseSchema, {"logEntries": [{"commitMeta": dict(_META, commitTime="2022-06-01T10:00:00 +02:00")}]}),
+    (LogResponseSchema, {"logEntries": [{"commitMeta": dict(_META, commitTime=None)}]}),
+    (LogResponseSchema, {"logEntries": [{"commitMeta": dict(_META, properties=[])}]}),
+]
+
+
+def _outcome(decode: Callable[[], Any]) -> Any:
+    try:
+        return decode()
+    except Exception as e:  # pylint: disable=W0703
+        return type(e), getattr(e, "messages", str(e))
+
+
+@pytest.mark.parametrize(("schema", "data"), _VALID + _INVALID)
+def test_decoders_match_marshmallow(schema: type, data: Any) -> None:
+    """Fast decoders must produce the same objects, and the same errors, as the marshmallow schemas."""
+    assert_that(_outcome(lambda: load(schema, data))).is_equal_to(_outcome(lambda: schema().load(data)))
+
+
+@pytest.mark.parametrize(("schema", "data"), _VALID)
+def test_decoders_decode_valid_documents_without_marshmallow(schema: type, data: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Valid documents must not need the marshmallow fallback."""
+    expected = schema().load(data)
+    for schema_class in (Schema, OneOfSchema):
+        monkeypatch.setattr(schema_class, "load", lambda *_, **__: pytest.fail("marshmallow fallback used"))
+    assert_that(loader(schema)(data)).is_equal_to(expected)
+
+
+def test_lazy_log_entries_match_eager_ones() -> None:
+    """Lazily decoded log entries must equal the eagerly decoded ones and only decode the fields that are accessed."""
+    data = {"logEntries": [_LOG_ENTRY, {"commitMeta": {"hash": "deadbeef"}}], "hasMore": True, "token": _NEXT_PAGE}
+    logs = load_log_lazily(data)
+    entry = logs.log_entries[0]
+    assert_that(entry).is_instance_of(LogEntry)
+    assert_that(entry.commit_meta.hash_).is_equal_to("cafebabe")
+    assert_that(vars(entry)).does_not_contain_key("operations")
+    assert_that(vars(entry.commit_meta)).does_not_contain_key("commitTime")
+    assert_that(logs).is_equal_to(LogResponseSchema().load(data))
+    assert_that(LogResponseSchema().load(data)).is_equal_to(logs)
+
+
+def test_lazy_log_entries_report_invalid_fields_on_access() -> None:
+    """Invalid fields must raise marshmallow's error when accessed, responses that are not logs must be decoded eagerly."""
+    entry = load_log_lazily({"logEntries": [{"commitMeta": dict(_META, commitTime="yesterday")}]}).log_entries[0]
+    assert_that(entry.commit_meta.message).is_equal_to("m")
+    with pytest.raises(ValidationError):
+        _ = entry.commit_meta.commitTime
+    with pytest.raises(TypeError):
+        load_log_lazily({"logEntries": [{"parentCommitHash": "cafebabe"}]})
+
+
+_UNUSUAL_OBJECTS = [
+    (ContentSchema, IcebergTable("1", "/a", "5", 2, 3, 4)),  # type: ignore[arg-type]
+    (ContentSchema, Branch("main")),
+    (ReferenceSchema, "main"),
+    (MultiContentSchema, {"commitMeta": CommitMeta(), "operations": []}),
+    (CommitMetaSchema, CommitMeta(commitTime="2022-06-01")),  # type: ignore[arg-type]
+]
+
+
+@pytest.mark.parametrize(("schema", "data"), _VALID)
+def test_encoders_match_marshmallow(schema: type, data: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Fast encoders must produce the documents of the marshmallow schemas, with the same key order, without falling back."""
+    obj = schema().load(data)
+    expected = json.dumps(schema().dump(obj))
+    for schema_class in (Schema, OneOfSchema):
+        monkeypatch.setattr(schema_class, "dump", lambda *_, **__: pytest.fail("marshmallow fallback used"))
+    assert_that(json.dumps(dump(schema, obj))).is_equal_to(expected)
+
+
+@pytest.mark.parametrize(("schema", "obj"), _UNUSUAL_OBJECTS)
+def test_encoders_fall_back_to_marshmallow(schema: type, obj: Any) -> None:
+    """Values and objects of unexpected types must be encoded, or rejected, exactly as by the marshmallow schemas."""
+    assert_that(_outcome(lambda: dump(schema, obj))).is_equal_to(_outcome(lambda: schema().dump(obj)))
@@ -14,9 +14,11 @@
 #
 """Test Nessie models."""
 
+import attr
+import pytest
 from assertpy import assert_that
 
-from pynessie.model import ContentKey
+from pynessie.model import ContentKey, Entry, EntryName, EntrySchema
 
 
 def test_content_key_to_string() -> None:
@@ -49,3 +51,16 @@ def test_content_key_to_path_string() -> None:
     assert_that(ContentKey(["a.b", "c", "d"]).to_path_string()).is_equal_to("a\x1db.c.d")
     assert_that(ContentKey(["a.b", "c", "d.e"]).to_path_string()).is_equal_to("a\x1db.c.d\x1de")
     assert_that(ContentKey(["a", "b.c", "d"]).to_path_string()).is_equal_to("a.b\x1dc.d")
+
+
+def test_entries_are_compact_and_hashable() -> None:
+    """Test that keys and entries are slotted, immutable and hashable, sharing the strings of their elements."""
+    entry = '{"type": "ICEBERG_TABLE", "name": {"elements": ["db", "t%d"]}}'
+    entries = EntrySchema(many=True).loads(f"[{entry % 1}, {entry % 2}]")
+    assert_that(entries[0].name.elements).is_equal_to(("db", "t1"))
+    assert_that(entries[0].name.elements[0]).is_same_as(entries[1].name.elements[0])
+    assert_that({ContentKey(["a", "b"]), ContentKey(("a", "b"))}).is_length(1)
+    assert_that(set(entries)).contains(Entry("ICEBERG_TABLE", EntryName(["db", "t2"])))
+    assert_that(hasattr(entries[0], "__dict__")).is_false()
+    with pytest.raises(attr.exceptions.FrozenInstanceError):
+        entries[0].kind = "NAMESPACE"  # type: ignore[misc]
@@ -0,0 +1,65 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Tests for the interactive `nessie shell`."""
+
+from assertpy import assert_that
+from pytest_mock import MockerFixture
+
+from pynessie import init
+from pynessie.client import NessieClient
+from pynessie.commands.shell import ShellCompleter
+
+from .conftest import execute_cli_command_raw
+from .fake_server import FakeNessieServer
+
+_MAIN = {"type": "BRANCH", "name": "main", "hash": "beef"}
+
+
+def _references(fake_server: FakeNessieServer) -> None:
+    fake_server.add_route("GET", "/trees", (200, {"references": [_MAIN, {"type": "TAG", "name": "v1", "hash": "cafe"}], "hasMore": False}))
+    fake_server.add_route("GET", "/trees/tree", (200, _MAIN))
+
+
+def test_shell_runs_commands_with_one_client(fake_server: FakeNessieServer, mocker: MockerFixture) -> None:
+    """The commands of a shell must share one client and its reference cache, errors must not end the shell."""
+    _references(fake_server)
+    clients = mocker.spy(NessieClient, "__init__")
+    lines = ["branch -l", "branch -l", "no-such-command", "shell", "content view", "", "exit", "branch -l"]
+    result = execute_cli_command_raw(["--endpoint", fake_server.url, "shell"], input_data="\n".join(lines) + "\n")
+    assert_that(result.stdout.count("* main")).is_equal_to(2)
+    # the default branch is resolved once, the second listing only fetches the references
+    assert_that(result.stderr).contains("2 requests\n", "1 request\n")
+    assert_that(result.stderr).contains("No such command 'no-such-command'", "'shell' is not available in the shell", "Missing argument")
+    assert_that(fake_server.requests_to("GET", "/trees")).is_length(2)
+    assert_that(fake_server.client_ports()).is_length(1)
+    assert_that(clients.call_count).is_equal_to(1)
+
+
+def test_shell_completer(fake_server: FakeNessieServer) -> None:
+    """Commands, references and keys must be completed, each listing must be fetched only once."""
+    _references(fake_server)
+    fake_server.add_route(
+        "GET", "/trees/tree/v1/entries", (200, {"entries": [{"type": "ICEBERG_TABLE", "name": {"elements": ["a", "b"]}}]})
+    )
+    fake_server.add_route("GET", "/trees/tree/main/entries", (200, {"entries": [{"type": "ICEBERG_TABLE", "name": {"elements": ["c"]}}]}))
+    with init(config_dict={"endpoint": fake_server.url}) as client:
+        completer = ShellCompleter(client, ["branch", "content", "log"])
+        assert_that(completer.candidates("", "")).is_equal_to(["branch", "content", "log"])
+        assert_that(completer.candidates("", "co")).is_equal_to(["content"])
+        assert_that(completer.candidates("content view -r v1 ", "")).is_equal_to(["a.b", "main", "v1"])
+        assert_that(completer.candidates("content view -r v1 ", "a")).is_equal_to(["a.b"])
+        assert_that(completer.candidates("log ", "")).is_equal_to(["c", "main", "v1"])
+    assert_that(fake_server.requests_to("GET", "/trees")).is_length(1)
+    assert_that(fake_server.requests_to("GET", "/trees/tree/v1/entries")).is_length(1)
@@ -0,0 +1,60 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Benchmark building configurations and clients, with the config files parsed every time and parsed once."""
+
+import argparse
+import time
+from typing import Callable
+
+from pynessie.client import NessieClient
+from pynessie.conf import build_config
+from pynessie.conf.config_parser import forget_parsed_files
+
+
+def _mean_us(run: Callable[[], None], count: int) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        run()
+    return (time.perf_counter() - started) / count * 1e6
+
+
+def main() -> None:
+    """Print the mean times to build a configuration and to construct a client from it."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1000, help="number of configurations and clients to build")
+    args = parser.parse_args()
+
+    def build() -> None:
+        build_config({"endpoint": "http://localhost:19120/api/v1"})
+
+    def construct() -> None:
+        NessieClient(build_config({"endpoint": "http://localhost:19120/api/v1"})).close()
+
+    def uncached(run: Callable[[], None]) -> Callable[[], None]:
+        def forget_and_run() -> None:
+            forget_parsed_files()
+            run()
+
+        return forget_and_run
+
+    print(f"{'':<20}{'parsed every time us':>22}{'parsed once us':>16}")
+    for name, run in (("build_config", build), ("NessieClient", construct)):
+        uncached_us = _mean_us(uncached(run), args.count)
+        cached_us = _mean_us(run, args.count)
+        print(f"{name:<20}{uncached_us:>22.0f}{cached_us:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
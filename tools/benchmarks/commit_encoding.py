@@ -0,0 +1,92 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Benchmark encoding the request body of a large commit, as the client used to do it and as it does it now.
+
+At first, the operations were dumped to a JSON string, parsed back into a dict by the transport and encoded again by
+requests ("before"). Then they were dumped once by the marshmallow schema, straight to bytes that requests sends as
+is ("schema"). Now the dumper of pynessie.encoders builds the same document without marshmallow ("dumper").
+"""
+
+import argparse
+import json
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from requests import PreparedRequest, Request
+
+from pynessie.client._json import STDLIB_CODEC
+from pynessie.encoders import dump
+from pynessie.model import (
+    CommitMeta,
+    ContentKey,
+    IcebergTable,
+    MultiContents,
+    MultiContentSchema,
+    Operation,
+    Put,
+)
+from tools.benchmarks.timing import best_ms
+
+
+def _operations(count: int) -> List[Operation]:
+    return [
+        Put(ContentKey(["lake", "db", f"table_{i}"]), IcebergTable(str(i), f"s3://lake/db/table_{i}/metadata.json", i, 1, 2, 3))
+        for i in range(count)
+    ]
+
+
+_URL = "http://localhost:19120/api/v1/trees/branch/main/commit"
+
+
+def _before(contents: MultiContents) -> PreparedRequest:
+    return Request("POST", _URL, json=json.loads(MultiContentSchema().dumps(contents))).prepare()
+
+
+def _schema(contents: MultiContents) -> PreparedRequest:
+    return Request("POST", _URL, data=STDLIB_CODEC.dumps(MultiContentSchema().dump(contents))).prepare()
+
+
+def _dumper(contents: MultiContents) -> PreparedRequest:
+    return Request("POST", _URL, data=STDLIB_CODEC.dumps(dump(MultiContentSchema, contents))).prepare()
+
+
+def _measure(encode: Callable[[MultiContents], PreparedRequest], contents: MultiContents, repeat: int) -> Tuple[float, int]:
+    best = best_ms(lambda: encode(contents), repeat)
+    tracemalloc.start()
+    encode(contents)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main() -> None:
+    """Print the encode time and the peak memory of the ways to encode a commit."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=10000, help="number of Put operations in the commit")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed runs, the best one is reported")
+    args = parser.parse_args()
+
+    contents = MultiContents(CommitMeta(message="benchmark"), _operations(args.operations))
+    paths = (("before", _before), ("schema", _schema), ("dumper", _dumper))
+    if len({json.dumps(json.loads(encode(contents).body or b"")) for _, encode in paths}) != 1:
+        raise AssertionError("all paths must produce the same commit")
+    print(f"{'path':<8}{'encode ms':>12}{'peak MiB':>12}")
+    for name, encode in paths:
+        millis, peak = _measure(encode, contents, args.repeat)
+        print(f"{name:<8}{millis:>12.1f}{peak / 1024 / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
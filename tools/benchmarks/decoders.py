@@ -0,0 +1,49 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Benchmark decoding log and entries responses with marshmallow, with the fast decoders of pynessie.decoders and lazily."""
+
+import argparse
+from typing import Any, Dict
+
+from pynessie.decoders import load_log_lazily, loader
+from pynessie.model import EntriesSchema, LogResponseSchema
+from tools.benchmarks.payloads import entries_page, log_page
+from tools.benchmarks.timing import best_ms
+
+
+def main() -> None:
+    """Print the decode times of both decoding paths."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10000, help="number of log entries and keys per response")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed runs, the best one is reported")
+    args = parser.parse_args()
+
+    responses: Dict[str, Any] = {"log": (LogResponseSchema, log_page(args.count)), "entries": (EntriesSchema, entries_page(args.count))}
+    print(f"{'payload':<10}{'marshmallow ms':>16}{'fast ms':>10}{'speedup':>10}")
+    for name, (schema, data) in responses.items():
+        fast = loader(schema)
+        if fast(data) != schema().load(data):
+            raise AssertionError(f"decoders disagree on the {name} response")
+        slow_ms = best_ms(lambda s=schema, d=data: s().load(d), args.repeat)  # type: ignore[misc]
+        fast_ms = best_ms(lambda f=fast, d=data: f(d), args.repeat)  # type: ignore[misc]
+        print(f"{name:<10}{slow_ms:>16.1f}{fast_ms:>10.1f}{slow_ms / fast_ms:>9.1f}x")
+
+    log = responses["log"][1]
+    lazy_ms = best_ms(lambda: [e.commit_meta.hash_ for e in load_log_lazily(log).log_entries], args.repeat)
+    print(f"{'log, lazily decoded, hashes only':<36}{lazy_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
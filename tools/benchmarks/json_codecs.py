@@ -0,0 +1,57 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Benchmark the installed JSON codecs on log and entries responses.
+
+Recorded responses, e.g. saved with ``curl "$NESSIE/trees/tree/main/log?fetch=ALL" > log.json``, can be passed via
+--log-file and --entries-file, otherwise responses of the same shape are generated.
+"""
+
+import argparse
+from typing import Any, Callable, Dict, List, Optional
+
+from pynessie.client._json import STDLIB_CODEC, JsonCodec, _orjson_codec
+from tools.benchmarks.payloads import entries_page, log_page
+from tools.benchmarks.timing import best_ms
+
+
+def _payload(path: Optional[str], generate: Callable[[int], Dict[str, Any]], count: int) -> bytes:
+    if path:
+        with open(path, "rb") as f:
+            return f.read()
+    return STDLIB_CODEC.dumps(generate(count))
+
+
+def main() -> None:
+    """Print the decode and encode times of every installed codec."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--log-file", help="recorded response of the log endpoint")
+    parser.add_argument("--entries-file", help="recorded response of the entries endpoint")
+    parser.add_argument("--count", type=int, default=10000, help="number of generated log entries and keys")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed runs, the best one is reported")
+    args = parser.parse_args()
+
+    codecs: List[JsonCodec] = [c for c in (STDLIB_CODEC, _orjson_codec()) if c is not None]
+    payloads = {"log": _payload(args.log_file, log_page, args.count), "entries": _payload(args.entries_file, entries_page, args.count)}
+    print(f"{'payload':<10}{'MiB':>8}{'codec':>10}{'decode ms':>12}{'encode ms':>12}")
+    for name, payload in payloads.items():
+        document = STDLIB_CODEC.loads(payload)
+        for codec in codecs:
+            decode = best_ms(lambda c=codec, p=payload: c.loads(p), args.repeat)  # type: ignore[misc]
+            encode = best_ms(lambda c=codec, d=document: c.dumps(d), args.repeat)  # type: ignore[misc]
+            print(f"{name:<10}{len(payload) / 1024 / 1024:>8.1f}{codec.name:>10}{decode:>12.1f}{encode:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
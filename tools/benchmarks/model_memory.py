@@ -0,0 +1,59 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Benchmark the memory held by the Entry objects of a large listing of distinct keys, decoded page by page as by iter_keys."""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import List
+
+from pynessie.decoders import load
+from pynessie.model import EntriesSchema, Entry
+from tools.benchmarks.payloads import listing_page
+
+
+def main() -> None:
+    """Print the memory retained by the decoded entries of a synthetic listing."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000, help="number of keys in the listing")
+    parser.add_argument("--page-size", type=int, default=10_000, help="number of keys per response page")
+    args = parser.parse_args()
+
+    gc.collect()
+    tracemalloc.start()
+    elapsed = 0.0
+    entries: List[Entry] = []
+    for first in range(0, args.count, args.page_size):
+        # every page holds other keys and is decoded from its own JSON body, as with a server
+        body = json.dumps(listing_page(first, min(args.page_size, args.count - first))).encode("utf-8")
+        started = time.perf_counter()
+        entries.extend(load(EntriesSchema, json.loads(body)).entries)
+        elapsed += time.perf_counter() - started
+    del body
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{'entries':<24}{len(entries):>12}")
+    print(f"{'decode s':<24}{elapsed:>12.1f}")
+    print(f"{'retained MiB':<24}{retained / 2**20:>12.1f}")
+    print(f"{'peak MiB':<24}{peak / 2**20:>12.1f}")
+    print(f"{'bytes per entry':<24}{retained / len(entries):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# Copyright (C) 2020 Dremio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Responses of the shape and size the benchmarks decode, as returned by a Nessie server."""
+
+import random
+from typing import Any, Dict
+
+
+def log_page(count: int) -> Dict[str, Any]:
+    """Return a log response with 'count' entries of one Put operation each, as returned with fetch=ALL."""
+    entries = []
+    for i in range(count):
+        key = {"elements": ["lake", "db", f"table_{i}"]}
+        table = {
+            "type": "ICEBERG_TABLE",
+            "id": str(i),
+            "metadataLocation": f"s3://lake/t{i}.json",
+            "snapshotId": i,
+            "schemaId": 1,
+            "specId": 0,
+            "sortOrderId": 0,
+        }
+        entries.append(
+            {
+                "commitMeta": {
+                    "hash": f"{i:064x}",
+                    "committer": "nessie",
+                    "author": "ingest",
+                    "message": f"commit {i}",
+                    "commitTime": "2022-06-01T10:00:00.000000Z",
+                    "authorTime": "2022-06-01T10:00:00.000000Z",
+                    "properties": {"application": "spark"},
+                },
+                "parentCommitHash": f"{i + 1:064x}",
+                "operations": [{"type": "PUT", "key": key, "content": table}],
+            }
+        )
+    return {"logEntries": entries, "hasMore": False}
+
+
+def entries_page(count: int) -> Dict[str, Any]:
+    """Return an entries response with 'count' Iceberg tables."""
+    return {
+        "entries": [{"type": "ICEBERG_TABLE", "name": {"elements": ["lake", "db", f"table_{i}"]}} for i in range(count)],
+        "hasMore": False,
+    }
+
+
+def listing_page(first: int, count: int, namespaces: int = 2_000) -> Dict[str, Any]:
+    """Return page 'first // count' of a listing of distinct Iceberg tables spread over 'namespaces' namespaces.
+
+    As in a warehouse, the namespaces are databases of a few catalogs and their sizes are skewed, the number of
+    tables in a namespace falls roughly with its rank as in Zipf's law. The page is the same for the same arguments.
+    """
+    rng = random.Random(first)  # noqa: S311
+    entries = []
+    for i in range(first, first + count):
+        namespace = int(namespaces ** rng.random()) - 1
+        elements = ["warehouse", f"catalog_{namespace % 7}", f"db_{namespace}", f"table_{i}"]
+        entries.append({"type": "ICEBERG_TABLE", "name": {"elements": elements}})
+    return {"entries": entries, "hasMore": True}
@@ -18,7 +18,7 @@ import os
 from pathlib import Path
 from typing import IO, List, Optional
 
-from click import Group
+from click import Context, Group
 from click.testing import CliRunner
 
 from pynessie import cli
@@ -66,15 +66,23 @@ def _run_cli(args: List[str], input_data: Optional[str] = None) -> str:
 
 
 def _generate_commands_docs(parent_commands: List[str], command_group: Group) -> None:
-    for name, value in command_group.commands.items():
+    # the commands of the groups are imported lazily, so they are looked up via the group
+    ctx = Context(command_group)
+    for name in command_group.list_commands(ctx):
+        value = command_group.get_command(ctx, name)
         command = parent_commands + [name]
         if isinstance(value, Group):
-            _write_command_group_doc(command, list(value.commands.keys()))
+            _write_command_group_doc(command, _sub_commands(value))
             _generate_commands_docs(command, value)
         else:
             _write_command_doc(command)
 
 
+def _sub_commands(group: Group) -> List[str]:
+    # the sub-commands in the order they were declared, those of a lazy group are not imported yet
+    return list(group.commands) + [name for name in getattr(group, "lazy_commands", {}) if name not in group.commands]
+
+
 def _write_command_group_doc(command: List[str], command_items: List[str]) -> None:
     with _open_doc_file(command) as f:
         _write_command_output_to_file(f, command + ["--help"])